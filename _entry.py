@@ -1,8 +1,25 @@
-import os, subprocess, sys
-from app.core.db import SessionLocal, Base, engine
+import os, time
 
-# 테이블 생성 보장
-Base.metadata.create_all(bind=engine)
+# 시작 단계별 소요 시간 로그: [startup] <단계> <ms>
+_t0 = time.perf_counter()
+
+def _phase(name: str, started: float) -> float:
+    now = time.perf_counter()
+    print(f"[startup] {name} {(now - started) * 1000:.0f}ms", flush=True)
+    return now
+
+from app.core.db import SessionLocal, engine
+from app.core.schema import ensure_schema
+
+t = _phase("import", _t0)
+
+# 스냅샷 모드(SNAPSHOT_PATH): DB를 쓰지 않으므로 스키마 확인/시드 생략
+SNAPSHOT = os.getenv("SNAPSHOT_PATH", "").strip()
+
+# 스키마 확인: 저장된 스키마 버전이 같으면 조회 1건(이 프로세스 안에서는 app.main이 다시 확인하지 않음)
+if not SNAPSHOT:
+    migrated = ensure_schema(engine)
+    t = _phase(f"schema ({'migrated' if migrated else 'up-to-date'})", t)
 
 def count_frameworks() -> int:
     try:
@@ -21,21 +38,33 @@ def maybe_seed():
     print(f"[i] framework_count={cnt}, force={force} -> need_seed={need}")
     if need:
         print(f"[i] seeding: req={req_csv}, map={map_csv}")
-        subprocess.run(
-            [sys.executable, "-m", "scripts.load_csv",
-             "--requirements", req_csv, "--mappings", map_csv],
-            check=True
-        )
+        # 같은 프로세스에서 로더 실행(별도 인터프리터 기동/재import 없음)
+        from scripts import load_csv
+        load_csv.main(["--requirements", req_csv, "--mappings", map_csv])
         print("[i] seed done")
 
 def main():
-    maybe_seed()
+    t = time.perf_counter()
+    if not SNAPSHOT:
+        maybe_seed()
+        t = _phase("seed", t)
+
+    # 앱 import(라우터/엔진/미들웨어) 후 같은 프로세스에서 서버 실행
+    import uvicorn
+    from app.main import app
+    t = _phase("app", t)
+
+    class Server(uvicorn.Server):
+        # ready 로그는 lifespan 시작 + 소켓 바인딩이 끝난 뒤(요청을 받을 수 있는 시점)
+        async def startup(self, sockets=None):
+            await super().startup(sockets=sockets)
+            if not self.should_exit:
+                _phase("serve", t)
+                print(f"[startup] ready in {(time.perf_counter() - _t0) * 1000:.0f}ms", flush=True)
+
     host = os.getenv("APP_HOST", "0.0.0.0")
     port = os.getenv("PORT", "8003")
-    os.execvp(
-        sys.executable,
-        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", host, "--port", str(port)]
-    )
+    Server(uvicorn.Config(app, host=host, port=int(port))).run()
 
 if __name__ == "__main__":
     main()
@@ -1,12 +1,79 @@
 from __future__ import annotations
-from sqlalchemy import create_engine
+import os
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
 
-DATABASE_URL = "sqlite:///./app.db"
+from .dialect import async_pool_options, async_url, pool_options
+
+# -----------------------------------------------------------------------------
+# 접속 설정(환경 변수)
+# - DATABASE_URL: 쓰기(로더/시드) 및 기본 접속 URL
+# - DATABASE_READ_URL: API 조회용 URL(미지정 시 SQLite 파일이면 같은 파일을 읽기 전용으로,
+#   PostgreSQL이면 DATABASE_URL 그대로 — 읽기 레플리카가 있으면 지정)
+# - PostgreSQL 풀 크기: DB_POOL_SIZE / DB_MAX_OVERFLOW / DB_POOL_TIMEOUT / DB_POOL_RECYCLE
+# -----------------------------------------------------------------------------
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./app.db")
+
+# SQLite 연결마다 적용할 PRAGMA (WAL은 쓰기 연결에서만 전환, DB 파일에 영구 기록)
+SQLITE_PRAGMAS = {
+    "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),          # WAL에서는 NORMAL로 충분
+    "cache_size": os.getenv("SQLITE_CACHE_SIZE", "-65536"),            # 음수 = KiB 단위(64 MiB)
+    "mmap_size": os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)),
+    "temp_store": os.getenv("SQLITE_TEMP_STORE", "MEMORY"),
+    "busy_timeout": os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"),
+}
+
+def _is_sqlite_file(url: str) -> bool:
+    u = make_url(url)
+    return u.get_backend_name() == "sqlite" and u.database not in (None, "", ":memory:")
+
+def _read_only_url(url: str) -> str:
+    """SQLite 파일 URL → 같은 파일의 읽기 전용(URI mode=ro) URL. 그 외는 그대로."""
+    if not _is_sqlite_file(url):
+        return url
+    u = make_url(url)
+    if u.database.startswith("file:"):
+        return url
+    return u.set(database=f"file:{u.database}", query={**u.query, "mode": "ro", "uri": "true"}).render_as_string(hide_password=False)
 
-engine = create_engine(DATABASE_URL, echo=False, future=True)
+DATABASE_READ_URL = os.getenv("DATABASE_READ_URL") or _read_only_url(DATABASE_URL)
+# API 조회용 비동기 드라이버(SQLite: aiosqlite, PostgreSQL: asyncpg)
+ASYNC_DATABASE_READ_URL = async_url(DATABASE_READ_URL)
+
+def _apply_sqlite_pragmas(sync_engine, *, writer: bool) -> None:
+    if sync_engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(sync_engine, "connect")
+    def _on_connect(dbapi_conn, _record):
+        cur = dbapi_conn.cursor()
+        try:
+            if writer:
+                cur.execute("PRAGMA journal_mode=WAL")
+            for name, value in SQLITE_PRAGMAS.items():
+                cur.execute(f"PRAGMA {name}={value}")
+        finally:
+            cur.close()
+
+# 쓰기 엔진: 로더(scripts.load_csv)/시드/스키마 생성
+engine = create_engine(DATABASE_URL, echo=False, future=True, **pool_options(DATABASE_URL))
+_apply_sqlite_pragmas(engine, writer=True)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
 
+# 읽기 전용 엔진(동기): 스트리밍 내보내기 등 — WAL이라 로더 적재 중에도 차단되지 않음
+read_engine = create_engine(DATABASE_READ_URL, echo=False, future=True, **pool_options(DATABASE_READ_URL))
+_apply_sqlite_pragmas(read_engine, writer=False)
+ReadSessionLocal = sessionmaker(bind=read_engine, autoflush=False, autocommit=False, future=True)
+
+# 읽기 전용 엔진(비동기): async 라우트 — DB 대기 중 스레드풀 워커를 점유하지 않음
+# (SQLite도 명시적 풀: 연결과 그 페이지 캐시를 요청 간에 유지)
+async_engine = create_async_engine(ASYNC_DATABASE_READ_URL, echo=False, **async_pool_options(DATABASE_READ_URL))
+_apply_sqlite_pragmas(async_engine.sync_engine, writer=False)
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
 class Base(DeclarativeBase):
     pass
 
@@ -16,3 +83,14 @@ def get_db():
         yield db
     finally:
         db.close()
+
+def get_read_db():
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
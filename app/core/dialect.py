@@ -0,0 +1,102 @@
+# app/core/dialect.py
+from __future__ import annotations
+import os
+from typing import Any, Dict, Iterable, Sequence
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.sql.functions import FunctionElement
+from sqlalchemy.types import Text
+
+# -----------------------------------------------------------------------------
+# DB 방언 차이 흡수 (SQLite 기본, PostgreSQL 지원)
+# -----------------------------------------------------------------------------
+
+class string_agg(FunctionElement):
+    """
+    그룹 내 문자열 결합 집계: string_agg(expr, sep)
+    - SQLite: group_concat(expr, sep)
+    - PostgreSQL: string_agg(CAST(expr AS TEXT), sep)
+    순서는 보장하지 않음(호출 측에서 중복 제거/정렬)
+    """
+    type = Text()
+    inherit_cache = True
+    name = "string_agg"
+
+@compiles(string_agg)
+def _string_agg_default(element, compiler, **kw):
+    return "group_concat(%s)" % compiler.process(element.clauses, **kw)
+
+@compiles(string_agg, "postgresql")
+def _string_agg_postgresql(element, compiler, **kw):
+    expr, sep = list(element.clauses)
+    return "string_agg(CAST(%s AS TEXT), %s)" % (compiler.process(expr, **kw), compiler.process(sep, **kw))
+
+def insert_on_conflict(dialect_name: str, table, index_elements: Sequence[str], update: Iterable[str] = ()):
+    """
+    INSERT ... ON CONFLICT 문(SQLite/PostgreSQL 공통 문법).
+    - update 지정 시 DO UPDATE SET col = excluded.col, 미지정 시 DO NOTHING
+    """
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect_name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        raise NotImplementedError(f"ON CONFLICT 미지원 방언: {dialect_name}")
+    stmt = dialect_insert(table)
+    update = list(update)
+    if not update:
+        return stmt.on_conflict_do_nothing(index_elements=list(index_elements))
+    return stmt.on_conflict_do_update(
+        index_elements=list(index_elements),
+        set_={c: stmt.excluded[c] for c in update},
+    )
+
+# -----------------------------------------------------------------------------
+# 엔진 옵션
+# -----------------------------------------------------------------------------
+def is_sqlite(url: str) -> bool:
+    return make_url(url).get_backend_name() == "sqlite"
+
+def async_url(url: str) -> str:
+    """동기 URL → 같은 DB의 비동기 드라이버 URL(SQLite: aiosqlite, PostgreSQL: asyncpg/psycopg)."""
+    u = make_url(url)
+    backend, driver = u.get_backend_name(), u.get_driver_name()
+    if backend == "sqlite" and driver != "aiosqlite":
+        u = u.set(drivername="sqlite+aiosqlite")
+    elif backend == "postgresql" and driver not in ("asyncpg", "psycopg"):
+        u = u.set(drivername="postgresql+asyncpg")
+    return u.render_as_string(hide_password=False)
+
+def pool_options(url: str) -> Dict[str, Any]:
+    """
+    서버형 DB(PostgreSQL 등) 커넥션 풀 설정(환경 변수). SQLite는 기본 풀 유지.
+    - 레플리카 수 × (DB_POOL_SIZE + DB_MAX_OVERFLOW) 가 DB max_connections 이하가 되도록 조정
+    """
+    if is_sqlite(url):
+        return {}
+    return {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "5")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+        "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "30")),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+        "pool_pre_ping": True,
+    }
+
+def async_pool_options(url: str) -> Dict[str, Any]:
+    """
+    비동기 엔진 풀 설정.
+    - SQLite 파일: 명시적 큐 풀(aiosqlite 파일 DB의 기본은 NullPool → 요청마다 새 연결 + PRAGMA 재적용,
+      연결별 페이지 캐시(cache_size)도 매번 버려짐). 크기: SQLITE_ASYNC_POOL_SIZE / SQLITE_ASYNC_MAX_OVERFLOW
+    - 그 외: pool_options와 동일
+    """
+    if not is_sqlite(url):
+        return pool_options(url)
+    if make_url(url).database in (None, "", ":memory:"):
+        return {}
+    return {
+        "poolclass": AsyncAdaptedQueuePool,
+        "pool_size": int(os.getenv("SQLITE_ASYNC_POOL_SIZE", "4")),
+        "max_overflow": int(os.getenv("SQLITE_ASYNC_MAX_OVERFLOW", "4")),
+    }
@@ -0,0 +1,57 @@
+# app/core/meta.py
+from __future__ import annotations
+import time
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from ..models import AppMeta
+
+# app_meta(키/값) 접근 헬퍼 — 커밋은 호출 측 책임
+
+def get_meta(db: Session, key: str) -> Optional[str]:
+    row = db.get(AppMeta, key)
+    return row.value if row else None
+
+def set_meta(db: Session, key: str, value: Optional[str]) -> None:
+    row = db.get(AppMeta, key)
+    if row is None:
+        db.add(AppMeta(key=key, value=value))
+    else:
+        row.value = value
+
+# ---------- 로더 실행 기록 ----------
+# scripts.load_csv가 실행 완료 시 JSON으로 기록(/metrics가 읽음, 데이터 세대는 바꾸지 않음)
+LOADER_RUN_KEY = "loader_last_run"
+
+# ---------- 데이터 버전(세대 번호) ----------
+# 로더가 커밋할 때마다 갱신 → 응답 캐시/ETag 무효화 기준
+DATA_VERSION_KEY = "data_version"
+
+def get_data_version(db: Session) -> Optional[int]:
+    """저장된 데이터 세대 번호. 한 번도 기록되지 않았으면 None."""
+    val = get_meta(db, DATA_VERSION_KEY)
+    try:
+        return int(val) if val is not None else None
+    except ValueError:
+        return None
+
+async def get_data_version_async(db: AsyncSession) -> Optional[int]:
+    """
+    조회 전용(요청 단위) 세션용: 첫 조회 값을 세션에 기억해 같은 요청 안에서는 재조회하지 않음
+    (ETag 판정과 응답 캐시가 같은 세대를 보도록 보장).
+    """
+    if DATA_VERSION_KEY not in db.info:
+        db.info[DATA_VERSION_KEY] = await db.run_sync(get_data_version)
+    return db.info[DATA_VERSION_KEY]
+
+def bump_data_version(db: Session) -> int:
+    """
+    새 세대 번호 기록(커밋은 호출 측 책임).
+    - 시각(ns) 기반: DB 파일을 교체해도 이전 번호와 겹치지 않도록
+    """
+    cur = get_data_version(db) or 0
+    nxt = max(time.time_ns(), cur + 1)
+    set_meta(db, DATA_VERSION_KEY, str(nxt))
+    return nxt
@@ -0,0 +1,86 @@
+# app/core/schema.py
+from __future__ import annotations
+
+import hashlib
+import threading
+
+from sqlalchemy import inspect, select, text
+from sqlalchemy.exc import SQLAlchemyError
+
+from .db import Base
+
+# -----------------------------------------------------------------------------
+# 스키마 준비(시작 시 1회)
+# - 모델 메타데이터 지문(테이블/컬럼/타입/NULL 허용)을 app_meta.schema_version에 기록
+# - 저장된 지문이 같으면 조회 1건으로 끝(create_all/인스펙션/DDL 생략) → 콜드 스타트 단축
+# - 다르면(신규 DB/모델 변경) create_all + 누락 컬럼 추가 후 지문 갱신
+# - 같은 프로세스에서는 엔진별로 한 번만 확인(app.main, 로더, _entry가 함께 호출해도 1회)
+# -----------------------------------------------------------------------------
+SCHEMA_VERSION_KEY = "schema_version"
+
+_lock = threading.Lock()
+_checked: set = set()
+
+def schema_fingerprint() -> str:
+    from .. import models  # noqa: F401  (모든 테이블을 메타데이터에 등록)
+
+    h = hashlib.sha1()
+    for table in sorted(Base.metadata.sorted_tables, key=lambda t: t.name):
+        h.update(table.name.encode("utf-8"))
+        for col in table.columns:
+            h.update(f"|{col.name}:{col.type}:{int(col.nullable)}".encode("utf-8"))
+        h.update(b"\n")
+    return h.hexdigest()[:16]
+
+def _stored_version(engine):
+    from ..models import AppMeta
+
+    try:
+        with engine.connect() as conn:
+            return conn.execute(
+                select(AppMeta.value).where(AppMeta.key == SCHEMA_VERSION_KEY)
+            ).scalar_one_or_none()
+    except SQLAlchemyError:
+        return None  # app_meta 없음(신규 DB)
+
+def _add_missing_columns(engine, metadata) -> None:
+    """
+    기존 테이블에 모델에만 있는 컬럼 추가(create_all은 컬럼을 추가하지 않음).
+    - NULL 허용 컬럼만 대상(기존 행 값은 NULL)
+    """
+    insp = inspect(engine)
+    existing_tables = set(insp.get_table_names())
+    with engine.begin() as conn:
+        for table in metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            have = {c["name"] for c in insp.get_columns(table.name)}
+            for col in table.columns:
+                if col.name in have or not col.nullable:
+                    continue
+                ddl_type = col.type.compile(dialect=engine.dialect)
+                conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {col.name} {ddl_type}'))
+
+def ensure_schema(engine) -> bool:
+    """
+    스키마 확인/생성. 실제로 DDL을 실행했으면 True.
+    """
+    key = id(engine)
+    if key in _checked:
+        return False
+    with _lock:
+        if key in _checked:
+            return False
+        version = schema_fingerprint()
+        migrated = False
+        if _stored_version(engine) != version:
+            from ..models import AppMeta
+
+            Base.metadata.create_all(bind=engine)
+            _add_missing_columns(engine, Base.metadata)
+            with engine.begin() as conn:
+                conn.execute(AppMeta.__table__.delete().where(AppMeta.key == SCHEMA_VERSION_KEY))
+                conn.execute(AppMeta.__table__.insert().values(key=SCHEMA_VERSION_KEY, value=version))
+            migrated = True
+        _checked.add(key)
+        return migrated
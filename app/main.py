@@ -1,20 +1,46 @@
 # app/main.py
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.core.db import Base, engine
-from app.routers import health, compliance
+from app.core.db import engine, read_engine, async_engine
+from app.core.schema import ensure_schema
+from app.routers import health, compliance, compliance_snapshot, metrics
+from app.services.snapshot import open_snapshot
+from app.utils.metrics import MetricsMiddleware
+from app.utils.server_timing import ServerTimingMiddleware, instrument_engine
 import os
 
-# 로컬/테스트: 스키마 자동 생성 (운영환경에선 마이그레이션 권장)
-Base.metadata.create_all(bind=engine)
+# 읽기 전용 스냅샷 모드: /compliance/*를 스냅샷 파일(mmap)에서 응답, DB 스키마 확인 생략
+SNAPSHOT_PATH = os.getenv("SNAPSHOT_PATH", "").strip()
+if SNAPSHOT_PATH:
+    open_snapshot(SNAPSHOT_PATH)
+else:
+    # 로컬/테스트: 스키마 자동 생성 (운영환경에선 마이그레이션 권장)
+    # 저장된 스키마 버전이 같으면 조회 1건으로 끝, 프로세스당 1회(_entry.py가 먼저 호출했으면 생략)
+    ensure_schema(engine)
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    yield
+    # 풀에 남은 aiosqlite 연결은 연결마다 비데몬 스레드 → 닫지 않으면 종료 시 프로세스가 끝나지 않음
+    await async_engine.dispose()
 
 app = FastAPI(
     title="Compliance Mapping API",
     version="0.1.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
+# ── 요청별 Server-Timing(db/enrich/serialize/etag) + X-SQL-Count ─────────────
+for _engine in (engine, read_engine, async_engine.sync_engine):
+    instrument_engine(_engine)
+app.add_middleware(ServerTimingMiddleware)
+# 요청 수/지연 히스토그램(→ /metrics)
+app.add_middleware(MetricsMiddleware)
+
 # ── CORS 설정 ────────────────────────────────────────────────────────────────
 # 개발 기본(Next/Vite dev) + Swagger 로컬 확인
 DEFAULT_ORIGINS = [
@@ -36,14 +62,18 @@ app.add_middleware(
     allow_credentials=False,          # 쿠키/세션/인증 포함 요청 지원
     allow_methods=["*"],             # 필요시 ["GET","POST","PUT","DELETE","OPTIONS"]
     allow_headers=["*"],             # Authorization, Content-Type 등
-    # expose_headers=["ETag"],         # 프론트에서 읽어야 하는 응답 헤더 있으면 추가
+    expose_headers=["ETag", "X-Next-Cursor", "X-Total-Count", "Server-Timing", "X-SQL-Count"],  # 프론트에서 읽어야 하는 응답 헤더
     # max_age=86400,                   # 프리플라이트 캐시(초)
 )
 # ────────────────────────────────────────────────────────────────────────────
 
 # 라우터
 app.include_router(health.router, tags=["health"])
-app.include_router(compliance.router, prefix="/compliance", tags=["compliance"])
+app.include_router(metrics.router)
+app.include_router(
+    compliance_snapshot.router if SNAPSHOT_PATH else compliance.router,
+    prefix="/compliance", tags=["compliance"],
+)
 
 # 로컬 실행 지원
 if __name__ == "__main__":
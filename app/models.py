@@ -1,7 +1,7 @@
 # app/models.py
 from __future__ import annotations
 from typing import List
-from sqlalchemy import String, Text, ForeignKey, UniqueConstraint
+from sqlalchemy import String, Text, Float, Integer, ForeignKey, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from .core.db import Base
 
@@ -30,6 +30,8 @@ class Requirement(Base):
     recommended_fix: Mapped[str | None] = mapped_column(Text)
     # CHANGE: 적용 컴플라이언스 내용이 길 수 있어 Text로 확장
     applicable_compliance: Mapped[str | None] = mapped_column(Text)
+    # 로더: 적용한 CSV 행의 해시(같으면 재적재 생략, 여러 행이 병합되는 레코드는 NULL)
+    content_hash: Mapped[str | None] = mapped_column(String(40))
 
     framework: Mapped["Framework"] = relationship(back_populates="requirements")
     mappings: Mapped[List["Mapping"]] = relationship(
@@ -53,6 +55,8 @@ class Mapping(Base):
     non_compliant_value: Mapped[str | None] = mapped_column(String(256))
     console_fix: Mapped[str | None] = mapped_column(Text)
     cli_fix_cmd: Mapped[str | None] = mapped_column(Text)
+    # 로더: 적용한 CSV 행의 해시(같으면 재적재 생략, 여러 행이 병합되는 레코드는 NULL)
+    content_hash: Mapped[str | None] = mapped_column(String(40))
 
     requirements: Mapped[List["Requirement"]] = relationship(
         secondary="requirement_mapping", back_populates="mappings"
@@ -82,9 +86,32 @@ class Threat(Base):
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     group_id: Mapped[int] = mapped_column(ForeignKey("threat_groups.id"), index=True)
     title: Mapped[str] = mapped_column(String(512))  # 예: "내부자 과도한 권한 및 오남용"
+    # 로더: (그룹명, 위협) 해시 — CSV에서 사라진 위협 식별/재적재 생략
+    content_hash: Mapped[str | None] = mapped_column(String(40))
 
     group: Mapped["ThreatGroup"] = relationship(back_populates="threats")
 
     __table_args__ = (
         UniqueConstraint("group_id", "title", name="uq_threat_group_title"),
     )
+
+# ---------- 요구사항-위협 링크(적재 시 미리 계산) ----------
+
+class RequirementThreat(Base):
+    __tablename__ = "requirement_threat"
+    requirement_id: Mapped[int] = mapped_column(ForeignKey("requirements.id"), primary_key=True, index=True)
+    kind: Mapped[str] = mapped_column(String(16), primary_key=True)       # fixed / suggested
+    rank: Mapped[int] = mapped_column(Integer, primary_key=True)          # kind 내 표시 순서
+    # fixed: SAGE-Threat Requirement.id, suggested: Threat.id
+    threat_id: Mapped[int] = mapped_column(Integer)
+    title: Mapped[str] = mapped_column(String(512))
+    group_name: Mapped[str | None] = mapped_column(String(128))
+    score: Mapped[float | None] = mapped_column(Float)
+    reasons: Mapped[str | None] = mapped_column(Text)                     # JSON 배열 문자열
+
+# ---------- 메타(키/값) ----------
+
+class AppMeta(Base):
+    __tablename__ = "app_meta"
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    value: Mapped[str | None] = mapped_column(Text)
@@ -1,20 +1,26 @@
 # app/routers/compliance.py
 from __future__ import annotations
-from typing import List
+from dataclasses import dataclass
+from typing import Iterator, List, Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from ..core.db import get_db, engine
+from ..core.db import get_read_db, get_async_db, ReadSessionLocal
 from ..services.compliance_service import (
-    ensure_tables,
-    framework_counts,
+    framework_counts_async,
+    count_requirements,
+    count_requirements_async,
     # 그룹 주입 버전이 필요하면 아래 두 개도 계속 사용 가능
-    list_requirements_with_groups,
-    requirement_detail_with_groups,
+    prefetch_requirements_with_groups,
+    prefetch_requirement_detail_with_groups,
     # (신규) 위협 결합 버전
-    list_requirements_with_threats,
-    requirement_detail_with_threats,
+    prefetch_requirements_with_threats,
+    prefetch_requirement_detail_with_threats,
+    iter_requirements_with_threats,
+    RowView,
 )
 from ..schemas import (
     FrameworkCountOut,
@@ -23,50 +29,186 @@ from ..schemas import (
     RequirementRowWithThreatsOut,
     RequirementDetailWithThreatsOut,
 )
-from ..utils.etag import etag_response
+from ..utils.etag import etag_precondition, etag_bytes_response_async
+from ..utils.metrics import x_handler
+from ..utils.response_cache import cached_payload_async, cached_payload_threaded
+from ..utils.export import csv_lines, ndjson_lines
 
-ensure_tables(engine)
 router = APIRouter(tags=["compliance"])
 
+# -----------------------------
+# sparse fieldset(fields=) / 보강 선택(include=)
+# -----------------------------
+def _csv_param(val: Optional[str]) -> Optional[frozenset]:
+    if val is None:
+        return None
+    return frozenset(p.strip() for p in val.split(",") if p.strip())
+
+def view_params(row_model, includes: tuple):
+    """
+    라우트별 RowView 의존성 생성.
+    - fields: 반환할 행 필드(쉼표 구분, id/title은 항상 포함)
+    - include: 수행할 보강(쉼표 구분, 미지정 시 전부 / 빈 값이면 없음)
+    """
+    allowed_fields = frozenset(row_model.model_fields)
+
+    def dep(
+        fields: Optional[str] = Query(None, description=f"반환 필드(쉼표 구분): {', '.join(row_model.model_fields)}"),
+        include: Optional[str] = Query(None, description=f"보강(쉼표 구분): {', '.join(includes)}"),
+    ) -> RowView:
+        f = _csv_param(fields)
+        inc = _csv_param(include)
+        unknown = sorted((f or frozenset()) - allowed_fields) + sorted((inc or frozenset()) - frozenset(includes))
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields/include: {unknown}")
+        return RowView(fields=f, include=frozenset(includes) if inc is None else inc)
+
+    return dep
+
+threats_list_view = view_params(RequirementRowWithThreatsOut, ("threats", "hits"))
+groups_list_view = view_params(RequirementRowWithGroupsOut, ("groups", "hits"))
+threats_detail_view = view_params(RequirementRowWithThreatsOut, ("threats", "hits", "mappings"))
+groups_detail_view = view_params(RequirementRowWithGroupsOut, ("groups", "hits", "mappings"))
+
+def _trim_detail(detail: dict, view: RowView) -> dict:
+    out = {"framework": detail["framework"]}
+    if view.needs("regulation") and (view.fields is None or "regulation" in view.fields):
+        out["regulation"] = detail["regulation"]
+    out["requirement"] = view.trim(detail["requirement"])
+    # mappings는 스키마 필수 → 제외 시 빈 목록
+    out["mappings"] = detail["mappings"] if view.enrich("mappings") else []
+    return out
+
+# -----------------------------
+# 목록 페이지네이션(키셋: Requirement.id)
+# -----------------------------
+@dataclass(frozen=True)
+class PageParams:
+    cursor: Optional[int]
+    limit: Optional[int]
+    with_total: bool
+
+    @property
+    def key(self) -> tuple:
+        return (self.cursor, self.limit)
+
+def page_params(
+    cursor: Optional[int] = Query(None, ge=0, description="이전 페이지의 X-Next-Cursor (이 id 이후부터)"),
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="페이지 크기(미지정 시 전체)"),
+    with_total: bool = Query(False, description="X-Total-Count 헤더로 전체 건수 반환"),
+) -> PageParams:
+    return PageParams(cursor=cursor, limit=limit, with_total=with_total)
+
+async def _apply_page_headers(response: Response, db: AsyncSession, code: str, page: PageParams, rows: list) -> None:
+    # 꽉 찬 페이지면 다음 커서 제공(마지막 페이지가 정확히 limit 개면 다음 요청은 빈 목록)
+    if page.limit is not None and len(rows) == page.limit:
+        response.headers["X-Next-Cursor"] = str(rows[-1]["id"])
+    if page.with_total:
+        total = await cached_payload_async(db, ("count_requirements", code), lambda: count_requirements_async(db, code))
+        response.headers["X-Total-Count"] = str(total.data)
+
 @router.get("/stats", response_model=List[FrameworkCountOut])
-def get_counts(request: Request, response: Response, db: Session = Depends(get_db)):
-    data = framework_counts(db)
-    return etag_response(request, response, [d.model_dump() for d in data])
+@x_handler("framework_counts")
+async def get_counts(request: Request, response: Response, db: AsyncSession = Depends(get_async_db), etag: Optional[str] = Depends(etag_precondition)):
+    async def build():
+        return [d.model_dump() for d in await framework_counts_async(db)]
+
+    payload = await cached_payload_async(db, ("stats",), build)
+    return await etag_bytes_response_async(request, response, payload, payload.response_etag(etag))
 
 # -----------------------------
 # (A) 기존: 그룹 주입 버전(호환)
 # -----------------------------
-@router.get("/{code}/requirements:groups", response_model=List[RequirementRowWithGroupsOut])
-def get_requirements_with_groups(code: str, request: Request, response: Response, db: Session = Depends(get_db)):
-    rows = list_requirements_with_groups(db, code)
-    if not rows:
+@router.get("/{code}/requirements:groups", response_model=List[RequirementRowWithGroupsOut], response_model_exclude_unset=True)
+@x_handler("list_requirements_with_groups")
+async def get_requirements_with_groups(code: str, request: Request, response: Response, page: PageParams = Depends(page_params), view: RowView = Depends(groups_list_view), db: AsyncSession = Depends(get_async_db), etag: Optional[str] = Depends(etag_precondition)):
+    def prefetch(s: Session):
+        assemble = prefetch_requirements_with_groups(s, code, after_id=page.cursor, limit=page.limit, view=view)
+        return lambda: [view.trim(r.model_dump()) for r in assemble()]
+
+    payload = await cached_payload_threaded(db, ("list_requirements_with_groups", code, *page.key, *view.key), prefetch)
+    if not payload.data and page.cursor is None:
         raise HTTPException(status_code=404, detail="Framework not found or no requirements")
     response.headers["X-Handler"] = "list_requirements_with_groups"
-    return etag_response(request, response, [r.model_dump() for r in rows])
+    await _apply_page_headers(response, db, code, page, payload.data)
+    return await etag_bytes_response_async(request, response, payload, payload.response_etag(etag))
+
+@router.get("/{code}/requirements/{req_id}/mappings:groups", response_model=RequirementDetailWithGroupsOut, response_model_exclude_unset=True)
+@x_handler("requirement_detail_with_groups")
+async def get_requirement_mapping_with_groups(code: str, req_id: int, request: Request, response: Response, view: RowView = Depends(groups_detail_view), db: AsyncSession = Depends(get_async_db), etag: Optional[str] = Depends(etag_precondition)):
+    def prefetch(s: Session):
+        assemble = prefetch_requirement_detail_with_groups(s, code, req_id, view=view)
+
+        def build():
+            detail = assemble()
+            return _trim_detail(detail.model_dump(), view) if detail else None
+
+        return build
 
-@router.get("/{code}/requirements/{req_id}/mappings:groups", response_model=RequirementDetailWithGroupsOut)
-def get_requirement_mapping_with_groups(code: str, req_id: int, request: Request, response: Response, db: Session = Depends(get_db)):
-    detail = requirement_detail_with_groups(db, code, req_id)
-    if not detail:
+    payload = await cached_payload_threaded(db, ("requirement_detail_with_groups", code, req_id, *view.key), prefetch)
+    if not payload.data:
         raise HTTPException(status_code=404, detail="Requirement not found")
     response.headers["X-Handler"] = "requirement_detail_with_groups"
-    return etag_response(request, response, detail.model_dump())
+    return await etag_bytes_response_async(request, response, payload, payload.response_etag(etag))
 
 # -----------------------------
 # (B) 신규: 위협 결합 버전 (기본 엔드포인트로 사용 권장)
 # -----------------------------
-@router.get("/{code}/requirements", response_model=List[RequirementRowWithThreatsOut])
-def get_requirements_with_threats(code: str, request: Request, response: Response, db: Session = Depends(get_db)):
-    rows = list_requirements_with_threats(db, code)
-    if not rows:
+@router.get("/{code}/requirements", response_model=List[RequirementRowWithThreatsOut], response_model_exclude_unset=True)
+@x_handler("list_requirements_with_threats")
+async def get_requirements_with_threats(code: str, request: Request, response: Response, page: PageParams = Depends(page_params), view: RowView = Depends(threats_list_view), db: AsyncSession = Depends(get_async_db), etag: Optional[str] = Depends(etag_precondition)):
+    def prefetch(s: Session):
+        assemble = prefetch_requirements_with_threats(s, code, after_id=page.cursor, limit=page.limit, view=view)
+        return lambda: [view.trim(r.model_dump()) for r in assemble()]
+
+    payload = await cached_payload_threaded(db, ("list_requirements_with_threats", code, *page.key, *view.key), prefetch)
+    if not payload.data and page.cursor is None:
         raise HTTPException(status_code=404, detail="Framework not found or no requirements")
     response.headers["X-Handler"] = "list_requirements_with_threats"
-    return etag_response(request, response, [r.model_dump() for r in rows])
+    await _apply_page_headers(response, db, code, page, payload.data)
+    return await etag_bytes_response_async(request, response, payload, payload.response_etag(etag))
+
+@router.get("/{code}/requirements/{req_id}/mappings", response_model=RequirementDetailWithThreatsOut, response_model_exclude_unset=True)
+@x_handler("requirement_detail_with_threats")
+async def get_requirement_mapping_with_threats(code: str, req_id: int, request: Request, response: Response, view: RowView = Depends(threats_detail_view), db: AsyncSession = Depends(get_async_db), etag: Optional[str] = Depends(etag_precondition)):
+    def prefetch(s: Session):
+        assemble = prefetch_requirement_detail_with_threats(s, code, req_id, view=view)
+
+        def build():
+            detail = assemble()
+            return _trim_detail(detail.model_dump(), view) if detail else None
 
-@router.get("/{code}/requirements/{req_id}/mappings", response_model=RequirementDetailWithThreatsOut)
-def get_requirement_mapping_with_threats(code: str, req_id: int, request: Request, response: Response, db: Session = Depends(get_db)):
-    detail = requirement_detail_with_threats(db, code, req_id)
-    if not detail:
+        return build
+
+    payload = await cached_payload_threaded(db, ("requirement_detail_with_threats", code, req_id, *view.key), prefetch)
+    if not payload.data:
         raise HTTPException(status_code=404, detail="Requirement not found")
     response.headers["X-Handler"] = "requirement_detail_with_threats"
-    return etag_response(request, response, detail.model_dump())
+    return await etag_bytes_response_async(request, response, payload, payload.response_etag(etag))
+
+# -----------------------------
+# (C) 전체 내보내기(스트리밍): NDJSON / CSV
+# - 장시간 스트림이므로 동기(읽기 전용) 세션 + 스레드풀 반복 유지
+# -----------------------------
+_EXPORT_MEDIA = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+def _export_rows(code: str) -> Iterator[dict]:
+    # 스트리밍은 요청 의존성(get_read_db) 종료 이후에도 계속되므로 세션을 직접 연다
+    with ReadSessionLocal() as db:
+        for row in iter_requirements_with_threats(db, code):
+            yield row.model_dump()
+
+@router.get("/{code}/requirements:export")
+@x_handler("export_requirements")
+def export_requirements(code: str, format: Literal["ndjson", "csv"] = Query("ndjson"), db: Session = Depends(get_read_db)):
+    if count_requirements(db, code) == 0:
+        raise HTTPException(status_code=404, detail="Framework not found or no requirements")
+    lines = ndjson_lines(_export_rows(code)) if format == "ndjson" else csv_lines(_export_rows(code))
+    return StreamingResponse(
+        lines,
+        media_type=_EXPORT_MEDIA[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{code}-requirements.{format}"',
+            "X-Handler": "export_requirements",
+        },
+    )
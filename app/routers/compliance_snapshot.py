@@ -0,0 +1,167 @@
+# app/routers/compliance_snapshot.py
+from __future__ import annotations
+from typing import List, Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+
+from ..services.compliance_service import RowView
+from ..services.snapshot import Snapshot, current_snapshot, detail_key, export_key, list_key
+from ..schemas import (
+    FrameworkCountOut,
+    RequirementRowWithGroupsOut,
+    RequirementDetailWithGroupsOut,
+    RequirementRowWithThreatsOut,
+    RequirementDetailWithThreatsOut,
+)
+from ..utils.etag import etag_bytes_response, version_precondition
+from ..utils.metrics import x_handler
+from ..utils.response_cache import CachedPayload, cached_payload_at, response_cache
+from ..utils.export import csv_lines
+from .compliance import (
+    _EXPORT_MEDIA,
+    PageParams,
+    _trim_detail,
+    groups_detail_view,
+    groups_list_view,
+    page_params,
+    threats_detail_view,
+    threats_list_view,
+)
+
+# =============================================================================
+# /compliance/* 스냅샷 버전(SNAPSHOT_PATH 지정 시 app.main이 compliance.router 대신 사용)
+# - 경로/파라미터/응답/헤더/ETag는 DB 버전과 동일, SQL 없음
+# - 세대 번호 = 스냅샷 생성 시점의 data_version → 두 모드 간 ETag 호환
+# - 기본 요청(fields/include/cursor/limit 없음)은 mmap 구간을 파싱 없이 그대로 응답
+# - fields/include/cursor/limit 변형만 문서를 파싱해 잘라서 응답(결과는 응답 캐시에 보관)
+# =============================================================================
+router = APIRouter(tags=["compliance"])
+
+# 파라미터 없는 요청의 RowView(= 스냅샷 문서 그대로)
+_LIST_DEFAULT = {"threats": threats_list_view(None, None), "groups": groups_list_view(None, None)}
+_DETAIL_DEFAULT = {"threats": threats_detail_view(None, None), "groups": groups_detail_view(None, None)}
+
+def snapshot_precondition(request: Request, snap: Snapshot = Depends(current_snapshot)) -> Optional[str]:
+    return version_precondition(request, snap.version)
+
+def _raw(snap: Snapshot, key: str) -> Optional[CachedPayload]:
+    """
+    스냅샷 문서 본문 그대로의 응답 항목(본문은 mmap 구간 → 워커마다 복사본을 두지 않음).
+    응답 캐시에는 압축 결과만 워커별로 보관.
+    """
+    cache_key = ("snapshot_raw", key)
+    hit = response_cache.get(cache_key, snap.version)
+    if hit is None:
+        blob = snap.blob(key)
+        if blob is None:
+            return None
+        hit = CachedPayload.from_body(blob)
+        response_cache.put(cache_key, snap.version, hit)
+    return hit
+
+def _doc(snap: Snapshot, key: str):
+    """스냅샷 문서 파싱 결과(변형 요청용, 응답 캐시에 보관 → 변형마다 다시 파싱하지 않음)."""
+    return cached_payload_at(snap.version, ("snapshot", key), lambda: snap.doc(key)).data
+
+def _page(rows: Optional[list], page: PageParams) -> list:
+    rows = rows or []
+    if page.cursor is not None:
+        rows = [r for r in rows if r["id"] > page.cursor]
+    return rows if page.limit is None else rows[: page.limit]
+
+def _apply_page_headers(response: Response, snap: Snapshot, code: str, page: PageParams, rows: list) -> None:
+    if page.limit is not None and len(rows) == page.limit:
+        response.headers["X-Next-Cursor"] = str(rows[-1]["id"])
+    if page.with_total:
+        response.headers["X-Total-Count"] = str(snap.counts.get(code, 0))
+
+def _list(kind: str, code: str, request: Request, response: Response, page: PageParams, view: RowView, snap: Snapshot, etag: Optional[str]):
+    handler = f"list_requirements_with_{kind}"
+
+    if view == _LIST_DEFAULT[kind] and page.cursor is None and page.limit is None:
+        payload = _raw(snap, list_key(kind, code)) if snap.counts.get(code) else None
+        if payload is None:
+            raise HTTPException(status_code=404, detail="Framework not found or no requirements")
+        response.headers["X-Handler"] = handler
+        _apply_page_headers(response, snap, code, page, [])
+        return etag_bytes_response(request, response, payload, etag or payload.etag)
+
+    def build():
+        return [view.trim(r) for r in _page(_doc(snap, list_key(kind, code)), page)]
+
+    payload = cached_payload_at(snap.version, (handler, code, *page.key, *view.key), build)
+    if not payload.data and page.cursor is None:
+        raise HTTPException(status_code=404, detail="Framework not found or no requirements")
+    response.headers["X-Handler"] = handler
+    _apply_page_headers(response, snap, code, page, payload.data)
+    return etag_bytes_response(request, response, payload, etag or payload.etag)
+
+def _detail(kind: str, code: str, req_id: int, request: Request, response: Response, view: RowView, snap: Snapshot, etag: Optional[str]):
+    handler = f"requirement_detail_with_{kind}"
+
+    if view == _DETAIL_DEFAULT[kind]:
+        payload = _raw(snap, detail_key(kind, code, req_id))
+    else:
+        def build():
+            detail = _doc(snap, detail_key(kind, code, req_id))
+            return _trim_detail(detail, view) if detail else None
+
+        payload = cached_payload_at(snap.version, (handler, code, req_id, *view.key), build)
+        payload = payload if payload.data else None
+    if payload is None:
+        raise HTTPException(status_code=404, detail="Requirement not found")
+    response.headers["X-Handler"] = handler
+    return etag_bytes_response(request, response, payload, etag or payload.etag)
+
+@router.get("/stats", response_model=List[FrameworkCountOut])
+@x_handler("framework_counts")
+def get_counts(request: Request, response: Response, snap: Snapshot = Depends(current_snapshot), etag: Optional[str] = Depends(snapshot_precondition)):
+    payload = _raw(snap, "stats")
+    return etag_bytes_response(request, response, payload, etag or payload.etag)
+
+# -----------------------------
+# (A) 그룹 주입 버전
+# -----------------------------
+@router.get("/{code}/requirements:groups", response_model=List[RequirementRowWithGroupsOut], response_model_exclude_unset=True)
+@x_handler("list_requirements_with_groups")
+def get_requirements_with_groups(code: str, request: Request, response: Response, page: PageParams = Depends(page_params), view: RowView = Depends(groups_list_view), snap: Snapshot = Depends(current_snapshot), etag: Optional[str] = Depends(snapshot_precondition)):
+    return _list("groups", code, request, response, page, view, snap, etag)
+
+@router.get("/{code}/requirements/{req_id}/mappings:groups", response_model=RequirementDetailWithGroupsOut, response_model_exclude_unset=True)
+@x_handler("requirement_detail_with_groups")
+def get_requirement_mapping_with_groups(code: str, req_id: int, request: Request, response: Response, view: RowView = Depends(groups_detail_view), snap: Snapshot = Depends(current_snapshot), etag: Optional[str] = Depends(snapshot_precondition)):
+    return _detail("groups", code, req_id, request, response, view, snap, etag)
+
+# -----------------------------
+# (B) 위협 결합 버전
+# -----------------------------
+@router.get("/{code}/requirements", response_model=List[RequirementRowWithThreatsOut], response_model_exclude_unset=True)
+@x_handler("list_requirements_with_threats")
+def get_requirements_with_threats(code: str, request: Request, response: Response, page: PageParams = Depends(page_params), view: RowView = Depends(threats_list_view), snap: Snapshot = Depends(current_snapshot), etag: Optional[str] = Depends(snapshot_precondition)):
+    return _list("threats", code, request, response, page, view, snap, etag)
+
+@router.get("/{code}/requirements/{req_id}/mappings", response_model=RequirementDetailWithThreatsOut, response_model_exclude_unset=True)
+@x_handler("requirement_detail_with_threats")
+def get_requirement_mapping_with_threats(code: str, req_id: int, request: Request, response: Response, view: RowView = Depends(threats_detail_view), snap: Snapshot = Depends(current_snapshot), etag: Optional[str] = Depends(snapshot_precondition)):
+    return _detail("threats", code, req_id, request, response, view, snap, etag)
+
+# -----------------------------
+# (C) 전체 내보내기: 스냅샷의 export/<code> 문서(행마다 NDJSON 1줄, applicable_hits 제외 — DB 버전과 동일)
+# - NDJSON은 mmap 구간을 조각 단위로 그대로 전송, CSV는 한 줄씩 파싱해 변환(목록 전체를 파싱하지 않음)
+# -----------------------------
+@router.get("/{code}/requirements:export")
+@x_handler("export_requirements")
+def export_requirements(code: str, format: Literal["ndjson", "csv"] = Query("ndjson"), snap: Snapshot = Depends(current_snapshot)):
+    key = export_key(code)
+    if not snap.counts.get(code) or snap.blob(key) is None:
+        raise HTTPException(status_code=404, detail="Framework not found or no requirements")
+    lines = snap.iter_chunks(key) if format == "ndjson" else csv_lines(snap.iter_records(key))
+    return StreamingResponse(
+        lines,
+        media_type=_EXPORT_MEDIA[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{code}-requirements.{format}"',
+            "X-Handler": "export_requirements",
+        },
+    )
@@ -0,0 +1,22 @@
+import json
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.db import get_async_db
+from ..core.meta import LOADER_RUN_KEY, get_meta
+from ..utils.metrics import CONTENT_TYPE, collect_snapshots, render
+
+router = APIRouter(tags=["metrics"])
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics(db: AsyncSession = Depends(get_async_db)):
+    """Prometheus 텍스트 형식(모든 워커 합산은 METRICS_DIR 지정 시)."""
+    try:
+        raw = await db.run_sync(lambda s: get_meta(s, LOADER_RUN_KEY))
+        loader = json.loads(raw) if raw else None
+    except (SQLAlchemyError, ValueError):
+        loader = None  # 스냅샷 모드(DB 없음) 또는 기록 손상
+    return PlainTextResponse(render(collect_snapshots(), loader), media_type=CONTENT_TYPE)
@@ -1,10 +1,14 @@
 # app/services/compliance_service.py
 from __future__ import annotations
 
+import json
 import re
-from typing import List, Optional, Iterable, Tuple, Set
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Callable, Dict, FrozenSet, List, Optional, Iterable, Iterator, Tuple, Set
 
-from sqlalchemy import select, func, or_
+from sqlalchemy import select, func, or_, delete, insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from ..models import (
@@ -12,9 +16,11 @@ from ..models import (
     Requirement,
     Mapping,
     RequirementMapping,
-    ThreatGroup,
     Threat,
+    RequirementThreat,
 )
+from ..core.meta import get_meta, set_meta
+from ..core.dialect import string_agg
 
 from ..schemas import (
     FrameworkCountOut,
@@ -30,14 +36,16 @@ from ..schemas import (
     RequirementRowWithThreatsOut,
     RequirementDetailWithThreatsOut,
 )
+from .threat_index import (
+    ThreatIndex, ThreatGroupLookup, prefetch_threat_index, prefetch_threat_group_lookup, threat_signature,
+)
+from .requirement_index import RequirementIndex, prefetch_requirement_index
+from .sage_fts import fts_available, fts_candidate_ids, fts_ids_for_patterns
+from ..utils.server_timing import timed
 
 # -----------------------------------------------------------------------------
 # 공통 유틸
 # -----------------------------------------------------------------------------
-def ensure_tables(engine) -> None:
-    from ..core.db import Base
-    Base.metadata.create_all(bind=engine)
-
 def _extract_regulation_text(req: Requirement) -> Optional[str]:
     for field in ("regulation", "reg_text", "description", "content", "detail", "body"):
         if hasattr(req, field):
@@ -75,118 +83,241 @@ def _parse_code_title(token: str) -> tuple[Optional[str], Optional[str]]:
     title = (m.group(2) or "").strip() or None
     return code, title
 
-def _query_matches_for_token(
-    db: Session, code: Optional[str], title: Optional[str]
-) -> List[RequirementMiniOut]:
-    q = db.query(Requirement).filter(Requirement.framework_code != "SAGE-Threat")
-    conds = []
-    if code:
-        conds.append(Requirement.item_code == code)
-    if title:
-        conds.append(Requirement.title.ilike(f"%{title}%"))
-    if not conds:
-        return []
-    rows = q.filter(or_(*conds)).order_by(Requirement.framework_code, Requirement.id).all()
-    out: List[RequirementMiniOut] = []
-    for r in rows:
-        out.append(
-            RequirementMiniOut(
-                id=r.id,
-                framework_code=r.framework_code,
-                item_code=r.item_code,
-                title=r.title,
-                regulation=_extract_regulation_text(r) or getattr(r, "description", None),
-            )
+def _resolve_tokens(
+    index: RequirementIndex, fold: Callable[[str], str], tokens: Iterable[str]
+) -> Dict[str, ApplicableComplianceHitOut]:
+    """
+    토큰(중복 제거) → 역참조 결과. 비 SAGE 요건 색인(프로세스 캐시)에서 한 번에 판정.
+    - 판정: item_code == code OR title ILIKE '%title%' (framework_code, id 순)
+    - regulation: 요건 description
+    - fold: _fold_for(db)
+    """
+    out: Dict[str, ApplicableComplianceHitOut] = {}
+    for token in tokens:
+        if token in out:
+            continue
+        code, title = _parse_code_title(token)
+        entries = index.memo(
+            (code, title, fold), lambda: index.lookup(code, _like_matcher(title, fold) if title else None)
+        ) if (code or title) else []
+        out[token] = ApplicableComplianceHitOut(
+            raw=token,
+            code=code,
+            title=title,
+            matches=[
+                RequirementMiniOut(
+                    id=e.id,
+                    framework_code=e.framework_code,
+                    item_code=e.item_code,
+                    title=e.title,
+                    regulation=e.description,
+                )
+                for e in entries
+            ],
         )
     return out
 
+def _build_applicable_hits_batch(
+    index: RequirementIndex, fold: Callable[[str], str], values: List[Optional[str]]
+) -> List[List[ApplicableComplianceHitOut]]:
+    """여러 행의 applicable_compliance → 행별 hits(목록 전체 토큰을 모아 1회 판정)."""
+    token_lists = [_split_tokens(v) for v in values]
+    resolved = _resolve_tokens(index, fold, (t for tokens in token_lists for t in tokens))
+    return [[resolved[t] for t in tokens] for tokens in token_lists]
+
 def _build_applicable_hits(
-    db: Session, applicable_compliance: Optional[str]
+    index: RequirementIndex, fold: Callable[[str], str], applicable_compliance: Optional[str]
 ) -> List[ApplicableComplianceHitOut]:
-    hits: List[ApplicableComplianceHitOut] = []
-    for token in _split_tokens(applicable_compliance):
-        code, title = _parse_code_title(token)
-        matches = _query_matches_for_token(db, code, title)
-        hits.append(
-            ApplicableComplianceHitOut(raw=token, code=code, title=title, matches=matches)
-        )
-    return hits
+    return _build_applicable_hits_batch(index, fold, [applicable_compliance])[0]
 
 # -----------------------------------------------------------------------------
-# 기본 목록/상세 (매핑 코드/서비스 동반 반환)
+# 조회 범위(sparse fieldset / include): 요청되지 않은 컬럼·보강은 계산하지 않음
 # -----------------------------------------------------------------------------
-def list_requirements(db: Session, framework_code: str) -> List[RequirementRowOut]:
+# 보강 이름 → 출력 필드
+ENRICH_FIELDS = {
+    "threats": ("threats", "fixed_threats", "suggested_threats"),
+    "hits": ("applicable_hits",),
+    "groups": ("threat_group", "threat_groups"),
+}
+# 보강 계산에 필요한 원본 필드
+ENRICH_NEEDS = {
+    "threats": {"item_code", "title", "regulation", "mapping_codes", "mapping_services"},
+    "hits": {"applicable_compliance"},
+    "groups": {"title"},
+}
+# 상세 전용 include
+DETAIL_INCLUDES = ("mappings",)
+# 스키마 필수 필드(fields와 무관하게 항상 반환)
+ALWAYS_FIELDS = frozenset(("id", "title"))
+
+@dataclass(frozen=True)
+class RowView:
     """
-    목록 API에서 각 항목별 매핑 코드들과 매핑 서비스들을 함께 반환한다.
-    - SQLite: group_concat 사용(중복은 파이썬에서 제거)
+    fields: 반환할 행 필드(None=전체, ALWAYS_FIELDS는 항상 포함)
+    include: 수행할 보강(threats/hits/groups, 상세는 mappings 포함)
     """
-    mapping_codes_csv = func.group_concat(RequirementMapping.mapping_code, ";")
-    mapping_services_csv = func.group_concat(Mapping.service, ";")
+    fields: Optional[FrozenSet[str]] = None
+    include: FrozenSet[str] = frozenset((*ENRICH_FIELDS, *DETAIL_INCLUDES))
+
+    @property
+    def key(self) -> tuple:
+        return (tuple(sorted(self.fields)) if self.fields is not None else None, tuple(sorted(self.include)))
+
+    def enrich(self, name: str) -> bool:
+        """보강 수행 여부: include에 있고, fields 지정 시 그 결과 필드가 하나라도 요청된 경우."""
+        if name not in self.include:
+            return False
+        if self.fields is None or name not in ENRICH_FIELDS:
+            return True
+        return any(f in self.fields for f in ENRICH_FIELDS[name])
+
+    def needs(self, field_name: str) -> bool:
+        """원본 필드 조회 필요 여부(출력 요청 또는 보강 계산용)."""
+        if self.fields is None or field_name in self.fields:
+            return True
+        return any(field_name in cols for e, cols in ENRICH_NEEDS.items() if self.enrich(e))
+
+    def trim(self, row: dict) -> dict:
+        """출력 필드만 남김(수행하지 않은 보강 필드는 제외)."""
+        skipped = {f for e, fs in ENRICH_FIELDS.items() if not self.enrich(e) for f in fs}
+        if self.fields is None and not skipped:
+            return row
+        return {
+            k: v for k, v in row.items()
+            if k not in skipped and (self.fields is None or k in ALWAYS_FIELDS or k in self.fields)
+        }
 
-    rows = (
-        db.query(
-            Requirement.id.label("id"),
-            Requirement.item_code.label("item_code"),
-            Requirement.title.label("title"),
-            Requirement.mapping_status.label("mapping_status"),
-            Requirement.description.label("regulation"),
-            Requirement.auditable.label("auditable"),
-            Requirement.audit_method.label("audit_method"),
-            Requirement.recommended_fix.label("recommended_fix"),
-            Requirement.applicable_compliance.label("applicable_compliance"),
-            mapping_codes_csv.label("mapping_codes_csv"),
-            mapping_services_csv.label("mapping_services_csv"),
-        )
-        .outerjoin(RequirementMapping, RequirementMapping.requirement_id == Requirement.id)
-        .outerjoin(Mapping, Mapping.code == RequirementMapping.mapping_code)
-        .filter(Requirement.framework_code == framework_code)
-        .group_by(
-            Requirement.id,
-            Requirement.item_code,
-            Requirement.title,
-            Requirement.mapping_status,
-            Requirement.description,
-            Requirement.auditable,
-            Requirement.audit_method,
-            Requirement.recommended_fix,
-            Requirement.applicable_compliance,
+FULL_VIEW = RowView()
+
+# -----------------------------------------------------------------------------
+# 기본 목록/상세 (매핑 코드/서비스 동반 반환)
+# -----------------------------------------------------------------------------
+_ROW_COLUMNS = {
+    "mapping_status": Requirement.mapping_status,
+    "regulation": Requirement.description,
+    "auditable": Requirement.auditable,
+    "audit_method": Requirement.audit_method,
+    "recommended_fix": Requirement.recommended_fix,
+    "applicable_compliance": Requirement.applicable_compliance,
+}
+
+def _requirement_row_query(db: Session, *criteria, view: RowView = FULL_VIEW):
+    """
+    요건 행 + 매핑 코드/서비스(string_agg: SQLite group_concat / PostgreSQL string_agg) 집계 쿼리, id 오름차순.
+    - view에 필요 없는 본문 컬럼/매핑 집계(조인)는 조회하지 않음
+    """
+    cols = [
+        Requirement.id.label("id"),
+        Requirement.item_code.label("item_code"),
+        Requirement.title.label("title"),
+    ]
+    cols += [c.label(name) for name, c in _ROW_COLUMNS.items() if view.needs(name)]
+    with_mappings = view.needs("mapping_codes") or view.needs("mapping_services")
+    if with_mappings:
+        cols += [
+            string_agg(RequirementMapping.mapping_code, ";").label("mapping_codes_csv"),
+            string_agg(Mapping.service, ";").label("mapping_services_csv"),
+        ]
+
+    q = db.query(*cols)
+    if with_mappings:
+        q = (
+            q.outerjoin(RequirementMapping, RequirementMapping.requirement_id == Requirement.id)
+            .outerjoin(Mapping, Mapping.code == RequirementMapping.mapping_code)
         )
+    return (
+        q.filter(*criteria)
+        .group_by(*[c.element for c in cols if not c.name.endswith("_csv")])
         .order_by(Requirement.id)
-        .all()
     )
 
-    def _split_csv(val: str | None) -> List[str]:
-        if not val:
-            return []
-        parts = [p.strip() for p in val.split(";") if p.strip()]
-        # 중복 제거(순서 보존)
-        seen, uniq = set(), []
-        for x in parts:
-            if x not in seen:
-                seen.add(x)
-                uniq.append(x)
-        return uniq
-
-    models: List[RequirementRowOut] = []
-    for r in rows:
-        d = dict(r._mapping)
+def _split_csv(val: str | None) -> List[str]:
+    if not val:
+        return []
+    parts = [p.strip() for p in val.split(";") if p.strip()]
+    # 중복 제거(순서 보존)
+    seen, uniq = set(), []
+    for x in parts:
+        if x not in seen:
+            seen.add(x)
+            uniq.append(x)
+    return uniq
+
+def _row_to_model(r) -> RequirementRowOut:
+    d = dict(r._mapping)
+    if "mapping_codes_csv" in d:
         codes = _split_csv(d.pop("mapping_codes_csv", None))
         services = _split_csv(d.pop("mapping_services_csv", None))
         d["mapping_codes"] = codes or None
         d["mapping_services"] = services or None
-        models.append(RequirementRowOut.model_validate(d))
+    return RequirementRowOut.model_validate(d)
 
-    # SAGE-Threat 프레임워크(=위협 카탈로그)만 applicable_hits 역참조 제공
-    if framework_code == "SAGE-Threat":
-        enriched: List[RequirementRowOut] = []
-        for m in models:
-            hits = _build_applicable_hits(db, m.applicable_compliance)
-            enriched.append(m.model_copy(update={"applicable_hits": hits}))
-        return enriched
+def _requirement_rows(
+    db: Session, *criteria, limit: Optional[int] = None, view: RowView = FULL_VIEW
+) -> List[RequirementRowOut]:
+    """
+    - 매핑 코드/서비스는 string_agg 집계(중복은 파이썬에서 제거)
+    - SQLite: group_concat 사용(중복은 파이썬에서 제거)
+    """
+    q = _requirement_row_query(db, *criteria, view=view)
+    if limit is not None:
+        q = q.limit(limit)
+    return [_row_to_model(r) for r in q.all()]
+
+def _page_criteria(framework_code: str, after_id: Optional[int]) -> list:
+    crit = [Requirement.framework_code == framework_code]
+    if after_id is not None:
+        crit.append(Requirement.id > after_id)
+    return crit
+
+def count_requirements(db: Session, framework_code: str) -> int:
+    return db.execute(
+        select(func.count(Requirement.id)).where(Requirement.framework_code == framework_code)
+    ).scalar_one()
+
+# 조회(SQL)/조립(CPU) 분리: prefetch_* 는 SQL만 실행하고 조립 함수를 반환
+# - 동기 호출: prefetch_*(db, ...)() — 기존 함수들이 이 형태
+# - async 라우트: SQL은 비동기 세션(run_sync)에서, 조립 함수는 스레드풀에서 실행
+#   (response_cache.cached_payload_threaded)
+# - 조립 함수는 DB에 접근하지 않음(프로세스 캐시 빌드도 미리 읽어 둔 원본 행으로)
+def _prefetch_requirements(
+    db: Session, framework_code: str, after_id: Optional[int], limit: Optional[int], view: RowView
+) -> Tuple[list, Callable[[], List[RequirementRowOut]]]:
+    """list_requirements의 (원본 행, 조립 함수)."""
+    q = _requirement_row_query(db, *_page_criteria(framework_code, after_id), view=view)
+    if limit is not None:
+        q = q.limit(limit)
+    rows = q.all()
 
-    return models
+    # SAGE-Threat 프레임워크(=위협 카탈로그)만 applicable_hits 역참조 제공
+    index = prefetch_requirement_index(db) if rows and framework_code == "SAGE-Threat" and view.enrich("hits") else None
+    fold = _fold_for(db)
+
+    def assemble() -> List[RequirementRowOut]:
+        models = [_row_to_model(r) for r in rows]
+        if index is None:
+            return models
+        with timed("enrich"):
+            all_hits = _build_applicable_hits_batch(index(), fold, [m.applicable_compliance for m in models])
+            return [m.model_copy(update={"applicable_hits": hits}) for m, hits in zip(models, all_hits)]
+
+    return rows, assemble
+
+def list_requirements(
+    db: Session, framework_code: str, *, after_id: Optional[int] = None, limit: Optional[int] = None,
+    view: RowView = FULL_VIEW,
+) -> List[RequirementRowOut]:
+    """
+    목록 API에서 각 항목별 매핑 코드들과 매핑 서비스들을 함께 반환한다.
+    - 키셋 페이지네이션: Requirement.id > after_id 인 행을 id 순으로 최대 limit 개
+    - view: 필요 없는 컬럼/applicable_hits 계산 생략
+    """
+    return _prefetch_requirements(db, framework_code, after_id, limit, view)[1]()
 
-def requirement_detail(db: Session, code: str, req_id: int) -> Optional[RequirementDetailOut]:
+def _prefetch_detail(
+    db: Session, code: str, req_id: int, view: RowView
+) -> Optional[Tuple[Requirement, Callable[[], RequirementDetailOut]]]:
+    """requirement_detail의 (요건, 조립 함수). 요건이 없으면 None."""
     req = (
         db.query(Requirement)
         .filter(Requirement.framework_code == code, Requirement.id == req_id)
@@ -195,14 +326,54 @@ def requirement_detail(db: Session, code: str, req_id: int) -> Optional[Requirem
     if not req:
         return None
 
+    # 매핑 상세/코드/서비스가 모두 필요 없으면 매핑 조회 생략
+    need_maps = view.enrich("mappings") or view.needs("mapping_codes") or view.needs("mapping_services")
     maps = (
         db.query(Mapping)
         .join(RequirementMapping, RequirementMapping.mapping_code == Mapping.code)
         .filter(RequirementMapping.requirement_id == req.id)
+        .order_by(RequirementMapping.mapping_code)
         .all()
-    )
+    ) if need_maps else []
+
+    # SAGE-Threat(위협 카탈로그)일 때만 applicable_hits 제공
+    index = prefetch_requirement_index(db) if code == "SAGE-Threat" and view.enrich("hits") else None
+    fold = _fold_for(db)
+
+    def assemble() -> RequirementDetailOut:
+        reg_text = _extract_regulation_text(req)
+        mapping_codes, mapping_services = _detail_mapping_fields(maps)
+
+        req_out = RequirementRowOut.model_validate(req).model_copy(
+            update={
+                "regulation": reg_text,
+                "mapping_codes": mapping_codes or None,
+                "mapping_services": mapping_services or None,
+            }
+        )
 
-    reg_text = _extract_regulation_text(req)
+        if index is not None:
+            with timed("enrich"):
+                hits = _build_applicable_hits(index(), fold, getattr(req, "applicable_compliance", None))
+            req_out = req_out.model_copy(update={"applicable_hits": hits})
+
+        return RequirementDetailOut(
+            framework=req.framework_code,
+            regulation=reg_text,
+            requirement=req_out,
+            mappings=[MappingOut.model_validate(m) for m in maps],
+        )
+
+    return req, assemble
+
+def requirement_detail(
+    db: Session, code: str, req_id: int, view: RowView = FULL_VIEW
+) -> Optional[RequirementDetailOut]:
+    found = _prefetch_detail(db, code, req_id, view)
+    return found[1]() if found else None
+
+def _detail_mapping_fields(maps: Iterable[Mapping]) -> Tuple[List[str], List[str]]:
+    """상세의 (매핑 코드, 매핑 서비스) — 매핑 테이블 조인 결과 순서, 서비스는 중복 제거."""
     mapping_codes = [m.code for m in maps if getattr(m, "code", None)]
 
     # 상세에도 매핑 서비스 리스트 제공
@@ -213,26 +384,39 @@ def requirement_detail(db: Session, code: str, req_id: int) -> Optional[Requirem
         if s and s not in seen:
             seen.add(s)
             mapping_services.append(s)
+    return mapping_codes, mapping_services
+
+def mappings_by_requirement(db: Session, framework_code: str) -> Dict[int, List[Mapping]]:
+    """프레임워크 요건별 매핑(상세와 같은 순서)을 한 번에 조회 — 상세 문서 일괄 생성용(스냅샷)."""
+    out: Dict[int, List[Mapping]] = {}
+    for req_id, m in db.execute(
+        select(RequirementMapping.requirement_id, Mapping)
+        .join(Mapping, Mapping.code == RequirementMapping.mapping_code)
+        .join(Requirement, Requirement.id == RequirementMapping.requirement_id)
+        .where(Requirement.framework_code == framework_code)
+        .order_by(RequirementMapping.requirement_id, RequirementMapping.mapping_code)
+    ).all():
+        out.setdefault(req_id, []).append(m)
+    return out
 
-    req_out = RequirementRowOut.model_validate(req).model_copy(
-        update={
+def detail_from_row(framework_code: str, row: dict, maps: List[Mapping]) -> dict:
+    """
+    보강까지 끝난 목록 행(model_dump) + 그 요건의 매핑 → 같은 요건 상세(requirement_detail_with_*)의 model_dump.
+    - 상세는 매핑 코드/서비스를 매핑 조인 결과로 채우고, 빈 본문은 None(_extract_regulation_text)
+    """
+    mapping_codes, mapping_services = _detail_mapping_fields(maps)
+    reg_text = row.get("regulation") or None
+    return {
+        "framework": framework_code,
+        "regulation": reg_text,
+        "requirement": {
+            **row,
             "regulation": reg_text,
             "mapping_codes": mapping_codes or None,
             "mapping_services": mapping_services or None,
-        }
-    )
-
-    # SAGE-Threat(위협 카탈로그)일 때만 applicable_hits 제공
-    if code == "SAGE-Threat":
-        hits = _build_applicable_hits(db, getattr(req, "applicable_compliance", None))
-        req_out = req_out.model_copy(update={"applicable_hits": hits})
-
-    return RequirementDetailOut(
-        framework=req.framework_code,
-        regulation=reg_text,
-        requirement=req_out,
-        mappings=[MappingOut.model_validate(m) for m in maps],
-    )
+        },
+        "mappings": [MappingOut.model_validate(m).model_dump() for m in maps],
+    }
 
 # -----------------------------------------------------------------------------
 # ThreatGroup 매핑(그룹명 추가) — 기존 동작 유지(SAGE-Threat 전용)
@@ -240,91 +424,101 @@ def requirement_detail(db: Session, code: str, req_id: int) -> Optional[Requirem
 def _norm_text(s: Optional[str]) -> str:
     return (s or "").strip().lower()
 
-def _candidate_groups(db: Session, title: Optional[str]) -> List[str]:
+def _prefetch_group_lookup(db: Session, signature: Optional[Tuple] = None) -> Callable[[], ThreatGroupLookup]:
+    return prefetch_threat_group_lookup(db, _fold_for(db), signature=signature)
+
+def _candidate_groups_from(lookup: ThreatGroupLookup, title: Optional[str]) -> List[str]:
     """
     title로 ThreatGroup 후보 전부 수집(정확→부분). 중복 제거, 원문 표기 유지.
+    - 정확: lower(Threat.title) == title.strip().lower()  (SQLite lower: ASCII만)
+    - 부분: Threat.title ILIKE '%title%'
     """
     t = _norm_text(title)
     if not t:
         return []
-    names: List[str] = []
 
-    exact = (
-        db.query(ThreatGroup.name)
-        .join(Threat, Threat.group_id == ThreatGroup.id)
-        .filter(func.lower(Threat.title) == t)
-        .distinct()
-        .all()
-    )
-    names.extend([n for (n,) in exact])
-    if names:
-        return sorted(set(names))  # 정확 일치 우선
-
-    like_hits = (
-        db.query(ThreatGroup.name)
-        .join(Threat, Threat.group_id == ThreatGroup.id)
-        .filter(Threat.title.ilike(f"%{title}%"))
-        .distinct()
-        .all()
-    )
-    names.extend([n for (n,) in like_hits])
-    return sorted(set(names))
+    def compute() -> List[str]:
+        names = lookup.exact_groups(t)
+        if not names:
+            names = lookup.substring_groups(_like_matcher(title, lookup.fold))
+        return sorted(names)  # 정확 일치 우선
+
+    return lookup.memo(title, compute)
 
 def _pick_primary_group(candidates: List[str]) -> Optional[str]:
     return candidates[0] if candidates else None
 
-def list_requirements_with_groups(db: Session, framework_code: str) -> List[RequirementRowWithGroupsOut]:
+def _with_groups(m: RequirementRowOut, primary: Optional[str], candidates: List[str]) -> RequirementRowWithGroupsOut:
+    # m은 이미 검증된 행 → 재검증(model_dump → model_validate) 없이 필드만 확장
+    return RequirementRowWithGroupsOut.model_construct(
+        **dict(m), threat_group=primary, threat_groups=list(candidates) or None
+    )
+
+def prefetch_requirements_with_groups(
+    db: Session, framework_code: str, *, after_id: Optional[int] = None, limit: Optional[int] = None,
+    view: RowView = FULL_VIEW,
+) -> Callable[[], List[RequirementRowWithGroupsOut]]:
+    """list_requirements_with_groups의 조회(SQL)/조립(CPU) 분리 버전."""
+    rows, base = _prefetch_requirements(db, framework_code, after_id, limit, view)
+    is_threat = framework_code == "SAGE-Threat" and view.enrich("groups")
+    if not rows or not is_threat:
+        return lambda: [_with_groups(m, None, []) for m in base()]
+    lookup = _prefetch_group_lookup(db)
+
+    def assemble() -> List[RequirementRowWithGroupsOut]:
+        base_rows = base()
+        out: List[RequirementRowWithGroupsOut] = []
+        with timed("enrich"):
+            groups = lookup()
+            for m in base_rows:
+                candidates = _candidate_groups_from(groups, m.title)
+                out.append(_with_groups(m, _pick_primary_group(candidates), candidates))
+        return out
+
+    return assemble
+
+def list_requirements_with_groups(
+    db: Session, framework_code: str, *, after_id: Optional[int] = None, limit: Optional[int] = None,
+    view: RowView = FULL_VIEW,
+) -> List[RequirementRowWithGroupsOut]:
     """
     기존 list_requirements 결과에 threat_group(단수) + threat_groups(복수) 주입.
-    SAGE-Threat가 아니면 둘 다 None.
+    SAGE-Threat가 아니면(또는 groups 보강 제외 시) 둘 다 None.
     """
-    base_rows = list_requirements(db, framework_code)
-    out: List[RequirementRowWithGroupsOut] = []
-    is_threat = framework_code == "SAGE-Threat"
-
-    for m in base_rows:
-        if is_threat:
-            candidates = _candidate_groups(db, m.title)
-            primary = _pick_primary_group(candidates)
-            out.append(
-                RequirementRowWithGroupsOut.model_validate(
-                    m.model_dump()
-                    | {"threat_group": primary, "threat_groups": candidates or None}
-                )
-            )
+    return prefetch_requirements_with_groups(db, framework_code, after_id=after_id, limit=limit, view=view)()
+
+def prefetch_requirement_detail_with_groups(
+    db: Session, code: str, req_id: int, view: RowView = FULL_VIEW
+) -> Callable[[], Optional[RequirementDetailWithGroupsOut]]:
+    """requirement_detail_with_groups의 조회(SQL)/조립(CPU) 분리 버전."""
+    found = _prefetch_detail(db, code, req_id, view)
+    if not found:
+        return lambda: None
+    _req, base_detail = found
+    lookup = _prefetch_group_lookup(db) if code == "SAGE-Threat" and view.enrich("groups") else None
+
+    def assemble() -> RequirementDetailWithGroupsOut:
+        base = base_detail()
+        if lookup is not None:
+            with timed("enrich"):
+                candidates = _candidate_groups_from(lookup(), base.requirement.title)
+            req_with_groups = _with_groups(base.requirement, _pick_primary_group(candidates), candidates)
         else:
-            out.append(
-                RequirementRowWithGroupsOut.model_validate(
-                    m.model_dump() | {"threat_group": None, "threat_groups": None}
-                )
-            )
-    return out
-
-def requirement_detail_with_groups(
-    db: Session, code: str, req_id: int
-) -> Optional[RequirementDetailWithGroupsOut]:
-    base = requirement_detail(db, code, req_id)
-    if not base:
-        return None
+            req_with_groups = _with_groups(base.requirement, None, [])
 
-    if code == "SAGE-Threat":
-        candidates = _candidate_groups(db, base.requirement.title)
-        primary = _pick_primary_group(candidates)
-        req_with_groups = RequirementRowWithGroupsOut.model_validate(
-            base.requirement.model_dump()
-            | {"threat_group": primary, "threat_groups": candidates or None}
-        )
-    else:
-        req_with_groups = RequirementRowWithGroupsOut.model_validate(
-            base.requirement.model_dump() | {"threat_group": None, "threat_groups": None}
+        return RequirementDetailWithGroupsOut(
+            framework=base.framework,
+            regulation=base.regulation,
+            requirement=req_with_groups,
+            mappings=base.mappings,
         )
 
-    return RequirementDetailWithGroupsOut(
-        framework=base.framework,
-        regulation=base.regulation,
-        requirement=req_with_groups,
-        mappings=base.mappings,
-    )
+    return assemble
+
+def requirement_detail_with_groups(
+    db: Session, code: str, req_id: int, view: RowView = FULL_VIEW
+) -> Optional[RequirementDetailWithGroupsOut]:
+    return prefetch_requirement_detail_with_groups(db, code, req_id, view)()
 
 # -----------------------------------------------------------------------------
 # 🔶 신규: “컴플라이언스(요구사항) → 개별 위협(Threat)” 자동 제안 매핑
@@ -391,37 +585,33 @@ def _score_match(req_tok: dict, thr_tok: dict) -> Tuple[float, List[str]]:
 
     return score, reasons
 
-def _suggest_threats_for_requirement(
-    db: Session, req: RequirementRowOut, top_k: int = 8, min_score: float = 2.0
+def _suggest_from_index(
+    index: ThreatIndex, req: RequirementRowOut, top_k: int = 8, min_score: float = 2.0
 ) -> List[ThreatMiniOut]:
+    """
+    위협 역색인(threat_index)으로 토큰을 공유하는 위협만 점수화한다.
+    - 점수/사유/정렬은 기존 전수 스캔 방식과 동일
+    """
     req_tok = _tokenize_requirement(req)
-    rows = (
-        db.query(Threat, ThreatGroup.name.label("group_name"))
-        .join(ThreatGroup, Threat.group_id == ThreatGroup.id, isouter=True)
-        .all()
-    )
 
-    scored: List[Tuple[float, Threat, Optional[str], List[str]]] = []
-    for t, gname in rows:
-        thr_tok = _tokenize_threat(t, gname)
-        s, reasons = _score_match(req_tok, thr_tok)
-        if s >= min_score:
-            scored.append((s, t, gname, reasons))
-
-    scored.sort(key=lambda x: x[0], reverse=True)
-
-    out: List[ThreatMiniOut] = []
-    for s, t, gname, reasons in scored[:top_k]:
-        out.append(
-            ThreatMiniOut(
-                id=t.id,
-                title=t.title,
-                group_name=gname,
-                score=float(s),
-                reasons=reasons,
-            )
+    query_tokens = set(req_tok["bag"])
+    query_tokens |= _bag_from_list(req_tok.get("svcs", []))
+    query_tokens |= _bag_from_list(req_tok.get("codes", []))
+
+    hits = index.top_k(req_tok, _score_match, query_tokens, top_k=top_k, min_score=min_score)
+    return [
+        ThreatMiniOut(
+            id=h.id,
+            title=h.title,
+            group_name=h.group_name,
+            score=h.score,
+            reasons=h.reasons,
         )
-    return out
+        for h in hits
+    ]
+
+def _prefetch_threat_index(db: Session, signature: Optional[Tuple] = None) -> Callable[[], ThreatIndex]:
+    return prefetch_threat_index(db, _tokenize_threat, signature=signature)
 
 # -----------------------------------------------------------------------------
 # 🔶 신규: 고정 위협 매핑(포함 검색) — 내 컴플라이언스 문자열 ↔ SAGE-Threat.applicable_compliance
@@ -442,25 +632,17 @@ def _like_patterns_from_requirement(m: RequirementRowOut) -> List[str]:
             uniq.append(p)
     return uniq
 
-def _find_fixed_threats_for_requirement(db: Session, m: RequirementRowOut, top_k: int = 12) -> List[ThreatMiniOut]:
-    pats = _like_patterns_from_requirement(m)
-    if not pats:
-        return []
-
-    q = db.query(Requirement).filter(Requirement.framework_code == "SAGE-Threat")
-    like_conds = []
-    for p in pats:
-        like_conds.append(Requirement.applicable_compliance.ilike(f"%{p}%"))
-        like_conds.append(Requirement.title.ilike(f"%{p}%"))
-        like_conds.append(Requirement.description.ilike(f"%{p}%"))
-    q = q.filter(or_(*like_conds)).order_by(Requirement.id.desc())
-
-    rows = q.limit(top_k * 3).all()
-
+def _fixed_threats_from_rows(
+    rows: Iterable, pats: List[str], groups_for, top_k: int
+) -> List[ThreatMiniOut]:
+    """
+    매칭된 SAGE-Threat 행(id 내림차순) → ThreatMiniOut 목록(제목 dedup, 최대 top_k).
+    groups_for(title) -> 후보 그룹명 목록
+    """
     out: List[ThreatMiniOut] = []
     seen_titles: Set[str] = set()
     for r in rows:
-        candidates = _candidate_groups(db, r.title)
+        candidates = groups_for(r.title)
         primary = _pick_primary_group(candidates)
         reasons = []
         ac = (getattr(r, "applicable_compliance", "") or "")
@@ -490,51 +672,151 @@ def _find_fixed_threats_for_requirement(db: Session, m: RequirementRowOut, top_k
             break
     return out
 
-# -----------------------------------------------------------------------------
-# 목록/상세 with Threats (컴플라이언스 → 위협)
-# -----------------------------------------------------------------------------
-def list_requirements_with_threats(db: Session, framework_code: str) -> List[RequirementRowWithThreatsOut]:
-    base_rows = list_requirements(db, framework_code)
-    out: List[RequirementRowWithThreatsOut] = []
-
-    for m in base_rows:
-        fixed = _find_fixed_threats_for_requirement(db, m) or []
-        suggested = _suggest_threats_for_requirement(db, m) or []
-
-        # 통합(threats): 제목 기준 dedup
-        merged: List[ThreatMiniOut] = []
-        seen = set()
-        for lst in (fixed, suggested):
-            for t in lst:
-                k = (t.title or "").strip().lower()
-                if not k or k in seen:
-                    continue
-                seen.add(k)
-                merged.append(t)
+def _prefetch_fixed_threats(db: Session, m, top_k: int = 12) -> Callable[[], List[ThreatMiniOut]]:
+    """
+    요건 1건의 고정 위협: SQL(ILIKE, FTS 후보)만 먼저 실행하고 그룹 주입/정리는 반환 함수에서.
+    m: item_code/title 속성이 있는 요건(행/모델)
+    """
+    pats = _like_patterns_from_requirement(m)
+    if not pats:
+        return lambda: []
 
-        out.append(
-            RequirementRowWithThreatsOut.model_validate(
-                m.model_dump() | {
-                    "fixed_threats": fixed or None,
-                    "suggested_threats": suggested or None,
-                    "threats": merged or None,
-                }
-            )
-        )
-    return out
+    q = db.query(Requirement).filter(Requirement.framework_code == "SAGE-Threat")
+    like_conds = []
+    for p in pats:
+        like_conds.append(Requirement.applicable_compliance.ilike(f"%{p}%"))
+        like_conds.append(Requirement.title.ilike(f"%{p}%"))
+        like_conds.append(Requirement.description.ilike(f"%{p}%"))
+    q = q.filter(or_(*like_conds)).order_by(Requirement.id.desc())
 
-def requirement_detail_with_threats(
-    db: Session, code: str, req_id: int
-) -> Optional[RequirementDetailWithThreatsOut]:
-    base = requirement_detail(db, code, req_id)
-    if not base:
-        return None
+    # FTS5 색인이 있으면 후보 id로 먼저 좁힌 뒤 동일 조건으로 판정
+    if fts_available(db):
+        ids = fts_ids_for_patterns(db, pats)
+        if ids is not None:
+            if not ids:
+                return lambda: []
+            q = q.filter(Requirement.id.in_(ids))
 
-    # RequirementRowOut 으로 정규화
-    req_row = RequirementRowOut.model_validate(base.requirement.model_dump())
-    fixed = _find_fixed_threats_for_requirement(db, req_row) or []
-    suggested = _suggest_threats_for_requirement(db, req_row) or []
+    rows = q.limit(top_k * 3).all()
+    lookup = _prefetch_group_lookup(db)
 
+    def assemble() -> List[ThreatMiniOut]:
+        groups = lookup()
+        return _fixed_threats_from_rows(rows, pats, lambda title: _candidate_groups_from(groups, title), top_k)
+
+    return assemble
+
+# -----------------------------------------------------------------------------
+# 배치 위협 보강(목록용): SAGE-Threat 행/위협/그룹을 요청당 1회만 로드
+# - SQL(ILIKE)과 동일한 결과를 내도록 DB의 LIKE 의미를 파이썬으로 재현
+# -----------------------------------------------------------------------------
+_ASCII_LOWER = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+
+def _ascii_lower(s: str) -> str:
+    # SQLite lower()/LIKE 는 ASCII 문자만 대소문자 무시
+    return s.translate(_ASCII_LOWER)
+
+def _fold_for(db: Session) -> Callable[[str], str]:
+    """대소문자 무시 규칙: SQLite는 ASCII만, 그 외(PostgreSQL lower()/ILIKE)는 유니코드 전체."""
+    return _ascii_lower if db.get_bind().dialect.name == "sqlite" else str.lower
+
+def _like_matcher(needle: str, fold: Callable[[str], str] = _ascii_lower):
+    """`col ILIKE '%needle%'` 와 같은 판정을 하는 함수 반환(%, _ 와일드카드 포함). fold: _fold_for(db)"""
+    n = fold(needle)
+    if "%" not in n and "_" not in n:
+        return lambda hay: hay is not None and n in fold(hay)
+    pat = "".join(".*" if ch == "%" else "." if ch == "_" else re.escape(ch) for ch in n)
+    rx = re.compile(pat, re.DOTALL)
+    return lambda hay: hay is not None and rx.search(fold(hay)) is not None
+
+@dataclass(frozen=True)
+class _SageRow:
+    id: int
+    title: Optional[str]
+    description: Optional[str]
+    applicable_compliance: Optional[str]
+
+class _ThreatEnrichment:
+    """
+    list_requirements_with_threats 1회 호출 동안 공유하는 조회 결과.
+    - SAGE-Threat 요건(id 내림차순), (위협 제목, 그룹명) 목록, 위협 역색인
+    - FTS5 색인이 있으면 대상 요건들의 패턴 후보 id를 한 번에 조회
+    - SQL은 생성/prefetch 시에만 실행, 색인 빌드와 판정(fixed/suggested)은 DB 없이 수행
+    """
+    def __init__(self, db: Session, targets: Iterable = ()):
+        self.sage_rows: List[_SageRow] = [
+            _SageRow(*r)
+            for r in db.execute(
+                select(
+                    Requirement.id,
+                    Requirement.title,
+                    Requirement.description,
+                    Requirement.applicable_compliance,
+                )
+                .where(Requirement.framework_code == "SAGE-Threat")
+                .order_by(Requirement.id.desc())
+            ).all()
+        ]
+        sig = threat_signature(db)
+        self.fold = _fold_for(db)
+        self._index = _prefetch_threat_index(db, signature=sig)
+        self._groups = _prefetch_group_lookup(db, signature=sig)
+
+        self._rows_by_id = {r.id: r for r in self.sage_rows}
+        self._fts: Dict[str, Set[int]] = {}
+        self._use_fts = fts_available(db)
+        self.prefetch(db, targets)
+
+    @cached_property
+    def index(self) -> ThreatIndex:
+        return self._index()
+
+    @cached_property
+    def groups(self) -> ThreatGroupLookup:
+        return self._groups()
+
+    def prefetch(self, db: Session, targets: Iterable) -> None:
+        """대상 요건들(item_code/title 속성이 있는 행/모델)의 패턴 후보 id를 FTS에서 한 번에 조회(색인 있을 때만)."""
+        if not self._use_fts:
+            return
+        pats = [p for m in targets for p in _like_patterns_from_requirement(m) if p not in self._fts]
+        if pats:
+            self._fts.update(fts_candidate_ids(db, pats))
+
+    def _scan_rows(self, pats: List[str]) -> Iterable[_SageRow]:
+        """패턴 후보 행(id 내림차순). FTS로 못 좁히면 전체 행."""
+        if not all(p in self._fts for p in pats):
+            return self.sage_rows
+        ids: Set[int] = set()
+        for p in pats:
+            ids |= self._fts[p]
+        return [self._rows_by_id[i] for i in sorted(ids, reverse=True) if i in self._rows_by_id]
+
+    def candidate_groups(self, title: Optional[str]) -> List[str]:
+        return _candidate_groups_from(self.groups, title)
+
+    def fixed_threats(self, m: RequirementRowOut, top_k: int = 12) -> List[ThreatMiniOut]:
+        pats = _like_patterns_from_requirement(m)
+        if not pats:
+            return []
+        matchers = [_like_matcher(p, self.fold) for p in pats]
+        limit = top_k * 3
+        rows: List[_SageRow] = []
+        for r in self._scan_rows(pats):
+            if any(
+                match(r.applicable_compliance) or match(r.title) or match(r.description)
+                for match in matchers
+            ):
+                rows.append(r)
+                if len(rows) >= limit:
+                    break
+        return _fixed_threats_from_rows(rows, pats, self.candidate_groups, top_k)
+
+    def suggested_threats(self, m: RequirementRowOut) -> List[ThreatMiniOut]:
+        return _suggest_from_index(self.index, m)
+
+def _merge_threats(fixed: List[ThreatMiniOut], suggested: List[ThreatMiniOut]) -> List[ThreatMiniOut]:
+    # 통합(threats): 제목 기준 dedup
     merged: List[ThreatMiniOut] = []
     seen = set()
     for lst in (fixed, suggested):
@@ -544,18 +826,260 @@ def requirement_detail_with_threats(
                 continue
             seen.add(k)
             merged.append(t)
+    return merged
+
+def _with_threats(
+    m: RequirementRowOut, fixed: List[ThreatMiniOut], suggested: List[ThreatMiniOut]
+) -> RequirementRowWithThreatsOut:
+    merged = _merge_threats(fixed, suggested)
+    # m/위협 항목은 이미 검증된 모델 → 재검증(model_dump → model_validate) 없이 필드만 확장
+    return RequirementRowWithThreatsOut.model_construct(
+        **dict(m),
+        fixed_threats=fixed or None,
+        suggested_threats=suggested or None,
+        threats=merged or None,
+    )
 
-    req_with_threats = RequirementRowWithThreatsOut.model_validate(
-        req_row.model_dump() | {
-            "fixed_threats": fixed or None,
-            "suggested_threats": suggested or None,
-            "threats": merged or None,
+# -----------------------------------------------------------------------------
+# 요구사항 → 위협 링크 물리화(requirement_threat)
+# - scripts/load_csv.py 가 적재 후 계산해 저장, 조회 API는 인덱스 조인만 수행
+# - ready 플래그가 없으면(미계산/적재 중) 요청 시 계산으로 폴백
+# -----------------------------------------------------------------------------
+THREAT_LINKS_READY_KEY = "requirement_threat.ready"
+
+_ID_CHUNK = 500
+
+def threat_links_ready(db: Session) -> bool:
+    return get_meta(db, THREAT_LINKS_READY_KEY) == "1"
+
+def mark_threat_links_stale(db: Session) -> None:
+    set_meta(db, THREAT_LINKS_READY_KEY, "0")
+
+def mark_threat_links_ready(db: Session) -> None:
+    set_meta(db, THREAT_LINKS_READY_KEY, "1")
+
+def _threat_link_rows(requirement_id: int, kind: str, threats: List[ThreatMiniOut]) -> List[dict]:
+    return [
+        {
+            "requirement_id": requirement_id,
+            "kind": kind,
+            "rank": rank,
+            "threat_id": t.id,
+            "title": t.title,
+            "group_name": t.group_name,
+            "score": t.score,
+            "reasons": json.dumps(t.reasons, ensure_ascii=False) if t.reasons is not None else None,
         }
-    )
+        for rank, t in enumerate(threats)
+    ]
 
-    return RequirementDetailWithThreatsOut(
-        framework=base.framework,
-        regulation=base.regulation,
-        requirement=req_with_threats,
-        mappings=base.mappings,
-    )
+def refresh_requirement_threats(db: Session, requirement_ids: Optional[Iterable[int]] = None) -> int:
+    """
+    고정/제안 위협을 계산해 requirement_threat 에 저장한다(커밋은 호출 측 책임).
+    - requirement_ids=None 이면 전체 재계산 후 ready 표시
+    - 일부 id만 주면 해당 요건만 재계산(ready 상태는 그대로)
+    반환: 재계산한 요건 수
+    """
+    if requirement_ids is None:
+        db.execute(delete(RequirementThreat))
+        rows = _requirement_rows(db)
+    else:
+        ids = sorted(set(requirement_ids))
+        rows = []
+        for start in range(0, len(ids), _ID_CHUNK):
+            chunk = ids[start:start + _ID_CHUNK]
+            db.execute(delete(RequirementThreat).where(RequirementThreat.requirement_id.in_(chunk)))
+            rows.extend(_requirement_rows(db, Requirement.id.in_(chunk)))
+
+    if rows:
+        ctx = _ThreatEnrichment(db, rows)
+        links: List[dict] = []
+        for m in rows:
+            links.extend(_threat_link_rows(m.id, "fixed", ctx.fixed_threats(m) or []))
+            links.extend(_threat_link_rows(m.id, "suggested", ctx.suggested_threats(m) or []))
+            if len(links) >= 5000:
+                db.execute(insert(RequirementThreat), links)
+                links = []
+        if links:
+            db.execute(insert(RequirementThreat), links)
+
+    if requirement_ids is None:
+        mark_threat_links_ready(db)
+    return len(rows)
+
+def _fetch_threat_links(db: Session, *criteria) -> list:
+    """requirement_threat 행(requirement_id, kind, rank 순). criteria 는 Requirement 조건."""
+    return db.execute(
+        select(RequirementThreat)
+        .join(Requirement, Requirement.id == RequirementThreat.requirement_id)
+        .where(*criteria)
+        .order_by(RequirementThreat.requirement_id, RequirementThreat.kind, RequirementThreat.rank)
+    ).scalars().all()
+
+def _threat_links_from_rows(rows: Iterable[RequirementThreat]) -> Dict[int, Tuple[List[ThreatMiniOut], List[ThreatMiniOut]]]:
+    """requirement_id → (fixed, suggested)."""
+    out: Dict[int, Tuple[List[ThreatMiniOut], List[ThreatMiniOut]]] = {}
+    for r in rows:
+        fixed, suggested = out.setdefault(r.requirement_id, ([], []))
+        t = ThreatMiniOut(
+            id=r.threat_id,
+            title=r.title,
+            group_name=r.group_name,
+            score=r.score,
+            reasons=json.loads(r.reasons) if r.reasons is not None else None,
+        )
+        (fixed if r.kind == "fixed" else suggested).append(t)
+    return out
+
+def _load_threat_links(db: Session, *criteria) -> Dict[int, Tuple[List[ThreatMiniOut], List[ThreatMiniOut]]]:
+    return _threat_links_from_rows(_fetch_threat_links(db, *criteria))
+
+# -----------------------------------------------------------------------------
+# 목록/상세 with Threats (컴플라이언스 → 위협)
+# -----------------------------------------------------------------------------
+def prefetch_requirements_with_threats(
+    db: Session, framework_code: str, *, after_id: Optional[int] = None, limit: Optional[int] = None,
+    view: RowView = FULL_VIEW,
+) -> Callable[[], List[RequirementRowWithThreatsOut]]:
+    """list_requirements_with_threats의 조회(SQL)/조립(CPU) 분리 버전."""
+    rows, base = _prefetch_requirements(db, framework_code, after_id, limit, view)
+    if not rows:
+        return lambda: []
+    if not view.enrich("threats"):
+        return lambda: [_with_threats(m, [], []) for m in base()]
+
+    if threat_links_ready(db):
+        link_rows = _fetch_threat_links(
+            db,
+            Requirement.framework_code == framework_code,
+            Requirement.id.between(rows[0].id, rows[-1].id),
+        )
+
+        def assemble_links() -> List[RequirementRowWithThreatsOut]:
+            base_rows = base()
+            with timed("enrich"):
+                links = _threat_links_from_rows(link_rows)
+                return [_with_threats(m, *links.get(m.id, ([], []))) for m in base_rows]
+
+        return assemble_links
+
+    ctx = _ThreatEnrichment(db, rows)
+
+    def assemble() -> List[RequirementRowWithThreatsOut]:
+        base_rows = base()
+        with timed("enrich"):
+            return [
+                _with_threats(m, ctx.fixed_threats(m) or [], ctx.suggested_threats(m) or [])
+                for m in base_rows
+            ]
+
+    return assemble
+
+def list_requirements_with_threats(
+    db: Session, framework_code: str, *, after_id: Optional[int] = None, limit: Optional[int] = None,
+    view: RowView = FULL_VIEW,
+) -> List[RequirementRowWithThreatsOut]:
+    """
+    list_requirements 결과(페이지)에 고정/제안 위협 주입. 보강은 반환되는 행에만 수행.
+    - view에서 threats 보강을 빼면 위협 계산/조회 없이 반환
+    """
+    return prefetch_requirements_with_threats(db, framework_code, after_id=after_id, limit=limit, view=view)()
+
+def iter_requirements_with_threats(
+    db: Session, framework_code: str, chunk_size: int = 500
+) -> Iterator[RequirementRowWithThreatsOut]:
+    """
+    전체 내보내기용: 서버측 커서(yield_per)로 chunk_size 행씩 읽어 위협을 보강하며 1행씩 yield.
+    - 전체 목록을 메모리에 올리지 않음(applicable_hits 제외)
+    """
+    q = _requirement_row_query(db, Requirement.framework_code == framework_code).yield_per(chunk_size)
+    use_links = threat_links_ready(db)
+    ctx: Optional[_ThreatEnrichment] = None
+
+    chunk: List[RequirementRowOut] = []
+
+    def flush(rows: List[RequirementRowOut]) -> Iterator[RequirementRowWithThreatsOut]:
+        nonlocal ctx
+        if use_links:
+            links = _load_threat_links(
+                db,
+                Requirement.framework_code == framework_code,
+                Requirement.id.between(rows[0].id, rows[-1].id),
+            )
+            for m in rows:
+                yield _with_threats(m, *links.get(m.id, ([], [])))
+            return
+        if ctx is None:
+            ctx = _ThreatEnrichment(db, rows)
+        else:
+            ctx.prefetch(db, rows)
+        for m in rows:
+            yield _with_threats(m, ctx.fixed_threats(m) or [], ctx.suggested_threats(m) or [])
+
+    for r in q:
+        chunk.append(_row_to_model(r))
+        if len(chunk) >= chunk_size:
+            yield from flush(chunk)
+            chunk = []
+    if chunk:
+        yield from flush(chunk)
+
+def prefetch_requirement_detail_with_threats(
+    db: Session, code: str, req_id: int, view: RowView = FULL_VIEW
+) -> Callable[[], Optional[RequirementDetailWithThreatsOut]]:
+    """requirement_detail_with_threats의 조회(SQL)/조립(CPU) 분리 버전."""
+    found = _prefetch_detail(db, code, req_id, view)
+    if not found:
+        return lambda: None
+    req, base_detail = found
+
+    links: Optional[list] = None
+    fixed_src = suggested_src = None
+    if view.enrich("threats"):
+        if threat_links_ready(db):
+            links = _fetch_threat_links(db, Requirement.id == req.id)
+        else:
+            fixed_src = _prefetch_fixed_threats(db, req)
+            suggested_src = _prefetch_threat_index(db)
+
+    def assemble() -> RequirementDetailWithThreatsOut:
+        base = base_detail()
+        # RequirementRowOut 으로 정규화
+        req_row = RequirementRowOut.model_validate(base.requirement.model_dump())
+        with timed("enrich"):
+            if links is not None:
+                fixed, suggested = _threat_links_from_rows(links).get(req_row.id, ([], []))
+            elif fixed_src is not None:
+                fixed = fixed_src() or []
+                suggested = _suggest_from_index(suggested_src(), req_row) or []
+            else:
+                fixed, suggested = [], []
+            req_with_threats = _with_threats(req_row, fixed, suggested)
+
+        return RequirementDetailWithThreatsOut(
+            framework=base.framework,
+            regulation=base.regulation,
+            requirement=req_with_threats,
+            mappings=base.mappings,
+        )
+
+    return assemble
+
+def requirement_detail_with_threats(
+    db: Session, code: str, req_id: int, view: RowView = FULL_VIEW
+) -> Optional[RequirementDetailWithThreatsOut]:
+    return prefetch_requirement_detail_with_threats(db, code, req_id, view)()
+
+# -----------------------------------------------------------------------------
+# 비동기 버전 (async 라우트용, AsyncSession)
+# - SQL만 실행하는 가벼운 조회: run_sync가 같은 커넥션에서 실행하고
+#   DB I/O는 비동기 드라이버(aiosqlite/asyncpg)로 대기 → 스레드풀 워커를 점유하지 않음
+# - 목록/상세는 prefetch_*를 run_sync로(SQL만), 반환된 조립 함수(위협 점수화/그룹/applicable_hits 보강)는
+#   스레드풀에서 실행 → response_cache.cached_payload_threaded
+# - 로더/내보내기 등 동기 경로는 위 함수를 직접 사용
+# -----------------------------------------------------------------------------
+async def framework_counts_async(db: AsyncSession) -> List[FrameworkCountOut]:
+    return await db.run_sync(framework_counts)
+
+async def count_requirements_async(db: AsyncSession, framework_code: str) -> int:
+    return await db.run_sync(count_requirements, framework_code)
@@ -0,0 +1,129 @@
+# app/services/requirement_index.py
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+from sqlalchemy import select, func
+from sqlalchemy.orm import Session
+
+from ..core.meta import DATA_VERSION_KEY, get_data_version
+from ..models import Requirement
+
+# -----------------------------------------------------------------------------
+# 비 SAGE 요건 색인(applicable_compliance 역참조용)
+# - item_code → 위치(정확 일치), 제목 부분 일치는 메모리 스캔
+# - 토큰(code, title)별 결과는 색인에 메모(색인은 데이터 세대마다 재빌드 → 메모도 함께 폐기)
+# - 위치 순서 = (framework_code, id) — 기존 SQL ORDER BY와 동일
+# -----------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class RequirementEntry:
+    id: int
+    framework_code: str
+    item_code: Optional[str]
+    title: Optional[str]
+    description: Optional[str]
+
+class RequirementIndex:
+    MEMO_MAX = 4096
+
+    def __init__(self, entries: List[RequirementEntry], signature: Tuple):
+        self.entries = entries
+        self.signature = signature
+        self.by_code: Dict[str, List[int]] = {}
+        for pos, e in enumerate(entries):
+            if e.item_code:
+                self.by_code.setdefault(e.item_code, []).append(pos)
+        self._memo: Dict[Hashable, List[RequirementEntry]] = {}
+
+    @staticmethod
+    def fetch(db: Session) -> list:
+        """빌드 원본: 비 SAGE 요건 행, (framework_code, id) 순."""
+        return db.execute(
+            select(
+                Requirement.id,
+                Requirement.framework_code,
+                Requirement.item_code,
+                Requirement.title,
+                Requirement.description,
+            )
+            .where(Requirement.framework_code != "SAGE-Threat")
+            .order_by(Requirement.framework_code, Requirement.id)
+        ).all()
+
+    @classmethod
+    def from_rows(cls, rows: list, signature: Tuple) -> "RequirementIndex":
+        return cls([RequirementEntry(*r) for r in rows], signature)
+
+    @classmethod
+    def build(cls, db: Session, signature: Optional[Tuple] = None) -> "RequirementIndex":
+        return cls.from_rows(cls.fetch(db), signature if signature is not None else requirement_signature(db))
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def lookup(
+        self, code: Optional[str], title_match: Optional[Callable[[Optional[str]], bool]] = None
+    ) -> List[RequirementEntry]:
+        """`item_code == code OR title ILIKE ...`(title_match) 에 해당하는 요건(색인 순서)."""
+        pos: Set[int] = set(self.by_code.get(code, ())) if code else set()
+        if title_match is not None:
+            pos.update(i for i, e in enumerate(self.entries) if title_match(e.title))
+        return [self.entries[i] for i in sorted(pos)]
+
+    def memo(self, key: Hashable, compute: Callable[[], List[RequirementEntry]]) -> List[RequirementEntry]:
+        """lookup 결과 메모(제목 부분 일치는 전체 스캔 → 같은 토큰은 요청이 바뀌어도 1회만)."""
+        hit = self._memo.get(key)
+        if hit is None:
+            hit = compute()
+            if len(self._memo) >= self.MEMO_MAX:
+                self._memo.clear()
+            self._memo[key] = hit
+        return hit
+
+# -----------------------------------------------------------------------------
+# 프로세스 캐시: 데이터 세대(로더 재적재)가 바뀌면 재빌드
+# -----------------------------------------------------------------------------
+_lock = threading.Lock()
+_cached: Optional[RequirementIndex] = None
+
+def requirement_signature(db: Session) -> Tuple:
+    """
+    재적재 감지용 시그니처: 데이터 세대 번호(요청 세션에 기억된 값 우선).
+    세대가 기록되지 않은 DB는 요건 건수 + 최대 id.
+    """
+    version = db.info[DATA_VERSION_KEY] if DATA_VERSION_KEY in db.info else get_data_version(db)
+    if version is not None:
+        return ("v", version)
+    row = db.execute(select(func.count(Requirement.id), func.max(Requirement.id))).one()
+    return ("n",) + tuple(row)
+
+def prefetch_requirement_index(db: Session) -> Callable[[], RequirementIndex]:
+    """
+    get_requirement_index의 조회(SQL)/빌드(CPU) 분리 버전.
+    - 캐시가 유효하면 그 색인을, 아니면 원본 행만 읽어 두고 반환 함수 호출 시 빌드(스레드풀에서 호출 가능)
+    """
+    sig = requirement_signature(db)
+    idx = _cached
+    if idx is not None and idx.signature == sig:
+        return lambda: idx
+    rows = RequirementIndex.fetch(db)
+
+    def build() -> RequirementIndex:
+        global _cached
+        with _lock:
+            if _cached is None or _cached.signature != sig:
+                _cached = RequirementIndex.from_rows(rows, sig)
+            return _cached
+
+    return build
+
+def get_requirement_index(db: Session) -> RequirementIndex:
+    return prefetch_requirement_index(db)()
+
+def invalidate_requirement_index() -> None:
+    global _cached
+    with _lock:
+        _cached = None
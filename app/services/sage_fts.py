@@ -0,0 +1,102 @@
+# app/services/sage_fts.py
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+# -----------------------------------------------------------------------------
+# SAGE-Threat 고정 위협 조회용 FTS5 색인 (SQLite 전용)
+# - trigram 토크나이저: 한글 부분 문자열도 매칭(질의어 3글자 이상)
+# - 색인은 후보 축소용: 최종 판정은 기존 ILIKE 조건으로 다시 수행
+# - FTS5/trigram 미지원 빌드면 색인 없이 기존 전수 검색으로 동작
+# -----------------------------------------------------------------------------
+FTS_TABLE = "sage_threat_fts"
+
+# SQLite 복합 SELECT(UNION ALL) 항목 수 제한(500) 이내로 나눠 질의
+_CHUNK = 200
+
+def _is_sqlite(db: Session) -> bool:
+    return db.get_bind().dialect.name == "sqlite"
+
+def rebuild_sage_fts(db: Session) -> bool:
+    """
+    SAGE-Threat 요건으로 FTS 색인을 전부 다시 채운다(로더에서 적재 후 호출).
+    반환: 색인 사용 가능 여부
+    """
+    if not _is_sqlite(db):
+        return False
+    try:
+        db.execute(text(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+            "USING fts5(applicable_compliance, title, description, tokenize='trigram')"
+        ))
+    except OperationalError:
+        db.rollback()
+        return False
+    db.execute(text(f"DELETE FROM {FTS_TABLE}"))
+    db.execute(text(
+        f"INSERT INTO {FTS_TABLE}(rowid, applicable_compliance, title, description) "
+        "SELECT id, coalesce(applicable_compliance, ''), coalesce(title, ''), coalesce(description, '') "
+        "FROM requirements WHERE framework_code = 'SAGE-Threat'"
+    ))
+    return True
+
+def fts_available(db: Session) -> bool:
+    if not _is_sqlite(db):
+        return False
+    try:
+        found = db.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :n"),
+            {"n": FTS_TABLE},
+        ).first()
+        if not found:
+            return False
+        # 색인은 있으나 이 SQLite 빌드에서 fts5를 못 읽는 경우 대비
+        db.execute(text(f"SELECT rowid FROM {FTS_TABLE} LIMIT 0"))
+        return True
+    except OperationalError:
+        return False
+
+def fts_searchable(pattern: str) -> bool:
+    """trigram은 3글자 이상만 검색 가능, LIKE 와일드카드(%, _)는 색인으로 재현 불가."""
+    return len(pattern) >= 3 and "%" not in pattern and "_" not in pattern
+
+def _phrase(pattern: str) -> str:
+    return '"' + pattern.replace('"', '""') + '"'
+
+def fts_candidate_ids(db: Session, patterns: Iterable[str]) -> Dict[str, Set[int]]:
+    """
+    패턴별 후보 rowid(= SAGE-Threat Requirement.id) 집합.
+    fts_searchable 가 아닌 패턴은 결과에 포함하지 않는다(호출 측에서 전수 검색).
+    """
+    todo: List[str] = []
+    seen: Set[str] = set()
+    for p in patterns:
+        if p not in seen and fts_searchable(p):
+            seen.add(p)
+            todo.append(p)
+
+    out: Dict[str, Set[int]] = {p: set() for p in todo}
+    for start in range(0, len(todo), _CHUNK):
+        chunk = todo[start:start + _CHUNK]
+        parts, params = [], {}
+        for i, p in enumerate(chunk):
+            parts.append(f"SELECT {i} AS k, rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :q{i}")
+            params[f"q{i}"] = _phrase(p)
+        for k, rowid in db.execute(text(" UNION ALL ".join(parts)), params).all():
+            out[chunk[k]].add(rowid)
+    return out
+
+def fts_ids_for_patterns(db: Session, patterns: List[str]) -> Optional[Set[int]]:
+    """
+    패턴 OR 조건의 후보 id 합집합. 색인으로 처리할 수 없는 패턴이 있으면 None.
+    """
+    if not patterns or not all(fts_searchable(p) for p in patterns):
+        return None
+    ids: Set[int] = set()
+    for s in fts_candidate_ids(db, patterns).values():
+        ids |= s
+    return ids
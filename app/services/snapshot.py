@@ -0,0 +1,172 @@
+# app/services/snapshot.py
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from ..core.meta import get_data_version
+from ..utils.export import ndjson_lines
+from ..utils.fastjson import dumps
+from .compliance_service import (
+    detail_from_row,
+    framework_counts,
+    list_requirements_with_groups,
+    list_requirements_with_threats,
+    mappings_by_requirement,
+)
+
+# =============================================================================
+# 읽기 전용 스냅샷(불변 파일)
+# - 로더(--snapshot)가 보강까지 끝난 /compliance 응답 문서(전체 필드/보강 기준)를 JSON 바이트로 기록
+# - API(SNAPSHOT_PATH)는 파일을 mmap으로 열어 SQL 없이 응답 → 워커 간 OS 페이지 캐시 공유
+#
+# 파일 구조:
+#   [헤더 24B: MAGIC(8) + 색인 오프셋(u64) + 색인 길이(u64)] [문서 JSON 바이트 ...] [색인 JSON]
+#   색인: {"format", "version"(데이터 세대), "created_at", "counts"{code: 요건 수}, "entries"{key: [offset, length]}}
+# 문서 키:
+#   stats / list/<threats|groups>/<code> / detail/<threats|groups>/<code>/<id>
+#   export/<code>: 내보내기 행(NDJSON, 행마다 1줄) → 통째로 파싱하지 않고 구간 그대로/줄 단위로 스트리밍
+# =============================================================================
+MAGIC = b"CMPSNAP1"
+_HEADER = struct.Struct("<8sQQ")
+FORMAT_VERSION = 2
+# 내보내기 스트리밍 조각 크기
+EXPORT_CHUNK = 64 * 1024
+
+def list_key(kind: str, code: str) -> str:
+    return f"list/{kind}/{code}"
+
+def detail_key(kind: str, code: str, req_id: int) -> str:
+    return f"detail/{kind}/{code}/{req_id}"
+
+def export_key(code: str) -> str:
+    return f"export/{code}"
+
+def export_rows(rows: List[dict]) -> Iterator[dict]:
+    """위협 결합 목록 문서 → 내보내기 행(applicable_hits 제외, DB 버전과 동일)."""
+    for row in rows:
+        yield {**row, "applicable_hits": None}
+
+# -----------------------------------------------------------------------------
+# 쓰기(로더)
+# -----------------------------------------------------------------------------
+def _documents(db: Session) -> Iterator[Tuple[str, bytes]]:
+    """
+    (키, 문서 바이트) — 라우트가 전체 필드/보강으로 만드는 것과 같은 model_dump 결과.
+    - 상세는 보강된 목록 행 + 프레임워크당 1회 매핑 조회로 생성(요건별 상세 조회 없음)
+    """
+    stats = [d.model_dump() for d in framework_counts(db)]
+    yield "stats", dumps(stats)
+    for fw in stats:
+        code = fw["framework"]
+        rows = [r.model_dump() for r in list_requirements_with_threats(db, code)]
+        group_rows = [r.model_dump() for r in list_requirements_with_groups(db, code)]
+        yield list_key("threats", code), dumps(rows)
+        yield list_key("groups", code), dumps(group_rows)
+        yield export_key(code), b"".join(ndjson_lines(export_rows(rows)))
+        maps = mappings_by_requirement(db, code)
+        for kind, kind_rows in (("threats", rows), ("groups", group_rows)):
+            for r in kind_rows:
+                yield detail_key(kind, code, r["id"]), dumps(detail_from_row(code, r, maps.get(r["id"], [])))
+
+def write_snapshot(db: Session, path: Path) -> Dict[str, Any]:
+    """
+    스냅샷 파일 생성(임시 파일에 쓴 뒤 원자적 교체 → 읽는 프로세스는 기존 파일을 계속 사용).
+    반환: 색인 메타(entries 제외)
+    """
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    entries: Dict[str, List[int]] = {}
+    counts: Dict[str, int] = {}
+    with tmp.open("wb") as f:
+        f.write(_HEADER.pack(MAGIC, 0, 0))
+        offset = _HEADER.size
+        for key, body in _documents(db):
+            if key == "stats":
+                counts = {d["framework"]: d["count"] for d in json.loads(body)}
+            f.write(body)
+            entries[key] = [offset, len(body)]
+            offset += len(body)
+        meta = {
+            "format": FORMAT_VERSION,
+            "version": get_data_version(db) or 0,
+            "created_at": round(time.time(), 3),
+            "counts": counts,
+        }
+        index = dumps({**meta, "entries": entries})
+        f.write(index)
+        f.seek(0)
+        f.write(_HEADER.pack(MAGIC, offset, len(index)))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    return {**meta, "documents": len(entries), "bytes": offset + len(index)}
+
+# -----------------------------------------------------------------------------
+# 읽기(API)
+# -----------------------------------------------------------------------------
+class Snapshot:
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with self.path.open("rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, index_offset, index_length = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or index_offset + index_length > len(self._mm):
+            raise ValueError(f"스냅샷 파일 형식 오류: {self.path}")
+        index = json.loads(self._mm[index_offset:index_offset + index_length])
+        if index.get("format") != FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 스냅샷 형식: {index.get('format')}")
+        self.version: int = index["version"]
+        self.created_at: float = index["created_at"]
+        self.counts: Dict[str, int] = index["counts"]
+        self._entries: Dict[str, List[int]] = index["entries"]
+
+    def blob(self, key: str) -> Optional[memoryview]:
+        """문서 JSON 바이트(mmap 구간, 복사 없음 → 워커 간 OS 페이지 캐시 공유)."""
+        ent = self._entries.get(key)
+        if ent is None:
+            return None
+        off, length = ent
+        return memoryview(self._mm)[off:off + length]
+
+    def doc(self, key: str) -> Any:
+        raw = self.blob(key)
+        return json.loads(bytes(raw)) if raw is not None else None
+
+    def iter_chunks(self, key: str, size: int = EXPORT_CHUNK) -> Iterator[bytes]:
+        """문서 바이트를 size 단위 조각으로(전송용 bytes, 한 번에 한 조각만 복사)."""
+        raw = self.blob(key)
+        for start in range(0, len(raw) if raw is not None else 0, size):
+            yield bytes(raw[start:start + size])
+
+    def iter_records(self, key: str) -> Iterator[Any]:
+        """NDJSON 문서(export/*)의 행을 한 줄씩 파싱."""
+        ent = self._entries.get(key)
+        if ent is None:
+            return
+        pos, end = ent[0], ent[0] + ent[1]
+        while pos < end:
+            nl = self._mm.find(b"\n", pos, end)
+            nl = end if nl < 0 else nl
+            yield json.loads(self._mm[pos:nl])
+            pos = nl + 1
+
+_current: Optional[Snapshot] = None
+
+def open_snapshot(path: Path) -> Snapshot:
+    """프로세스 전역 스냅샷 열기(앱 시작 시 1회). 파일이 교체되면 재시작해야 반영."""
+    global _current
+    _current = Snapshot(path)
+    return _current
+
+def current_snapshot() -> Snapshot:
+    if _current is None:
+        raise RuntimeError("스냅샷이 열려 있지 않음(SNAPSHOT_PATH)")
+    return _current
@@ -0,0 +1,229 @@
+# app/services/threat_index.py
+from __future__ import annotations
+
+import heapq
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import select, func
+from sqlalchemy.orm import Session
+
+from ..core.meta import DATA_VERSION_KEY, get_data_version
+from ..models import Threat, ThreatGroup
+
+# -----------------------------------------------------------------------------
+# 위협 역색인(Inverted Index)
+# - 정규화 토큰 → 위협 위치(posting list)
+# - 위협별 토큰 bag/그룹명은 빌드 시 1회만 계산
+# - 후보 조회 시 토큰을 공유하는 위협만 점수 계산(heap 기반 top-k)
+# -----------------------------------------------------------------------------
+
+# (score, reasons) = score_fn(req_tok, thr_tok)
+ScoreFn = Callable[[dict, dict], Tuple[float, List[str]]]
+TokenizeFn = Callable[[Threat, Optional[str]], dict]
+
+@dataclass(frozen=True)
+class ThreatHit:
+    id: int
+    title: str
+    group_name: Optional[str]
+    score: float
+    reasons: List[str]
+
+class ThreatIndex:
+    def __init__(self, entries: List[dict], signature: Tuple):
+        # entries: _tokenize_threat 결과(dict) 목록, Threat.id 오름차순
+        self.entries = entries
+        self.signature = signature
+        self.postings: Dict[str, List[int]] = {}
+        for pos, tok in enumerate(entries):
+            keys: Set[str] = set(tok["bag"]) | set(tok.get("map_codes") or ())
+            for k in keys:
+                self.postings.setdefault(k, []).append(pos)
+
+    @staticmethod
+    def fetch(db: Session) -> list:
+        """빌드 원본: (Threat, 그룹명) 행, Threat.id 오름차순."""
+        return (
+            db.query(Threat, ThreatGroup.name.label("group_name"))
+            .join(ThreatGroup, Threat.group_id == ThreatGroup.id, isouter=True)
+            .order_by(Threat.id)
+            .all()
+        )
+
+    @classmethod
+    def from_rows(cls, rows: list, tokenize: TokenizeFn, signature: Tuple) -> "ThreatIndex":
+        return cls([tokenize(t, gname) for t, gname in rows], signature)
+
+    @classmethod
+    def build(cls, db: Session, tokenize: TokenizeFn, signature: Optional[Tuple] = None) -> "ThreatIndex":
+        return cls.from_rows(cls.fetch(db), tokenize, signature if signature is not None else threat_signature(db))
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def candidates(self, tokens: Iterable[str]) -> Set[int]:
+        """토큰을 하나라도 공유하는 위협 위치 집합."""
+        out: Set[int] = set()
+        for t in tokens:
+            plist = self.postings.get(t)
+            if plist:
+                out.update(plist)
+        return out
+
+    def top_k(
+        self,
+        req_tok: dict,
+        score_fn: ScoreFn,
+        query_tokens: Iterable[str],
+        top_k: int = 8,
+        min_score: float = 2.0,
+    ) -> List[ThreatHit]:
+        """
+        query_tokens와 토큰을 공유하는 위협만 점수화하고 상위 top_k 반환.
+        - 동점이면 Threat.id 오름차순(기존 stable sort와 동일한 순서)
+        """
+        scored: List[Tuple[float, int, List[str]]] = []
+        for pos in self.candidates(query_tokens):
+            s, reasons = score_fn(req_tok, self.entries[pos])
+            if s >= min_score:
+                scored.append((s, pos, reasons))
+
+        best = heapq.nsmallest(top_k, scored, key=lambda x: (-x[0], x[1]))
+        out: List[ThreatHit] = []
+        for s, pos, reasons in best:
+            e = self.entries[pos]
+            out.append(ThreatHit(id=e["id"], title=e["title"], group_name=e["group_name"], score=float(s), reasons=reasons))
+        return out
+
+# -----------------------------------------------------------------------------
+# 위협 제목 → 그룹명 조회(정확 일치 / 부분 일치)
+# - (위협 제목, 그룹명) 쌍을 빌드 시 1회 로드, 정확 일치는 fold(제목) 해시 조회
+# - 제목별 결과는 조회 객체에 기억(테이블이 바뀌면 객체째 교체)
+# -----------------------------------------------------------------------------
+FoldFn = Callable[[str], str]
+
+class ThreatGroupLookup:
+    MEMO_MAX = 4096
+
+    def __init__(self, pairs: List[Tuple[str, str]], signature: Tuple, fold: FoldFn):
+        # pairs: (Threat.title, ThreatGroup.name) — 그룹이 있는 위협만
+        self.pairs = pairs
+        self.signature = signature
+        self.fold = fold
+        self.exact: Dict[str, Set[str]] = {}
+        for title, group in pairs:
+            if title is not None:
+                self.exact.setdefault(fold(title), set()).add(group)
+        self._memo: Dict[Optional[str], List[str]] = {}
+
+    @staticmethod
+    def fetch(db: Session) -> List[Tuple[str, str]]:
+        """빌드 원본: (위협 제목, 그룹명) 쌍."""
+        return [
+            (t, g)
+            for t, g in db.execute(
+                select(Threat.title, ThreatGroup.name).join(ThreatGroup, Threat.group_id == ThreatGroup.id)
+            ).all()
+        ]
+
+    @classmethod
+    def build(cls, db: Session, fold: FoldFn, signature: Optional[Tuple] = None) -> "ThreatGroupLookup":
+        return cls(cls.fetch(db), signature if signature is not None else threat_signature(db), fold)
+
+    def exact_groups(self, key: str) -> Set[str]:
+        """fold(Threat.title) == key 인 그룹명."""
+        return self.exact.get(key, set())
+
+    def substring_groups(self, match: Callable[[Optional[str]], bool]) -> Set[str]:
+        """match(Threat.title) 이 참인 그룹명(부분 일치 판정은 호출 측)."""
+        return {g for t, g in self.pairs if match(t)}
+
+    def memo(self, title: Optional[str], compute: Callable[[], List[str]]) -> List[str]:
+        hit = self._memo.get(title)
+        if hit is None:
+            hit = compute()
+            if len(self._memo) >= self.MEMO_MAX:
+                self._memo.clear()
+            self._memo[title] = hit
+        return hit
+
+# -----------------------------------------------------------------------------
+# 프로세스 캐시: 위협 테이블이 바뀌면(시그니처 변경) 재빌드
+# -----------------------------------------------------------------------------
+_lock = threading.Lock()
+_cached: Optional[ThreatIndex] = None
+_cached_groups: Optional[ThreatGroupLookup] = None
+
+def threat_signature(db: Session) -> Tuple:
+    """
+    위협/그룹 테이블 변경 감지용 시그니처: 데이터 세대 번호(요청 세션에 기억된 값 우선).
+    세대가 기록되지 않은 DB는 위협/그룹 건수 + 최대 id
+    (SQLite는 AUTOINCREMENT 없이 rowid를 재사용 → 삭제 후 다른 위협을 추가하면 같아질 수 있어 대체 수단으로만 사용).
+    """
+    version = db.info[DATA_VERSION_KEY] if DATA_VERSION_KEY in db.info else get_data_version(db)
+    if version is not None:
+        return ("v", version)
+    row = db.execute(
+        select(
+            select(func.count(Threat.id)).scalar_subquery(),
+            select(func.max(Threat.id)).scalar_subquery(),
+            select(func.count(ThreatGroup.id)).scalar_subquery(),
+            select(func.max(ThreatGroup.id)).scalar_subquery(),
+        )
+    ).one()
+    return ("n",) + tuple(row)
+
+def prefetch_threat_index(
+    db: Session, tokenize: TokenizeFn, signature: Optional[Tuple] = None
+) -> Callable[[], ThreatIndex]:
+    """
+    get_threat_index의 조회(SQL)/빌드(CPU) 분리 버전.
+    - 캐시가 유효하면 그 색인을, 아니면 원본 행만 읽어 두고 반환 함수 호출 시 빌드(스레드풀에서 호출 가능)
+    """
+    sig = signature if signature is not None else threat_signature(db)
+    idx = _cached
+    if idx is not None and idx.signature == sig:
+        return lambda: idx
+    rows = ThreatIndex.fetch(db)
+
+    def build() -> ThreatIndex:
+        global _cached
+        with _lock:
+            if _cached is None or _cached.signature != sig:
+                _cached = ThreatIndex.from_rows(rows, tokenize, sig)
+            return _cached
+
+    return build
+
+def get_threat_index(db: Session, tokenize: TokenizeFn, signature: Optional[Tuple] = None) -> ThreatIndex:
+    return prefetch_threat_index(db, tokenize, signature)()
+
+def prefetch_threat_group_lookup(
+    db: Session, fold: FoldFn, signature: Optional[Tuple] = None
+) -> Callable[[], ThreatGroupLookup]:
+    """get_threat_group_lookup의 조회(SQL)/빌드(CPU) 분리 버전(prefetch_threat_index와 동일)."""
+    sig = signature if signature is not None else threat_signature(db)
+    lookup = _cached_groups
+    if lookup is not None and lookup.signature == sig:
+        return lambda: lookup
+    pairs = ThreatGroupLookup.fetch(db)
+
+    def build() -> ThreatGroupLookup:
+        global _cached_groups
+        with _lock:
+            if _cached_groups is None or _cached_groups.signature != sig:
+                _cached_groups = ThreatGroupLookup(pairs, sig, fold)
+            return _cached_groups
+
+    return build
+
+def get_threat_group_lookup(db: Session, fold: FoldFn, signature: Optional[Tuple] = None) -> ThreatGroupLookup:
+    return prefetch_threat_group_lookup(db, fold, signature)()
+
+def invalidate_threat_index() -> None:
+    global _cached, _cached_groups
+    with _lock:
+        _cached = None
+        _cached_groups = None
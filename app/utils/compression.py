@@ -0,0 +1,73 @@
+# app/utils/compression.py
+from __future__ import annotations
+
+import gzip
+import os
+from typing import Callable, Dict, Optional
+
+# 선택 의존성: 설치돼 있을 때만 해당 인코딩을 협상 대상에 포함
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# -----------------------------------------------------------------------------
+# 응답 본문 압축(Accept-Encoding 협상)
+# - 압축 결과는 캐시 항목(CachedPayload)에 인코딩별로 보관 → 데이터 세대당 1회만 압축
+#   그래서 실시간 압축보다 높은 레벨을 사용
+# - 같은 q 값이면 서버 선호 순서(zstd > br > gzip)
+# -----------------------------------------------------------------------------
+COMPRESS_MIN_BYTES = int(os.getenv("COMPRESS_MIN_BYTES", "1024"))  # 이보다 작으면 압축 안 함
+
+def _gzip(body: bytes) -> bytes:
+    # mtime=0 → 같은 본문이면 항상 같은 바이트
+    return gzip.compress(body, compresslevel=9, mtime=0)
+
+ENCODERS: Dict[str, Callable[[bytes], bytes]] = {}
+if zstandard is not None:
+    ENCODERS["zstd"] = zstandard.ZstdCompressor(level=10).compress
+if brotli is not None:
+    ENCODERS["br"] = lambda body: brotli.compress(body, quality=9)
+ENCODERS["gzip"] = _gzip
+
+def _parse_accept_encoding(header: str) -> Dict[str, float]:
+    """'gzip;q=0.8, br, *;q=0' → {'gzip': 0.8, 'br': 1.0, '*': 0.0}"""
+    prefs: Dict[str, float] = {}
+    for part in header.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        prefs[token] = q
+    return prefs
+
+def negotiate_encoding(accept_encoding: Optional[str], size: int) -> Optional[str]:
+    """
+    Accept-Encoding에서 사용할 압축 인코딩 선택. 압축하지 않으면 None(identity).
+    - 목록에 없는 인코딩은 '*'의 q 값을 따름
+    """
+    if not accept_encoding or size < COMPRESS_MIN_BYTES:
+        return None
+    prefs = _parse_accept_encoding(accept_encoding)
+    wildcard = prefs.get("*", 0.0)
+    best, best_q = None, 0.0
+    for name in ENCODERS:  # 서버 선호 순서
+        q = prefs.get(name, wildcard)
+        if q > best_q:
+            best, best_q = name, q
+    return best
+
+def compress(body: bytes, encoding: str) -> bytes:
+    return ENCODERS[encoding](body)
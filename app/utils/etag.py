@@ -1,6 +1,22 @@
 # app/utils/etag.py
 import hashlib, json
-from fastapi import Request, Response
+from typing import TYPE_CHECKING, Optional
+
+from fastapi import Depends, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.db import get_async_db
+from ..core.meta import get_data_version_async
+from .compression import negotiate_encoding
+from .server_timing import timed
+
+if TYPE_CHECKING:
+    from .response_cache import CachedPayload
+
+CACHE_CONTROL = "private, must-revalidate"
+# 본문이 Accept-Encoding에 따라 달라짐 → 304 포함 모든 응답에 명시(공유 캐시가 인코딩별로 보관)
+VARY = "Accept-Encoding"
 
 def compute_obj_etag(obj) -> str:
     """
@@ -19,15 +35,90 @@ def compute_obj_etag(obj) -> str:
     h = hashlib.sha1(payload).hexdigest()
     return f'W/"{h}:{len(payload)}"'
 
-def etag_response(request: Request, response: Response, data):
+def compute_bytes_etag(body: bytes) -> str:
+    """직렬화된 응답 본문 바이트로 약한 ETag 생성(compute_obj_etag와 같은 형식)."""
+    return f'W/"{hashlib.sha1(body).hexdigest()}:{len(body)}"'
+
+def compute_version_etag(version: int, request: Request) -> str:
+    """
+    데이터 세대 번호 + 요청(경로/쿼리)으로 약한 ETag 생성.
+    응답 본문을 만들지 않고도 계산 가능 → 핸들러 실행 전 304 판정에 사용.
+    """
+    query = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+    key = f"{version}|{request.url.path}?{query}".encode("utf-8")
+    return f'W/"v{version}-{hashlib.sha1(key).hexdigest()[:20]}"'
+
+def _inm_matches(header: Optional[str], etag: str, allow_star: bool = True) -> bool:
+    """
+    If-None-Match 판정.
+    - allow_star=False: 구체 태그만 비교(리소스 존재 여부를 모르는 핸들러 실행 전 판정용 —
+      `*`는 핸들러가 리소스를 확인한 뒤 etag_bytes_response에서 판정)
+    """
+    if not header:
+        return False
+    tags = [t.strip() for t in header.split(",")]
+    return (allow_star and "*" in tags) or etag in tags
+
+async def etag_precondition(request: Request, db: AsyncSession = Depends(get_async_db)) -> Optional[str]:
+    """
+    라우트 의존성: 저장된 데이터 세대로 ETag를 만들고 If-None-Match가 같으면 즉시 304.
+    - 세대 번호 조회(app_meta 1건) 외에는 DB 작업 없음
+    - 세대가 기록되지 않은 DB면 None → etag_response가 본문 해시로 판정
+    """
+    return version_precondition(request, await get_data_version_async(db))
+
+def version_precondition(request: Request, version: Optional[int]) -> Optional[str]:
+    """etag_precondition의 본체: 주어진 세대 번호(DB/스냅샷)로 ETag 계산 + If-None-Match면 304."""
+    if version is None:
+        return None
+    with timed("etag"):
+        etag = compute_version_etag(version, request)
+    if _inm_matches(request.headers.get("If-None-Match"), etag, allow_star=False):
+        raise HTTPException(
+            status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL, "Vary": VARY}
+        )
+    return etag
+
+def etag_response(request: Request, response: Response, data, etag: str | None = None):
     """
     If-None-Match와 비교해 동일하면 304, 아니면 ETag 부여 후 data 반환.
+    - etag: 미리 계산된 값(세대 ETag/캐시)이 있으면 재계산 생략
     """
-    etag = compute_obj_etag(data)
-    inm = (request.headers.get("If-None-Match") or "").strip()
-    if etag and inm == etag:
-        response.headers["ETag"] = etag
-        return Response(status_code=304)
+    etag = etag or compute_obj_etag(data)
+    if etag and _inm_matches(request.headers.get("If-None-Match"), etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
     response.headers["ETag"] = etag
-    response.headers["Cache-Control"] = "private, must-revalidate"
+    response.headers["Cache-Control"] = CACHE_CONTROL
     return data
+
+def etag_bytes_response(request: Request, response: Response, payload: "CachedPayload", etag: str) -> Response:
+    """
+    etag_response의 직렬화 완료 버전: If-None-Match가 같으면 304, 아니면 본문 바이트를 그대로 반환.
+    - response_model 검증/재직렬화를 거치지 않음(스키마 문서화는 라우트의 response_model 유지)
+    - Accept-Encoding 협상 → 캐시 항목에 보관된 압축 본문 사용(Content-Encoding + Vary)
+    - ETag는 인코딩과 무관(약한 ETag = 의미상 동일한 표현) → 세대 ETag 기반 304 판정 그대로
+    - 라우트에서 response.headers에 넣은 헤더(X-Handler 등)는 그대로 옮김
+    """
+    headers = {k: v for k, v in response.headers.items() if k != "content-length"}
+    headers["ETag"] = etag
+    headers["Cache-Control"] = CACHE_CONTROL
+    headers["Vary"] = VARY
+    if _inm_matches(request.headers.get("If-None-Match"), etag):
+        return Response(status_code=304, headers=headers)
+    body = payload.body
+    encoding = negotiate_encoding(request.headers.get("Accept-Encoding"), len(body))
+    if encoding is not None:
+        body = payload.encoded(encoding)
+        headers["Content-Encoding"] = encoding
+    # 스냅샷 본문(mmap memoryview)은 전송 시에만 bytes로 복사(ASGI body는 bytes)
+    return Response(content=bytes(body), media_type="application/json", headers=headers)
+
+async def etag_bytes_response_async(request: Request, response: Response, payload: "CachedPayload", etag: str) -> Response:
+    """
+    async 라우트용 etag_bytes_response: 아직 직렬화/압축되지 않은 항목이면 스레드풀에서 준비한 뒤 응답.
+    (캐시에 준비된 본문이 있거나 304면 이벤트 루프에서 바로 응답)
+    """
+    accept = request.headers.get("Accept-Encoding")
+    if not _inm_matches(request.headers.get("If-None-Match"), etag) and not payload.is_prepared(accept):
+        await run_in_threadpool(payload.prepare, accept)
+    return etag_bytes_response(request, response, payload, etag)
@@ -0,0 +1,53 @@
+# app/utils/export.py
+import csv, io, json
+from typing import Iterable, Iterator, List, Optional
+
+# 내보내기 CSV 컬럼(목록 API 필드 순서 유지, 리스트는 ';' 결합)
+CSV_COLUMNS = [
+    "id", "item_code", "title", "mapping_status", "regulation", "auditable",
+    "audit_method", "recommended_fix", "applicable_compliance",
+    "mapping_codes", "mapping_services", "fixed_threats", "suggested_threats",
+]
+
+def _join(vals: Optional[List[str]]) -> str:
+    return ";".join(v for v in (vals or []) if v)
+
+def _threat_titles(threats: Optional[List[dict]]) -> str:
+    return ";".join(t["title"] for t in (threats or []) if t.get("title"))
+
+def ndjson_lines(rows: Iterable[dict]) -> Iterator[bytes]:
+    """행마다 JSON 한 줄."""
+    for row in rows:
+        yield (json.dumps(row, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+def csv_lines(rows: Iterable[dict]) -> Iterator[bytes]:
+    """헤더 + 행 단위 CSV(UTF-8 BOM: 엑셀 한글 호환). 위협은 제목만 ';' 결합."""
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+
+    def take() -> bytes:
+        out = buf.getvalue().encode("utf-8")
+        buf.seek(0)
+        buf.truncate(0)
+        return out
+
+    buf.write("﻿")
+    writer.writerow(CSV_COLUMNS)
+    yield take()
+    for row in rows:
+        writer.writerow([
+            row.get("id"),
+            row.get("item_code") or "",
+            row.get("title") or "",
+            row.get("mapping_status") or "",
+            row.get("regulation") or "",
+            row.get("auditable") or "",
+            row.get("audit_method") or "",
+            row.get("recommended_fix") or "",
+            row.get("applicable_compliance") or "",
+            _join(row.get("mapping_codes")),
+            _join(row.get("mapping_services")),
+            _threat_titles(row.get("fixed_threats")),
+            _threat_titles(row.get("suggested_threats")),
+        ])
+        yield take()
@@ -0,0 +1,20 @@
+# app/utils/fastjson.py
+from __future__ import annotations
+
+import json
+from typing import Any
+
+# 선택 의존성: orjson이 있으면 사용(수 배 빠름), 없으면 표준 json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def dumps(obj: Any) -> bytes:
+    """
+    응답 본문용 JSON 바이트(UTF-8, compact).
+    FastAPI 기본 JSONResponse와 같은 형식: ensure_ascii=False, 구분자 공백 없음.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
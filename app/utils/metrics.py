@@ -0,0 +1,277 @@
+# app/utils/metrics.py
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event
+
+from ..core.db import async_engine, engine, read_engine
+from .response_cache import response_cache
+
+# -----------------------------------------------------------------------------
+# Prometheus 텍스트 형식 메트릭(외부 의존성 없음)
+# - 요청 수/지연 히스토그램: X-Handler 헤더(없으면 라우트 경로 템플릿) + 상태 코드(200/304/...) 라벨
+# - 응답 캐시 적중/미스, DB 커넥션 풀 사용량, 로더 마지막 실행(app_meta)
+# - 여러 uvicorn 워커: METRICS_DIR 지정 시 워커마다 스냅샷 파일(metrics-<pid>.json)을 주기적으로 기록하고
+#   /metrics가 모든 파일을 합산(카운터/히스토그램은 합, 게이지는 살아 있는 워커만 pid 라벨로)
+#   배포(재시작)마다 빈 디렉터리를 지정 — 이전 실행 파일이 남으면 카운터에 합산됨
+# -----------------------------------------------------------------------------
+BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+METRICS_DIR = os.getenv("METRICS_DIR")
+METRICS_FLUSH_SECONDS = float(os.getenv("METRICS_FLUSH_SECONDS", "5"))
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# 풀 사용량 대상 엔진(이름 → Engine)
+ENGINES = {"writer": engine, "read": read_engine, "async_read": async_engine.sync_engine}
+
+# 사용 중 커넥션 수: 풀 이벤트로 직접 집계(NullPool 등 size()/checkedout()이 없는 풀 포함)
+# 이벤트는 요청 스레드/스레드풀/이벤트 루프에서 동시에 발생 → `+=`(읽기-쓰기)는 락으로 보호
+_checked_out: Dict[str, int] = {name: 0 for name in ENGINES}
+_pool_lock = threading.Lock()
+
+def _track_pool(name: str, e) -> None:
+    def on_checkout(*_args):
+        with _pool_lock:
+            _checked_out[name] += 1
+
+    def on_checkin(*_args):
+        with _pool_lock:
+            _checked_out[name] -= 1
+
+    event.listen(e, "checkout", on_checkout)
+    event.listen(e, "checkin", on_checkin)
+
+for _name, _engine in ENGINES.items():
+    _track_pool(_name, _engine)
+
+class _Registry:
+    """워커(프로세스) 단위 집계. 요청 경로에서는 observe()만 호출(락 + dict 갱신)."""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests: Dict[Tuple[str, str], int] = {}          # (handler, status) → 건수
+        self.buckets: Dict[str, List[int]] = {}                  # handler → 버킷별 건수(+Inf 포함, 비누적)
+        self.sums: Dict[str, float] = {}                         # handler → 지연 합(초)
+        self._flushed = 0.0
+
+    def observe(self, handler: str, status: int, seconds: float) -> None:
+        with self._lock:
+            key = (handler, str(status))
+            self.requests[key] = self.requests.get(key, 0) + 1
+            counts = self.buckets.get(handler)
+            if counts is None:
+                counts = self.buckets[handler] = [0] * (len(BUCKETS) + 1)
+            counts[bisect_left(BUCKETS, seconds)] += 1
+            self.sums[handler] = self.sums.get(handler, 0.0) + seconds
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "pid": os.getpid(),
+                "requests": [[h, s, n] for (h, s), n in self.requests.items()],
+                "buckets": {h: list(c) for h, c in self.buckets.items()},
+                "sums": dict(self.sums),
+                "cache": response_cache.stats(),
+                "pools": {name: pool_stats(name, e.pool) for name, e in ENGINES.items()},
+            }
+
+    # ---------- 다중 워커: 스냅샷 파일 ----------
+    def maybe_flush(self) -> None:
+        """METRICS_DIR이 있으면 METRICS_FLUSH_SECONDS마다 스냅샷 기록(요청 완료 시 호출)."""
+        if not METRICS_DIR:
+            return
+        now = time.monotonic()
+        if now - self._flushed < METRICS_FLUSH_SECONDS:
+            return
+        self._flushed = now
+        self.flush()
+
+    def flush(self) -> Dict[str, Any]:
+        snap = self.snapshot()
+        if METRICS_DIR:
+            d = Path(METRICS_DIR)
+            d.mkdir(parents=True, exist_ok=True)
+            tmp = d / f".metrics-{snap['pid']}.json.tmp"
+            tmp.write_text(json.dumps(snap), encoding="utf-8")
+            os.replace(tmp, d / f"metrics-{snap['pid']}.json")    # 원자적 교체(읽는 쪽이 반쯤 쓴 파일을 보지 않음)
+        return snap
+
+registry = _Registry()
+
+def pool_stats(name: str, pool) -> Dict[str, int]:
+    """checkedout은 모든 풀, size/overflow/checkedin은 QueuePool 계열만."""
+    with _pool_lock:
+        out: Dict[str, int] = {"checkedout": _checked_out.get(name, 0)}
+    for stat in ("size", "overflow", "checkedin"):
+        fn = getattr(pool, stat, None)
+        if callable(fn):
+            try:
+                out[stat] = max(0, int(fn()))    # overflow()는 풀 여유가 있으면 음수
+            except Exception:
+                pass
+    return out
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def collect_snapshots() -> List[Dict[str, Any]]:
+    """이 워커의 현재 스냅샷 + (METRICS_DIR) 다른 워커의 최근 스냅샷."""
+    own = registry.flush()
+    snaps = [own]
+    if METRICS_DIR and Path(METRICS_DIR).is_dir():
+        for path in Path(METRICS_DIR).glob("metrics-*.json"):
+            try:
+                snap = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue
+            if snap.get("pid") != own["pid"]:
+                snaps.append(snap)
+    return snaps
+
+# -----------------------------------------------------------------------------
+# 텍스트 출력
+# -----------------------------------------------------------------------------
+def _esc(v: Any) -> str:
+    return str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _labels(**kw) -> str:
+    if not kw:
+        return ""
+    return "{" + ",".join(f'{k}="{_esc(v)}"' for k, v in kw.items()) + "}"
+
+def _fmt(v: float) -> str:
+    return repr(float(v)) if isinstance(v, float) else str(v)
+
+class _Writer:
+    def __init__(self):
+        self.lines: List[str] = []
+
+    def family(self, name: str, kind: str, help_text: str, samples: Iterable[Tuple[str, Dict[str, Any], float]]) -> None:
+        samples = list(samples)
+        if not samples:
+            return
+        self.lines.append(f"# HELP {name} {help_text}")
+        self.lines.append(f"# TYPE {name} {kind}")
+        for suffix, labels, value in samples:
+            self.lines.append(f"{name}{suffix}{_labels(**labels)} {_fmt(value)}")
+
+    def text(self) -> str:
+        return "\n".join(self.lines) + "\n"
+
+def render(snaps: List[Dict[str, Any]], loader: Optional[Dict[str, Any]] = None) -> str:
+    requests: Dict[Tuple[str, str], int] = {}
+    buckets: Dict[str, List[int]] = {}
+    sums: Dict[str, float] = {}
+    cache = {"hits": 0, "misses": 0, "evictions": 0}
+    for s in snaps:
+        for h, st, n in s.get("requests", []):
+            requests[(h, st)] = requests.get((h, st), 0) + n
+        for h, counts in s.get("buckets", {}).items():
+            acc = buckets.setdefault(h, [0] * (len(BUCKETS) + 1))
+            for i, n in enumerate(counts[: len(acc)]):
+                acc[i] += n
+        for h, v in s.get("sums", {}).items():
+            sums[h] = sums.get(h, 0.0) + v
+        for k in cache:
+            cache[k] += s.get("cache", {}).get(k, 0)
+    # 게이지는 살아 있는 워커만(종료된 워커의 마지막 값은 의미 없음)
+    live = [s for s in snaps if _pid_alive(int(s.get("pid", 0)))]
+
+    w = _Writer()
+    w.family("compliance_http_requests_total", "counter", "HTTP 요청 수(handler=X-Handler 또는 라우트 경로, status=응답 코드)",
+             (("", {"handler": h, "status": st}, n) for (h, st), n in sorted(requests.items())))
+
+    hist: List[Tuple[str, Dict[str, Any], float]] = []
+    for h in sorted(buckets):
+        cum = 0
+        for le, n in zip((*map(_fmt, BUCKETS), "+Inf"), buckets[h]):
+            cum += n
+            hist.append(("_bucket", {"handler": h, "le": le}, cum))
+        hist.append(("_sum", {"handler": h}, sums.get(h, 0.0)))
+        hist.append(("_count", {"handler": h}, cum))
+    w.family("compliance_http_request_duration_seconds", "histogram", "요청 처리 시간(응답 본문 전송 완료까지)", hist)
+
+    w.family("compliance_response_cache_hits_total", "counter", "응답 캐시 적중", [("", {}, cache["hits"])])
+    w.family("compliance_response_cache_misses_total", "counter", "응답 캐시 미스", [("", {}, cache["misses"])])
+    w.family("compliance_response_cache_evictions_total", "counter", "응답 캐시 LRU 제거", [("", {}, cache["evictions"])])
+    w.family("compliance_response_cache_entries", "gauge", "응답 캐시 항목 수(워커별)",
+             (("", {"pid": s["pid"]}, s.get("cache", {}).get("size", 0)) for s in live))
+
+    for stat, help_text in (
+        ("size", "커넥션 풀 크기"), ("checkedout", "사용 중 커넥션 수"),
+        ("overflow", "풀 초과(overflow) 커넥션 수"), ("checkedin", "유휴 커넥션 수"),
+    ):
+        w.family(f"compliance_db_pool_{stat}", "gauge", f"{help_text}(엔진/워커별)", (
+            ("", {"engine": name, "pid": s["pid"]}, stats[stat])
+            for s in live for name, stats in sorted(s.get("pools", {}).items()) if stat in stats
+        ))
+
+    if loader:
+        w.family("compliance_loader_runs_total", "counter", "scripts.load_csv 실행 완료 횟수", [("", {}, loader.get("runs", 0))])
+        w.family("compliance_loader_last_run_timestamp_seconds", "gauge", "마지막 로더 실행 완료 시각(Unix)",
+                 [("", {}, loader.get("finished_at", 0))])
+        w.family("compliance_loader_last_duration_seconds", "gauge", "마지막 로더 실행 시간", [("", {}, loader.get("seconds", 0.0))])
+        w.family("compliance_loader_last_rows", "gauge", "마지막 로더 실행 처리 행 수(kind/change별)", (
+            ("", {"kind": kind, "change": change}, n)
+            for kind, counts in sorted(loader.get("rows", {}).items()) for change, n in sorted(counts.items())
+        ))
+        w.family("compliance_loader_last_rows_per_second", "gauge", "마지막 로더 실행 처리 속도(행/초)",
+                 [("", {}, loader.get("rows_per_second", 0.0))])
+    return w.text()
+
+# -----------------------------------------------------------------------------
+# ASGI 미들웨어: 요청 수/지연 기록
+# - handler 라벨: 응답의 X-Handler → 라우트 함수의 x_handler(핸들러 실행 전 304/404도 같은 이름)
+#   → 라우트 경로 템플릿 → "unmatched"
+# -----------------------------------------------------------------------------
+def x_handler(name: str):
+    """라우트 함수에 메트릭 handler 이름 부여(라우트가 설정하는 X-Handler 값과 동일하게)."""
+    def deco(fn):
+        fn.x_handler = name
+        return fn
+    return deco
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        seen: Dict[str, Any] = {"status": 500, "handler": None}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                seen["status"] = message["status"]
+                for k, v in message.get("headers", []):
+                    if k.lower() == b"x-handler":
+                        seen["handler"] = v.decode("latin-1")
+                        break
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            handler = (
+                seen["handler"]
+                or getattr(scope.get("endpoint"), "x_handler", None)
+                or getattr(route, "path", None)
+                or "unmatched"
+            )
+            registry.observe(handler, seen["status"], time.perf_counter() - started)
+            registry.maybe_flush()
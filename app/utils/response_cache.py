@@ -0,0 +1,211 @@
+# app/utils/response_cache.py
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple, Union
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from ..core.meta import get_data_version, get_data_version_async
+from .compression import compress, negotiate_encoding
+from .etag import compute_bytes_etag
+from .fastjson import dumps
+from .server_timing import timed
+
+@dataclass(frozen=True)
+class CachedPayload:
+    data: Any                   # JSON 직렬화 가능한 응답 본문(list/dict)
+    _encoded: Dict[str, bytes] = field(default_factory=dict, repr=False, compare=False)
+    # 본문이 요청 세대의 데이터임이 확인됨(False: 조회 도중 로더 커밋 → 세대 ETag 대신 본문 해시)
+    versioned: bool = field(default=True, compare=False)
+
+    @classmethod
+    def from_body(cls, body: Union[bytes, memoryview]) -> "CachedPayload":
+        """이미 직렬화된 본문(스냅샷 mmap 구간)으로 생성. data 없음 → 본문을 그대로 응답하는 경로 전용."""
+        payload = cls(data=None)
+        payload.__dict__["body"] = body
+        return payload
+
+    @cached_property
+    def body(self) -> bytes:
+        """data의 JSON 바이트. 처음 응답할 때 1회 인코딩해 캐시 항목에 함께 보관."""
+        with timed("serialize"):
+            return dumps(self.data)
+
+    @cached_property
+    def etag(self) -> str:
+        """본문 바이트 해시 ETag(세대 번호가 없을 때만 사용)."""
+        body = self.body
+        with timed("etag"):
+            return compute_bytes_etag(body)
+
+    def response_etag(self, version_etag: Optional[str]) -> str:
+        """응답 ETag: 세대 ETag(있고 본문이 그 세대 데이터일 때), 아니면 본문 해시."""
+        return version_etag if version_etag and self.versioned else self.etag
+
+    def encoded(self, encoding: str) -> bytes:
+        """인코딩(gzip/br/zstd)별 압축 본문. 캐시 항목과 함께 보관되어 같은 세대 동안 재압축하지 않음."""
+        out = self._encoded.get(encoding)
+        if out is None:
+            body = self.body
+            with timed("compress"):
+                out = self._encoded.setdefault(encoding, compress(body, encoding))
+        return out
+
+    def prepare(self, accept_encoding: Optional[str]) -> Optional[str]:
+        """본문 직렬화 + 협상된 인코딩 압축을 미리 수행(스레드풀에서 호출). 반환: 협상된 인코딩."""
+        encoding = negotiate_encoding(accept_encoding, len(self.body))
+        if encoding is not None:
+            self.encoded(encoding)
+        return encoding
+
+    def is_prepared(self, accept_encoding: Optional[str]) -> bool:
+        """직렬화/압축 없이 바로 응답 가능한지(이벤트 루프에서 CPU 작업을 할 필요가 없는지)."""
+        if "body" not in self.__dict__:
+            return False
+        encoding = negotiate_encoding(accept_encoding, len(self.body))
+        return encoding is None or encoding in self._encoded
+
+class ResponseCache:
+    """
+    (라우트, 경로 파라미터, 데이터 세대) 키의 LRU 응답 캐시.
+    - 세대 번호가 바뀌면(로더 커밋) 전체 비움
+    - 크기 상한 초과 시 가장 오래 안 쓴 항목부터 제거
+    """
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Tuple, CachedPayload]" = OrderedDict()
+        self._generation: Optional[int] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _sync_generation(self, generation: int) -> bool:
+        """새 세대면 비우고 전환. 이미 지난 세대면 False(세대 번호는 단조 증가)."""
+        if self._generation is not None and generation < self._generation:
+            return False
+        if generation != self._generation:
+            self._data.clear()
+            self._generation = generation
+        return True
+
+    def get(self, key: Tuple, generation: int) -> Optional[CachedPayload]:
+        with self._lock:
+            if not self._sync_generation(generation):
+                self.misses += 1
+                return None
+            hit = self._data.get(key)
+            if hit is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return hit
+
+    def put(self, key: Tuple, generation: int, value: CachedPayload) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            if not self._sync_generation(generation):
+                return
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._generation = None
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+response_cache = ResponseCache(maxsize=int(os.getenv("RESPONSE_CACHE_SIZE", "256")))
+
+def cached_payload(db: Session, key: Tuple[Hashable, ...], build: Callable[[], Any]) -> CachedPayload:
+    """
+    캐시에 있으면 그대로, 없으면 build()로 만들어 저장.
+    데이터 세대가 기록되지 않은 DB(구 로더로 적재)는 무효화 기준이 없으므로 캐시하지 않는다.
+    """
+    generation = get_data_version(db)
+    if generation is None:
+        return CachedPayload(data=build())
+    return cached_payload_at(generation, key, build)
+
+def cached_payload_at(generation: int, key: Tuple[Hashable, ...], build: Callable[[], Any]) -> CachedPayload:
+    """세대 번호를 이미 아는 경우(스냅샷 등)의 cached_payload."""
+    hit = response_cache.get(key, generation)
+    if hit is not None:
+        return hit
+    # 세대 번호가 있으면 ETag는 etag_precondition(세대 기반)이 담당
+    value = CachedPayload(data=build())
+    response_cache.put(key, generation, value)
+    return value
+
+# 캐시 미스에서 만든 본문은 조회 후 세대 번호를 다시 읽어 요청 세대와 같을 때만 캐시/세대 ETag 사용
+# - 세대 번호는 로더가 데이터와 같은 트랜잭션에서 갱신하고 단조 증가 → 같으면 조회 도중 커밋 없음
+# - 다르면 본문이 어느 세대 데이터인지 알 수 없음: 캐시하지 않고 본문 해시 ETag로 응답(versioned=False)
+async def cached_payload_async(
+    db: AsyncSession, key: Tuple[Hashable, ...], build: Callable[[], Awaitable[Any]]
+) -> CachedPayload:
+    """cached_payload의 비동기 버전(build는 코루틴 함수)."""
+    generation = await get_data_version_async(db)
+    if generation is None:
+        return CachedPayload(data=await build())
+
+    hit = response_cache.get(key, generation)
+    if hit is not None:
+        return hit
+    data = await build()
+    versioned = await db.run_sync(get_data_version) == generation
+    value = CachedPayload(data=data, versioned=versioned)
+    if versioned:
+        response_cache.put(key, generation, value)
+    return value
+
+async def cached_payload_threaded(
+    db: AsyncSession, key: Tuple[Hashable, ...], prefetch: Callable[[Session], Callable[[], Any]]
+) -> CachedPayload:
+    """
+    보강(CPU) 중심 조회용 cached_payload_async.
+    - 세대 확인/캐시 적중/SQL은 이벤트 루프에서 비동기 세션으로(DB 대기 중 스레드 미점유)
+      prefetch(session): SQL만 실행하고 조립 함수 반환(compliance_service.prefetch_*)
+    - 캐시 미스면 조립(보강/모델 변환) + JSON 직렬화만 스레드풀에서 → 이벤트 루프를 막지 않음
+    """
+    generation = await get_data_version_async(db)
+    if generation is not None:
+        hit = response_cache.get(key, generation)
+        if hit is not None:
+            return hit
+    assemble, current = await db.run_sync(_prefetch_in_session, prefetch)
+    versioned = current == generation
+    value = await run_in_threadpool(_assemble_in_thread, assemble, versioned)
+    if generation is not None and versioned:
+        response_cache.put(key, generation, value)
+    return value
+
+def _prefetch_in_session(s: Session, prefetch: Callable[[Session], Callable[[], Any]]) -> Tuple[Callable[[], Any], Optional[int]]:
+    """prefetch(SQL) 실행 후 같은 세션에서 세대 번호 재조회."""
+    assemble = prefetch(s)
+    return assemble, get_data_version(s)
+
+def _assemble_in_thread(assemble: Callable[[], Any], versioned: bool) -> CachedPayload:
+    value = CachedPayload(data=assemble(), versioned=versioned)
+    value.body  # 직렬화도 스레드에서
+    return value
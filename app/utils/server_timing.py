@@ -0,0 +1,105 @@
+# app/utils/server_timing.py
+from __future__ import annotations
+
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional
+
+from sqlalchemy import event
+
+# -----------------------------------------------------------------------------
+# 요청별 처리 시간 분해 → Server-Timing 헤더(브라우저 개발자 도구 Timing 탭에 표시)
+# - db:        SQL 실행 시간(SQLAlchemy 커서 이벤트) + 실행 문 수(X-SQL-Count)
+# - enrich:    위협 점수화/그룹 조회/applicable_hits (그 안의 DB 시간은 db로만 집계)
+# - serialize: JSON 인코딩, compress: 응답 압축, etag: ETag 해시
+# - SERVER_TIMING=0 이면 비활성
+# -----------------------------------------------------------------------------
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING", "1") != "0"
+
+class RequestTiming:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: Dict[str, float] = {}   # 단계명 → 누적 초
+        self.db = 0.0
+        self.sql_count = 0
+        self._active: Dict[str, int] = {}    # 단계 중첩 깊이(바깥 구간만 집계)
+
+    def header(self) -> str:
+        total = time.perf_counter() - self.started
+        parts = [f'db;dur={self.db * 1000:.1f};desc="{self.sql_count} queries"']
+        parts += [f"{name};dur={sec * 1000:.1f}" for name, sec in self.phases.items()]
+        parts.append(f"total;dur={total * 1000:.1f}")
+        return ", ".join(parts)
+
+_current: ContextVar[Optional[RequestTiming]] = ContextVar("server_timing", default=None)
+
+@contextmanager
+def timed(phase: str) -> Iterator[None]:
+    """
+    현재 요청의 phase 구간 시간 누적(요청 밖/비활성이면 아무 것도 안 함).
+    - 같은 phase가 중첩되면 바깥 구간만 집계
+    - 구간 안에서 실행된 SQL 시간은 제외(db에 따로 집계)
+    """
+    timing = _current.get()
+    if timing is None or timing._active.get(phase):
+        yield
+        return
+    timing._active[phase] = 1
+    db0, t0 = timing.db, time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - t0 - (timing.db - db0)
+        timing.phases[phase] = timing.phases.get(phase, 0.0) + elapsed
+        timing._active[phase] = 0
+
+# -----------------------------------------------------------------------------
+# SQL 실행 시간/횟수(엔진 커서 이벤트)
+# - AsyncSession.run_sync 안의 실행도 같은 컨텍스트(greenlet이 요청 컨텍스트를 이어받음)
+# -----------------------------------------------------------------------------
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("server_timing_start", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    timing = _current.get()
+    starts = conn.info.get("server_timing_start")
+    if timing is None or not starts:
+        return
+    timing.db += time.perf_counter() - starts.pop()
+    timing.sql_count += 1
+
+def instrument_engine(sync_engine) -> None:
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+# -----------------------------------------------------------------------------
+# ASGI 미들웨어: 요청마다 RequestTiming을 열고, 응답 시작 시 헤더 추가
+# (BaseHTTPMiddleware와 달리 본문 스트리밍/304 응답에도 그대로 동작)
+# -----------------------------------------------------------------------------
+class ServerTimingMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not SERVER_TIMING_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        timing = RequestTiming()
+        token = _current.set(timing)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", timing.header().encode("latin-1")))
+                headers.append((b"x-sql-count", str(timing.sql_count).encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
@@ -0,0 +1,3 @@
+# benchmarks/__init__.py
+# 합성 데이터 벤치마크: 규모별 서비스 함수/로더 지연·쿼리 수·최대 메모리 측정
+#   python -m benchmarks.run --scales 1000,10000 --out bench.json
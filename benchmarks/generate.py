@@ -0,0 +1,180 @@
+# benchmarks/generate.py
+from __future__ import annotations
+
+import argparse
+import csv
+import random
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List
+
+# =============================================================================
+# 합성 데이터 생성기
+# - scripts/load_csv.py 입력 형식(요건/매핑/위협 CSV)으로 출력 → 실제 로더로 DB 적재
+#   (요건-매핑 관계, 위협 링크, FTS 색인까지 운영과 같은 경로로 생성)
+# - 같은 seed면 같은 파일
+# =============================================================================
+
+@dataclass(frozen=True)
+class Scale:
+    frameworks: int             # SAGE-Threat 제외 프레임워크 수
+    requirements: int           # SAGE-Threat 제외 요건 수(프레임워크에 고르게 분배)
+    mappings: int
+    threat_groups: int
+    threats: int                # 위협 카탈로그(그룹에 고르게 분배)
+    sage: int                   # SAGE-Threat 요건 수(applicable_compliance 포함)
+    mappings_per_requirement: int = 3
+    applicable_per_sage: int = 6
+
+    @classmethod
+    def from_requirements(cls, n: int) -> "Scale":
+        """요건 수 하나로 나머지 규모를 비례 산정(현재 운영 데이터 비율 기준)."""
+        return cls(
+            frameworks=max(2, min(40, n // 300)),
+            requirements=n,
+            mappings=max(20, n // 10),
+            threat_groups=max(5, min(200, n // 100)),
+            threats=max(20, n // 2),
+            sage=max(10, n // 5),
+        )
+
+# -----------------------------------------------------------------------------
+# 어휘(실제 CSV와 비슷한 길이/문체의 한국어 문장 조합)
+# -----------------------------------------------------------------------------
+SUBJECTS = [
+    "정보시스템", "개인정보처리시스템", "클라우드 서비스", "데이터 저장소", "백업 데이터", "운영 환경",
+    "개발 환경", "관리자 계정", "API 게이트웨이", "로그 저장소", "모델 아티팩트", "학습 데이터셋",
+    "암호키", "네트워크 경계", "외부 위탁 업체", "이용자 단말",
+]
+CONTROLS = [
+    "접근권한을 최소한으로 부여", "강화된 인증 절차를 적용", "전송 구간 암호화를 적용", "변경 이력을 기록·보관",
+    "정기적으로 취약점을 점검", "접근 기록을 위·변조로부터 보호", "보존 기간 경과 시 지체 없이 파기",
+    "책임자의 승인을 받아 반영", "망분리 및 접근통제를 적용", "백업 및 복구 절차를 수립·이행",
+    "비밀번호 작성규칙을 수립·이행", "이상 징후를 탐지하여 대응",
+]
+QUALIFIERS = [
+    "법적 요구사항에 따라", "직무별 접근권한 분류 체계에 따라", "내부 관리계획에 따라", "위험평가 결과를 반영하여",
+    "업무상 필요한 범위 내에서", "정기적으로", "",
+]
+ASSETS = [
+    "개인정보", "민감정보", "고유식별정보", "인증정보", "API 토큰", "암호키", "백업 파일", "추론 로그",
+    "ML 메타데이터", "감사 로그", "관리자 권한", "배포 파이프라인",
+]
+WEAKNESSES = [
+    "평문 저장", "과도한 권한 부여", "암호화 미적용", "접근통제 미흡", "이력 미기록", "검토 누락",
+    "공유 계정 사용", "보존 기간 초과 보관", "외부 반출 통제 미흡", "무결성 검증 누락",
+]
+IMPACTS = [
+    "대량 유출", "권한 오남용", "서비스 중단", "법령·규제 위반", "무단 변경 반영", "추적 불가",
+    "복구 불능", "계정 도용",
+]
+GROUP_WORDS = ["권한/계정 관리", "개인정보/민감정보 노출", "로깅/감사", "암호화/키 관리", "네트워크 경계",
+               "데이터 수명주기", "공급망/위탁", "모델/AI 운영", "가용성/백업", "변경/배포 관리"]
+SERVICES = ["IAM", "KMS", "S3", "CloudTrail", "CloudWatch", "VPC", "GuardDuty", "Config", "Backup", "SageMaker",
+            "RDS", "Secrets Manager", "Organizations (SCP)", "IAM Identity Center(SSO)"]
+FIXES = [
+    "저장·전송 구간 암호화(SSE-KMS/HTTPS/TLS) 적용", "로깅·감사·무결성 보호 활성화", "최소 권한 정책 적용·주기 검토",
+    "네트워크 경계 강화·사설 경로 사용", "보존·백업·파기 정책 자동화", "환경 분리·테넌시 격리·마스킹",
+    "데이터 품질·라인리지·카탈로그 강화",
+]
+
+def _sentence(rng: random.Random) -> str:
+    q = rng.choice(QUALIFIERS)
+    return f"{rng.choice(SUBJECTS)}에 대해 {q + ' ' if q else ''}{rng.choice(CONTROLS)}하고 있는가?"
+
+def _threat_title(rng: random.Random) -> str:
+    return f"{rng.choice(ASSETS)} {rng.choice(WEAKNESSES)}으로 인한 {rng.choice(IMPACTS)}"
+
+# -----------------------------------------------------------------------------
+# CSV 출력
+# -----------------------------------------------------------------------------
+MAPPING_HEADER = ["ID", "매핑번호", "서비스", "리소스(AWS 엔티티)", "콘솔 위치", "점검/해결 방법", "CLI 명령어",
+                  "리턴 필드 예시", "이행(Compliant) 값", "미이행(Non-Compliant) 값", "콘솔 해결 방법", "CLI 해결 명령"]
+REQUIREMENT_HEADER = ["세부항목", "규제내용", "컴플라이언스", "매핑ID", "매핑여부(직접매핑/해당없음)", "감사가능",
+                      "감사방법(AWS 콘솔/CLI)", "권장해결(요약)", "해당컴플"]
+THREAT_HEADER = ["위협 그룹", "위협"]
+
+def _write(path: Path, header: List[str], rows) -> None:
+    with path.open("w", encoding="utf-8-sig", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(header)
+        w.writerows(rows)
+
+def generate(out_dir: Path, scale: Scale, seed: int = 42) -> Dict[str, Path]:
+    """out_dir에 requirements.csv / mappings.csv / threats.csv 생성 후 경로 반환."""
+    rng = random.Random(seed)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    paths = {k: out_dir / f"{k}.csv" for k in ("requirements", "mappings", "threats")}
+
+    # 매핑: "<카테고리>.0-<번호>"
+    mapping_codes: List[str] = []
+    mapping_rows = []
+    for i in range(scale.mappings):
+        cat = i % 20 + 1
+        code = f"{cat}.0-{i // 20 + 1:02d}"
+        svc = rng.choice(SERVICES)
+        mapping_codes.append(code)
+        mapping_rows.append([
+            code, f"{cat} ({rng.choice(GROUP_WORDS)})", svc, "; ".join(rng.sample(ASSETS, 2)),
+            f"{svc} → 설정 → {rng.choice(ASSETS)}", f"{rng.choice(CONTROLS)} 여부 확인",
+            f"aws {svc.split()[0].lower()} describe-{i}", "Items[].Status", "활성", "비활성 또는 누락",
+            f"{svc} → {rng.choice(FIXES)}", f"aws {svc.split()[0].lower()} update-{i} --enable",
+        ])
+    _write(paths["mappings"], MAPPING_HEADER, mapping_rows)
+
+    # 위협 카탈로그: 그룹별 ';' 결합 (그룹 내 제목 중복 없음)
+    groups = [f"{GROUP_WORDS[g % len(GROUP_WORDS)]} 문제 {g // len(GROUP_WORDS) + 1}" for g in range(scale.threat_groups)]
+    threat_titles: List[str] = []
+    per_group: Dict[str, List[str]] = {g: [] for g in groups}
+    for i in range(scale.threats):
+        title = f"{_threat_title(rng)} #{i}"
+        per_group[groups[i % len(groups)]].append(title)
+        threat_titles.append(title)
+    _write(paths["threats"], THREAT_HEADER, [[g, ";".join(ts)] for g, ts in per_group.items() if ts])
+
+    # 요건: 프레임워크별 세부항목 코드 고유
+    frameworks = [f"FW-{i + 1:02d}" for i in range(scale.frameworks)]
+    req_rows = []
+    item_codes: List[str] = []
+    for i in range(scale.requirements):
+        fw = frameworks[i % len(frameworks)]
+        n = i // len(frameworks)
+        item = f"{n // 100 + 1}.{n // 10 % 10 + 1}.{n % 10 + 1}.{i % 7 + 1}"
+        item_codes.append(item)
+        k = min(scale.mappings_per_requirement, len(mapping_codes))
+        req_rows.append([
+            item, _sentence(rng), fw, ";".join(rng.sample(mapping_codes, k)),
+            rng.choice(["직접매핑", "직접매핑", "해당없음"]), rng.choice(["Y", "N", ""]),
+            "AWS 콘솔/CLI", " / ".join(rng.sample(FIXES, 2)), "",
+        ])
+
+    # SAGE-Threat: 제목 = 위협 카탈로그 제목(그룹 매칭 대상)
+    # 해당컴플 = 다른 프레임워크 세부항목 + "제N조 조문명" 형태(제목 부분 일치 경로) ';' 결합
+    for i in range(scale.sage):
+        title = threat_titles[i % len(threat_titles)] if threat_titles else _threat_title(rng)
+        k = min(scale.applicable_per_sage, len(item_codes))
+        tokens = rng.sample(item_codes, k) if k else []
+        tokens += [f"제{rng.randint(1, 60)}조 {rng.choice(ASSETS)}의 {rng.choice(CONTROLS)}" for _ in range(k // 3)]
+        applicable = ";".join(tokens)
+        desc = f"{title}이(가) 발생할 수 있음. {_sentence(rng)} {_sentence(rng)}"
+        req_rows.append([
+            title, desc, "SAGE-Threat", "", "", "", "AWS 콘솔/CLI", " / ".join(rng.sample(FIXES, 3)), applicable,
+        ])
+    _write(paths["requirements"], REQUIREMENT_HEADER, req_rows)
+    return paths
+
+def main():
+    parser = argparse.ArgumentParser(description="벤치마크용 합성 CSV 생성(scripts.load_csv 입력 형식)")
+    parser.add_argument("--out", type=Path, required=True, help="출력 디렉터리")
+    parser.add_argument("--requirements", type=int, default=1000, help="요건 수(나머지 규모는 비례 산정)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    scale = Scale.from_requirements(args.requirements)
+    paths = generate(args.out, scale, seed=args.seed)
+    print(asdict(scale))
+    for name, path in paths.items():
+        print(f"{name}: {path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+# benchmarks/run.py
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from .generate import Scale, generate
+
+# =============================================================================
+# 벤치마크 실행기
+# - 규모마다 합성 CSV 생성 → 새 SQLite 파일에 scripts.load_csv로 적재 → 서비스 함수 측정
+# - 규모별 측정은 별도 프로세스(DATABASE_URL/엔진/프로세스 캐시가 import 시점에 고정되므로)
+# - 결과: 지연(ms), 쿼리 수, 최대 메모리 → JSON (--baseline으로 이전 결과와 비교)
+#
+#   python -m benchmarks.run --scales 500,2000,5000 --out bench.json
+#   python -m benchmarks.run --scales 2000 --baseline bench.json
+# =============================================================================
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+# -----------------------------------------------------------------------------
+# 측정 도구(측정 프로세스 안에서 사용)
+# -----------------------------------------------------------------------------
+class QueryCounter:
+    """엔진별 before_cursor_execute 횟수(= 실행한 SQL 문 수)."""
+    def __init__(self, *engines):
+        from sqlalchemy import event
+        self.count = 0
+        for e in engines:
+            event.listen(e, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *_args) -> None:
+        self.count += 1
+
+def _peak_rss_kb() -> int:
+    # Linux: KiB 단위, 프로세스 시작 이후 최대값
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+def _measure_loader(counter: QueryCounter, argv: List[str]) -> Dict[str, Any]:
+    from scripts import load_csv
+
+    q0 = counter.count
+    t0 = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()) as out:
+        load_csv.main(argv)
+    elapsed = time.perf_counter() - t0
+    diff = next((l for l in out.getvalue().splitlines() if "Diff:" in l), "")
+    return {
+        "seconds": round(elapsed, 3),
+        "queries": counter.count - q0,
+        "peak_rss_kb": _peak_rss_kb(),
+        "diff": diff.split("Diff:", 1)[-1].strip(),
+    }
+
+def _measure_call(session_factory, counter: QueryCounter, fn: Callable, repeat: int) -> Dict[str, Any]:
+    """
+    요청 1건 = 새 세션 1개(운영 라우트와 같은 조건).
+    - cold: 적재 직후 첫 호출(프로세스 캐시/색인 빌드 포함)
+    - warm: 이후 repeat회(지연 통계 + 마지막 호출 쿼리 수)
+    - peak_kb: warm 호출 1회의 Python 힙 최대 사용량(tracemalloc, 지연 측정과 분리)
+    """
+    def once() -> tuple:
+        with session_factory() as db:
+            q0 = counter.count
+            t0 = time.perf_counter()
+            result = fn(db)
+            ms = (time.perf_counter() - t0) * 1000
+            return ms, counter.count - q0, result
+
+    cold_ms, cold_queries, result = once()
+    warm = [once() for _ in range(repeat)]
+    times = [ms for ms, _, _ in warm]
+
+    tracemalloc.start()
+    try:
+        once()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    rows = len(result) if isinstance(result, list) else int(result is not None)
+    return {
+        "rows": rows,
+        "cold_ms": round(cold_ms, 2),
+        "cold_queries": cold_queries,
+        "p50_ms": round(statistics.median(times), 2),
+        "min_ms": round(min(times), 2),
+        "mean_ms": round(statistics.fmean(times), 2),
+        "queries": warm[-1][1],
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+def measure(data_dir: Path, repeat: int, loader_args: List[str]) -> Dict[str, Any]:
+    """DATABASE_URL이 data_dir/bench.db로 설정된 프로세스에서 호출."""
+    from sqlalchemy import func, select
+
+    from app.core.db import ReadSessionLocal, engine, read_engine
+    from app.models import Mapping, Requirement, RequirementMapping, RequirementThreat, Threat, ThreatGroup
+    from app.services import compliance_service as svc
+
+    counter = QueryCounter(engine, read_engine)
+    csv_args = [
+        "--requirements", str(data_dir / "requirements.csv"),
+        "--mappings", str(data_dir / "mappings.csv"),
+        "--threats", str(data_dir / "threats.csv"),
+        *loader_args,
+    ]
+    report: Dict[str, Any] = {"loader": {"load": _measure_loader(counter, csv_args)}}
+    # 변경 없는 재실행(행 해시 비교로 건너뛰는 경로)
+    report["loader"]["reload"] = _measure_loader(counter, csv_args)
+
+    with ReadSessionLocal() as db:
+        report["tables"] = {
+            m.__tablename__: db.execute(select(func.count()).select_from(m)).scalar_one()
+            for m in (Requirement, Mapping, RequirementMapping, ThreatGroup, Threat, RequirementThreat)
+        }
+        fw = db.execute(
+            select(Requirement.framework_code).where(Requirement.framework_code != "SAGE-Threat")
+            .order_by(Requirement.framework_code).limit(1)
+        ).scalar_one()
+        first_id = {
+            code: db.execute(select(func.min(Requirement.id)).where(Requirement.framework_code == code)).scalar_one()
+            for code in (fw, "SAGE-Threat")
+        }
+
+    sage = "SAGE-Threat"
+    cases: Dict[str, Callable] = {
+        "framework_counts": lambda db: svc.framework_counts(db),
+        f"list_requirements[{fw}]": lambda db: svc.list_requirements(db, fw),
+        f"list_requirements[{sage}]": lambda db: svc.list_requirements(db, sage),
+        f"list_requirements_with_groups[{sage}]": lambda db: svc.list_requirements_with_groups(db, sage),
+        f"list_requirements_with_threats[{fw}]": lambda db: svc.list_requirements_with_threats(db, fw),
+        f"list_requirements_with_threats[{sage}]": lambda db: svc.list_requirements_with_threats(db, sage),
+        f"requirement_detail[{fw}]": lambda db: svc.requirement_detail(db, fw, first_id[fw]),
+        f"requirement_detail_with_groups[{sage}]": lambda db: svc.requirement_detail_with_groups(db, sage, first_id[sage]),
+        f"requirement_detail_with_threats[{fw}]": lambda db: svc.requirement_detail_with_threats(db, fw, first_id[fw]),
+        f"requirement_detail_with_threats[{sage}]": lambda db: svc.requirement_detail_with_threats(db, sage, first_id[sage]),
+    }
+    report["functions"] = {name: _measure_call(ReadSessionLocal, counter, fn, repeat) for name, fn in cases.items()}
+    return report
+
+# -----------------------------------------------------------------------------
+# 오케스트레이션(규모별 측정 프로세스 실행)
+# -----------------------------------------------------------------------------
+def _git_rev() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip() or None
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_scale(n: int, work_dir: Path, repeat: int, loader_args: List[str], seed: int) -> Dict[str, Any]:
+    data_dir = work_dir / f"scale-{n}"
+    scale = Scale.from_requirements(n)
+    generate(data_dir, scale, seed=seed)
+    for suffix in ("", "-wal", "-shm"):
+        (data_dir / f"bench.db{suffix}").unlink(missing_ok=True)
+
+    env = {k: v for k, v in os.environ.items() if k != "DATABASE_READ_URL"}
+    env["DATABASE_URL"] = f"sqlite:///{data_dir / 'bench.db'}"
+    result_path = data_dir / "result.json"
+    cmd = [sys.executable, "-m", "benchmarks.run", "--measure", str(data_dir), "--repeat", str(repeat),
+           "--result", str(result_path), f"--loader-args={' '.join(loader_args)}"]
+    subprocess.run(cmd, cwd=REPO_ROOT, env=env, check=True)
+    return {"scale": n, "generated": asdict(scale), **json.loads(result_path.read_text(encoding="utf-8"))}
+
+def _print_summary(report: Dict[str, Any], baseline: Optional[Dict[str, Any]]) -> None:
+    base = {s["scale"]: s for s in baseline["scales"]} if baseline else {}
+    for s in report["scales"]:
+        print(f"\n== scale {s['scale']} (tables: {s['tables']})", file=sys.stderr)
+        for kind, r in s["loader"].items():
+            print(f"  load_csv:{kind:<8} {r['seconds']:>9.3f} s  q={r['queries']}  rss={r['peak_rss_kb']} KiB",
+                  file=sys.stderr)
+        prev = base.get(s["scale"], {}).get("functions", {})
+        for name, r in s["functions"].items():
+            line = f"  {name:<52} p50 {r['p50_ms']:>9.2f} ms  q={r['queries']:<4} peak={r['peak_kb']} KiB"
+            if name in prev and prev[name]["p50_ms"]:
+                line += f"  x{r['p50_ms'] / prev[name]['p50_ms']:.2f} vs baseline"
+            print(line, file=sys.stderr)
+
+def main():
+    parser = argparse.ArgumentParser(description="합성 데이터 규모별 서비스 함수/로더 벤치마크")
+    parser.add_argument("--scales", default="500,2000", help="쉼표 구분 요건 수 목록(SAGE-Threat 제외)")
+    parser.add_argument("--repeat", type=int, default=5, help="warm 측정 반복 횟수")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--loader-args", default="", help="scripts.load_csv 추가 인자(예: --loader-args=--bulk)")
+    parser.add_argument("--work-dir", type=Path, help="CSV/DB 작업 디렉터리(기본: 임시 디렉터리, 실행 후 삭제)")
+    parser.add_argument("--out", type=Path, help="결과 JSON 경로(기본: stdout)")
+    parser.add_argument("--baseline", type=Path, help="비교할 이전 결과 JSON")
+    # 내부용: 규모별 측정 프로세스
+    parser.add_argument("--measure", type=Path, help=argparse.SUPPRESS)
+    parser.add_argument("--result", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    loader_args = args.loader_args.split()
+
+    if args.measure:
+        report = measure(args.measure, args.repeat, loader_args)
+        args.result.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        return
+
+    report: Dict[str, Any] = {
+        "meta": {
+            "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "git_rev": _git_rev(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+            "seed": args.seed,
+            "loader_args": loader_args,
+        },
+        "scales": [],
+    }
+    with contextlib.ExitStack() as stack:
+        work_dir = args.work_dir or Path(stack.enter_context(tempfile.TemporaryDirectory(prefix="bench-")))
+        for n in (int(x) for x in args.scales.split(",") if x.strip()):
+            print(f"[bench] scale {n} ...", file=sys.stderr)
+            report["scales"].append(run_scale(n, work_dir, args.repeat, loader_args, args.seed))
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.out:
+        args.out.write_text(text, encoding="utf-8")
+    else:
+        print(text)
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8")) if args.baseline else None
+    _print_summary(report, baseline)
+
+if __name__ == "__main__":
+    main()
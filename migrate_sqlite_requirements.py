@@ -1,8 +1,7 @@
 # migrate_sqlite_requirements.py  (SQLite 전용)
 
-from sqlalchemy import create_engine, text
-
-DB_URL = "sqlite:///./app.db"
+# DB 위치는 앱과 동일(DATABASE_URL 환경 변수), 쓰기 엔진의 PRAGMA(WAL 등)도 그대로 적용
+from app.core.db import DATABASE_URL, engine
 
 SQL = """
 PRAGMA foreign_keys=OFF;
@@ -48,7 +47,8 @@ CHECKS = [
 ]
 
 if __name__ == "__main__":
-    engine = create_engine(DB_URL, future=True)
+    if engine.dialect.name != "sqlite":
+        raise SystemExit(f"SQLite 전용 스크립트입니다: {DATABASE_URL}")
 
     # executescript() 사용: 멀티문 실행 허용
     raw_conn = engine.raw_connection()
@@ -9,23 +9,44 @@
 # - ✅ requirements.recommended_fix / requirements.applicable_compliance 적재 지원
 # - ✅ ThreatGroup/Threat 테이블에 "위협 그룹, 위협" CSV 적재 지원
 # - ✅ NEW: Mapping에 "리소스(AWS 엔티티)" 컬럼 적재 지원(모델에 resource_entities 필드가 있을 경우만)
+# - ✅ SAGE-Threat FTS5(trigram) 색인 동기화(고정 위협 조회 가속)
+# - ✅ --bulk: 기존 키 선조회 + 배치 INSERT ... ON CONFLICT (매핑/요건/관계)
+# - ✅ --workers: 요건 CSV 병렬 파싱(프로세스 풀) + 단일 writer 순서 적용, rows/s 표기
 
 from __future__ import annotations
 
 import argparse
 import csv
-from dataclasses import dataclass
+import hashlib
+import json
+import sys
+import time
+from collections import Counter, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
-from typing import Iterable, List, Dict, Tuple, Optional, Any, Set
+from types import SimpleNamespace
+from typing import Deque, Iterable, Iterator, List, Dict, Tuple, Optional, Any, Set
 
 from sqlalchemy.orm import Session
-from sqlalchemy import select
+from sqlalchemy import select, insert, delete, bindparam
 from app.core.db import engine, SessionLocal
+from app.core.dialect import insert_on_conflict
 from app.models import (
     Framework, Requirement, Mapping, RequirementMapping,
-    ThreatGroup, Threat,
+    ThreatGroup, Threat, RequirementThreat,
 )
-from app.core.db import Base
+from app.core.schema import ensure_schema
+from app.core.meta import LOADER_RUN_KEY, bump_data_version, get_meta, set_meta
+from app.services.sage_fts import rebuild_sage_fts, fts_available
+from app.services.compliance_service import (
+    threat_links_ready, mark_threat_links_stale, mark_threat_links_ready,
+    refresh_requirement_threats,
+)
+from app.services.snapshot import write_snapshot
+from app.services.requirement_index import invalidate_requirement_index
+from app.services.threat_index import invalidate_threat_index
 
 
 # =========================
@@ -35,11 +56,57 @@ from app.core.db import Base
 def log(msg: str):
     print(f"[load_csv] {msg}")
 
+def note_change(db: Session) -> None:
+    """이번 커밋에 실제 데이터 변경(추가/수정/삭제)이 있음을 표시."""
+    db.info["data_changed"] = True
+
+def commit(db: Session) -> None:
+    """
+    커밋. 데이터가 실제로 바뀐 경우에만 세대 번호 갱신(API 응답 캐시/ETag 무효화).
+    - 메타 플래그/해시만 바뀐 커밋은 세대를 유지 → 변경 없는 재적재는 캐시를 건드리지 않음
+    - 같은 프로세스(_entry.py 시드 등)의 위협/요건 색인도 커밋 직후 폐기
+    """
+    changed = db.info.pop("data_changed", False)
+    if changed:
+        bump_data_version(db)
+    db.commit()
+    if changed:
+        invalidate_threat_index()
+        invalidate_requirement_index()
+
+def content_hash(*parts: Any) -> str:
+    """CSV 행 내용 해시(sha1, None은 빈 값으로 취급)."""
+    h = hashlib.sha1()
+    for p in parts:
+        h.update(("" if p is None else str(p)).encode("utf-8"))
+        h.update(b"\x1f")
+    return h.hexdigest()
+
 @dataclass(frozen=True)
 class HeaderSpec:
     required: List[str]
     aliases: Dict[str, List[str]]
 
+@dataclass
+class ChangeSet:
+    """이번 실행에서 바뀐 대상(요구사항→위협 링크 부분 재계산용)."""
+    requirement_ids: Set[int] = field(default_factory=set)
+    mapping_codes: Set[str] = field(default_factory=set)
+    sage_changed: bool = False      # SAGE-Threat 요건 변경 → 모든 요건의 고정 위협 영향
+    threats_changed: bool = False   # 위협/그룹 변경 → 모든 요건의 제안/그룹명 영향
+    # 삭제 판정용: 이번 입력에 있던 키
+    seen_requirement_ids: Set[int] = field(default_factory=set)
+    seen_frameworks: Set[str] = field(default_factory=set)
+    seen_mapping_codes: Set[str] = field(default_factory=set)
+    seen_threat_hashes: Set[str] = field(default_factory=set)
+    # 대상별 inserted/updated/unchanged/deleted 건수
+    diff: Dict[str, Counter] = field(default_factory=lambda: {k: Counter() for k in ("requirements", "mappings", "threats")})
+
+    def summary(self) -> str:
+        return " | ".join(
+            f"{k}: +{c['inserted']} ~{c['updated']} -{c['deleted']} ={c['unchanged']}" for k, c in self.diff.items()
+        )
+
 # 요구 CSV 헤더 스펙(유연 매핑)
 REQ_SPEC = HeaderSpec(
     required=["컴플라이언스", "규제내용"],
@@ -171,7 +238,10 @@ def upsert_mapping(db: Session, code: str, values: Dict[str, str], merge_mode: s
     if not m:
         m = Mapping(code=code)
         db.add(m)
+    return apply_mapping_values(m, values, merge_mode)
 
+def apply_mapping_values(m: Any, values: Dict[str, str], merge_mode: str = "overwrite") -> Any:
+    """CSV 값 병합(overwrite/fill). ORM 객체와 벌크 모드의 레코드(SimpleNamespace) 공용."""
     def assign(attr: str, newval: str):
         cur = getattr(m, attr, None) or ""
         if merge_mode == "fill":
@@ -244,6 +314,14 @@ def upsert_requirement(
         db.flush()  # r.id 확보
         return r
 
+    return apply_requirement_values(r, dict(
+        item_code=item_code, title=title, description=description,
+        mapping_status=mapping_status, auditable=auditable, audit_method=audit_method,
+        recommended_fix=recommended_fix, applicable_compliance=applicable_compliance,
+    ), merge_mode)
+
+def apply_requirement_values(r: Any, values: Dict[str, Optional[str]], merge_mode: str = "overwrite") -> Any:
+    """기존 요건에 CSV 값 병합(overwrite/fill). ORM 객체와 벌크 모드의 레코드(SimpleNamespace) 공용."""
     def assign(attr: str, newval: Optional[str]):
         cur = getattr(r, attr, None)
         nv = (newval or "").strip() or None
@@ -253,14 +331,8 @@ def upsert_requirement(
         else:
             setattr(r, attr, nv)
 
-    assign("item_code", item_code)
-    assign("title", title)
-    assign("description", description)
-    assign("mapping_status", mapping_status)
-    assign("auditable", auditable)
-    assign("audit_method", audit_method)
-    assign("recommended_fix", recommended_fix)
-    assign("applicable_compliance", applicable_compliance)
+    for attr in REQUIREMENT_FIELDS:
+        assign(attr, values.get(attr))
     return r
 
 def attach_requirement_mappings(
@@ -294,150 +366,732 @@ def attach_requirement_mappings(
     return len(news)
 
 # =========================
-# 업서트/로더 로직 (Threat)
+# 요건 CSV 파싱 파이프라인(--workers)
+# - 읽기: csv.reader로 chunk_rows 행씩 분할(따옴표 안 줄바꿈 안전)
+# - 파싱: 워커 프로세스가 헤더 매핑/필드 정리/매핑ID 분리
+# - 쓰기: 호출 측(단일 writer)이 입력 순서대로 소비
 # =========================
 
-def upsert_threat_group(db: Session, name: str) -> ThreatGroup:
-    name = name.strip()
-    tg = db.execute(select(ThreatGroup).where(ThreatGroup.name == name)).scalars().first()
-    if not tg:
-        tg = ThreatGroup(name=name)
-        db.add(tg)
-        db.flush()
-    return tg
-
-def upsert_threat(db: Session, group_id: int, title: str) -> Threat:
-    title = title.strip()
-    t = db.execute(
-        select(Threat).where(Threat.group_id == group_id, Threat.title == title)
-    ).scalars().first()
-    if not t:
-        t = Threat(group_id=group_id, title=title)
-        db.add(t)
-        db.flush()
-    return t
+# (framework_code, Requirement 필드 값, 매핑ID 목록, 행 내용 해시)
+ParsedRequirement = Tuple[str, Dict[str, Optional[str]], List[str], str]
+
+class Throughput:
+    """경과 시간 기준 처리량(rows/s) 표기."""
+    def __init__(self):
+        self.started = time.perf_counter()
+
+    def __call__(self, rows: int) -> str:
+        elapsed = max(time.perf_counter() - self.started, 1e-9)
+        return f"{rows / elapsed:,.0f} rows/s"
+
+@lru_cache(maxsize=8)
+def _req_header_map(fieldnames: Tuple[str, ...]) -> Dict[str, str]:
+    # 프로세스당 1회(fork 워커는 부모의 결과를 그대로 물려받음)
+    return normalize_header_map(list(fieldnames), REQ_SPEC)
+
+def parse_requirement_chunk(fieldnames: Tuple[str, ...], rows: List[List[str]], salt: str = "") -> List[ParsedRequirement]:
+    """
+    원본 행 묶음 → 적재용 레코드(컴플라이언스 값이 없는 행/빈 줄은 제외). 워커에서 실행.
+    salt: 해시에 섞을 값(병합 모드 — 같은 행이라도 모드가 다르면 다시 적용)
+    """
+    hdrmap = _req_header_map(fieldnames)
+    out: List[ParsedRequirement] = []
+    for raw in rows:
+        if not raw:
+            continue
+        row = dict(zip(fieldnames, raw))
+        framework_code = getv(row, hdrmap, "컴플라이언스")
+        if not framework_code:
+            continue
+        v = requirement_row_values(row, hdrmap)
+        mapping_ids = split_mapping_ids(getv(row, hdrmap, "매핑ID"))
+        row_hash = content_hash(salt, framework_code, *(v[f] for f in REQUIREMENT_FIELDS), ";".join(mapping_ids))
+        # 반복되는 코드 값은 intern → 청크 직렬화/writer 측 관계 집합 메모리 절감
+        out.append((sys.intern(framework_code), v, [sys.intern(c) for c in mapping_ids], row_hash))
+    return out
+
+def _raw_chunks(reader: Iterable[List[str]], size: int) -> Iterator[List[List[str]]]:
+    chunk: List[List[str]] = []
+    for raw in reader:
+        chunk.append(raw)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def iter_requirement_records(req_csv: Path, dialect: Dict[str, Any], encoding: str,
+                             workers: int = 0, chunk_rows: int = 5000, salt: str = "") -> Iterator[ParsedRequirement]:
+    """
+    요건 CSV → ParsedRequirement (입력 순서 유지).
+    - workers > 1: 프로세스 풀에서 청크 단위 병렬 파싱
+    - 동시에 읽어 둔 청크는 workers * 2 개까지만(메모리 상한 = 그 만큼의 행)
+    """
+    with req_csv.open("r", encoding=encoding, newline="") as f:
+        reader = csv.reader(f, **dialect)
+        fieldnames = tuple(next(reader, None) or ())
+        _req_header_map(fieldnames)  # 헤더 검증: 필수 컬럼이 없으면 여기서 중단
+        chunks = _raw_chunks(reader, max(chunk_rows, 1))
+
+        if workers <= 1:
+            for chunk in chunks:
+                yield from parse_requirement_chunk(fieldnames, chunk, salt)
+            return
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            inflight: Deque[Future] = deque()
+            for chunk in chunks:
+                inflight.append(pool.submit(parse_requirement_chunk, fieldnames, chunk, salt))
+                if len(inflight) >= workers * 2:
+                    yield from inflight.popleft().result()
+            while inflight:
+                yield from inflight.popleft().result()
 
 # =========================
 # CSV 로더
 # =========================
 
-def load_mappings(db: Session, mapping_csv: Path, dialect: Dict[str, Any], encoding: str, merge_mode: str, commit_every: int):
+MAPPING_FIELDS = (
+    "category", "service", "resource_entities", "console_path", "check_how", "cli_cmd",
+    "return_field", "compliant_value", "non_compliant_value", "console_fix", "cli_fix_cmd",
+)
+REQUIREMENT_FIELDS = (
+    "item_code", "title", "description", "mapping_status", "auditable",
+    "audit_method", "recommended_fix", "applicable_compliance",
+)
+
+def _snapshot(obj: Any, fields: Iterable[str]) -> Tuple:
+    return tuple(getattr(obj, f, None) for f in fields)
+
+def _count(changes: Optional[ChangeSet], kind: str, what: str) -> None:
+    if changes is not None:
+        changes.diff[kind][what] += 1
+
+class _ChangeTracker:
+    """
+    적재 중 손댄 레코드의 변경 판정(레코드 단위).
+    - 커밋 구간에서 처음 손댈 때의 값과 커밋 직전 값을 비교 → 중복 행이 같은 레코드를 바꿨다 되돌려도 변경 아님
+    - seen: 이번 입력에 나온 레코드(key → 레코드). 해시 기록/삭제 판정에 사용
+    """
+    def __init__(self, fields: Iterable[str]):
+        self.fields = list(fields)
+        self.seen: Dict[Any, Any] = {}
+        self.inserted: Set[Any] = set()
+        self.updated: Set[Any] = set()
+        self._base: Dict[Any, Tuple[Any, Optional[Tuple]]] = {}
+        self._linked: Set[Any] = set()
+
+    def can_skip(self, key: Any, obj: Any, row_hash: str) -> bool:
+        """
+        지난 적재와 같은 행이면 건너뜀(True).
+        이번 적재에서 이미 나온 레코드는 건너뛰지 않음 → 중복 행은 매번 전부 병합(기존 동작과 동일한 결과)
+        """
+        if obj is None or obj.content_hash != row_hash or key in self.seen:
+            return False
+        self.seen[key] = obj
+        return True
+
+    def touch(self, key: Any, obj: Any, before: Optional[Tuple], row_hash: str, linked: bool = False) -> bool:
+        """
+        병합한 행(before: 적용 전 스냅샷, 신규면 None). obj.content_hash를 갱신하고 해시가 바뀌었으면 True.
+        - 한 행만 병합된 레코드만 해시를 기록, 여러 행이 병합되는 레코드는 None(다음 적재에서 생략하지 않음)
+        """
+        new_hash = row_hash if key not in self.seen else None
+        self.seen.setdefault(key, obj)
+        self._base.setdefault(key, (obj, before))
+        if linked:
+            self._linked.add(key)
+        if obj.content_hash == new_hash:
+            return False
+        obj.content_hash = new_hash
+        return True
+
+    def settle(self, db: Session) -> List[Any]:
+        """커밋 직전 호출: 실제로 바뀐 레코드 목록(있으면 note_change)."""
+        changed = []
+        for key, (obj, before) in self._base.items():
+            if before is None:
+                self.inserted.add(key)
+            elif key in self._linked or before != _snapshot(obj, self.fields):
+                self.updated.add(key)
+            else:
+                continue
+            changed.append(obj)
+        self._base.clear()
+        self._linked.clear()
+        if changed:
+            note_change(db)
+        return changed
+
+    def count_into(self, changes: Optional[ChangeSet], kind: str) -> Tuple[int, int, int]:
+        updated = len(self.updated - self.inserted)
+        unchanged = len(self.seen) - len(self.inserted) - updated
+        if changes is not None:
+            changes.diff[kind].update(inserted=len(self.inserted), updated=updated, unchanged=unchanged)
+        return len(self.inserted), updated, unchanged
+
+def _preload_links(db: Session) -> Dict[int, Set[str]]:
+    """요건 id → 연결된 매핑 코드(전체 1회 조회)."""
+    links: Dict[int, Set[str]] = {}
+    for req_id, code in db.execute(select(RequirementMapping.requirement_id, RequirementMapping.mapping_code)).all():
+        links.setdefault(req_id, set()).add(code)
+    return links
+
+def links_complete(linked: Set[str], mapping_ids: Iterable[str], known_mappings: Set[str]) -> bool:
+    """
+    행의 매핑 코드 중 (존재하는 매핑인데) 연결이 빠진 것이 없으면 True.
+    - 해시가 같아도 연결이 빠졌으면(--delete-missing로 매핑이 지워졌다가 다시 적재된 경우 등) 건너뛰지 않음
+    - 매핑 테이블에 없는 코드는 판정에서 제외(없는 매핑 때문에 매번 재병합하지 않도록)
+    """
+    return all(c in linked or c not in known_mappings for c in mapping_ids)
+
+def mapping_row_hash(values: Dict[str, str], merge_mode: str) -> str:
+    return content_hash(merge_mode, *(values.get(k, "") for k in MAP_SPEC.aliases))
+
+def threat_hash(group_name: str, title: str) -> str:
+    return content_hash(group_name.strip(), title.strip())
+
+def requirement_row_values(row: Dict[str, Any], hdrmap: Dict[str, str]) -> Dict[str, Optional[str]]:
+    """요건 CSV 한 행 → Requirement 필드 값(REQUIREMENT_FIELDS)."""
+    item_code = getv(row, hdrmap, "세부항목") or None
+    description = getv(row, hdrmap, "규제내용")
+    return dict(
+        item_code=item_code,
+        title=item_code or (description[:80] if description else "요건"),
+        description=description,
+        mapping_status=getv(row, hdrmap, "매핑여부(직접매핑/해당없음)") or None,
+        auditable=getv(row, hdrmap, "감사가능") or None,
+        audit_method=getv(row, hdrmap, "감사방법(AWS 콘솔/CLI)") or None,
+        recommended_fix=getv(row, hdrmap, "권장해결(요약)") or None,
+        applicable_compliance=getv(row, hdrmap, "해당컴플") or None,
+    )
+
+def load_mappings(db: Session, mapping_csv: Path, dialect: Dict[str, Any], encoding: str, merge_mode: str, commit_every: int,
+                  changes: Optional[ChangeSet] = None):
     with mapping_csv.open("r", encoding=encoding, newline="") as f:
         reader = csv.DictReader(f, **dialect)
         hdrmap = normalize_header_map(reader.fieldnames or [], MAP_SPEC)
 
-        total, created, updated = 0, 0, 0
+        track = _ChangeTracker(MAPPING_FIELDS)
+
+        def checkpoint():
+            for m in track.settle(db):
+                if changes is not None:
+                    changes.mapping_codes.add(m.code)
+            commit(db)
+
+        total = 0
         for row in reader:
             total += 1
             code = getv(row, hdrmap, "ID")
             if not code:
                 continue
             values = {k: getv(row, hdrmap, k) for k in MAP_SPEC.aliases.keys()}
-            existed = bool(db.get(Mapping, code))
-            upsert_mapping(db, code, values, merge_mode=merge_mode)
-            if existed:
-                updated += 1
-            else:
-                created += 1
+            row_hash = mapping_row_hash(values, merge_mode)
+            existing = db.get(Mapping, code)
+            if track.can_skip(code, existing, row_hash):
+                continue
+            before = _snapshot(existing, MAPPING_FIELDS) if existing else None
+            m = upsert_mapping(db, code, values, merge_mode=merge_mode)
+            track.touch(code, m, before, row_hash)
 
             if commit_every > 0 and total % commit_every == 0:
-                db.commit()
+                checkpoint()
                 log(f"Mappings progress: {total} rows committed")
+        checkpoint()
+
+        if changes is not None:
+            changes.seen_mapping_codes.update(track.seen)
+        created, updated, unchanged = track.count_into(changes, "mappings")
+        log(f"Mappings: total={total}, created={created}, updated={updated}, unchanged={unchanged}")
+
+def load_requirements(db: Session, req_csv: Path, dialect: Dict[str, Any], encoding: str, merge_mode: str, commit_every: int,
+                      changes: Optional[ChangeSet] = None, workers: int = 0, chunk_rows: int = 5000):
+    track = _ChangeTracker(REQUIREMENT_FIELDS)
+
+    def checkpoint():
+        for r in track.settle(db):
+            if changes is not None:
+                changes.requirement_ids.add(r.id)
+                if r.framework_code == "SAGE-Threat":
+                    changes.sage_changed = True
+        commit(db)
+
+    rate = Throughput()
+    total_req, linked_rel = 0, 0
+    # 생략 판정용: 기존 관계/매핑 코드 선조회(행마다 조회하지 않음)
+    links = _preload_links(db)
+    known_mappings: Set[str] = set(db.execute(select(Mapping.code)).scalars().all())
+
+    for framework_code, v, mapping_ids, row_hash in iter_requirement_records(req_csv, dialect, encoding, workers, chunk_rows,
+                                                                             salt=merge_mode):
+        total_req += 1
+        if changes is not None:
+            changes.seen_frameworks.add(framework_code)
+
+        existing = find_existing_requirement(db, framework_code, v["item_code"], v["title"])
+        if (
+            existing is not None
+            and links_complete(links.get(existing.id, set()), mapping_ids, known_mappings)
+            and track.can_skip(existing.id, existing, row_hash)
+        ):
+            # 지난 적재와 같은 행 → 병합/관계 확인 생략
+            continue
 
-        log(f"Mappings: total={total}, created={created}, updated={updated}")
-
-def load_requirements(db: Session, req_csv: Path, dialect: Dict[str, Any], encoding: str, merge_mode: str, commit_every: int):
-    with req_csv.open("r", encoding=encoding, newline="") as f:
-        reader = csv.DictReader(f, **dialect)
-        hdrmap = normalize_header_map(reader.fieldnames or [], REQ_SPEC)
-
-        total_req, created_req, updated_req, linked_rel = 0, 0, 0, 0
+        upsert_framework(db, framework_code)
+        before = _snapshot(existing, REQUIREMENT_FIELDS) if existing else None
+        r = upsert_requirement(db, framework_code, **v, merge_mode=merge_mode)
 
-        for row in reader:
-            framework_code = getv(row, hdrmap, "컴플라이언스")
-            if not framework_code:
-                continue
-            total_req += 1
-
-            upsert_framework(db, framework_code)
-
-            item_code = getv(row, hdrmap, "세부항목") or None
-            description = getv(row, hdrmap, "규제내용")
-            title = item_code or (description[:80] if description else "요건")
-            mapping_status = getv(row, hdrmap, "매핑여부(직접매핑/해당없음)") or None
-            auditable = getv(row, hdrmap, "감사가능") or None
-            audit_method = getv(row, hdrmap, "감사방법(AWS 콘솔/CLI)") or None
-            recommended_fix = getv(row, hdrmap, "권장해결(요약)") or None
-            applicable_compliance = getv(row, hdrmap, "해당컴플") or None
-
-            existed = bool(find_existing_requirement(db, framework_code, item_code, title))
-            r = upsert_requirement(
-                db, framework_code, item_code, title, description,
-                mapping_status, auditable, audit_method,
-                recommended_fix, applicable_compliance,
-                merge_mode=merge_mode
-            )
-            if existed:
-                updated_req += 1
-            else:
-                created_req += 1
+        linked = 0
+        if mapping_ids:
+            linked = attach_requirement_mappings(db, r.id, mapping_ids, relation_type="direct")
+            linked_rel += linked
 
-            mapping_ids = split_mapping_ids(getv(row, hdrmap, "매핑ID"))
-            if mapping_ids:
-                linked_rel += attach_requirement_mappings(db, r.id, mapping_ids, relation_type="direct")
+        track.touch(r.id, r, before, row_hash, linked=bool(linked))
 
-            if commit_every > 0 and total_req % commit_every == 0:
-                db.commit()
-                log(f"Requirements progress: {total_req} rows committed")
+        if commit_every > 0 and total_req % commit_every == 0:
+            checkpoint()
+            log(f"Requirements progress: {total_req} rows committed ({rate(total_req)})")
+    checkpoint()
 
-        log(f"Requirements: total={total_req}, created={created_req}, updated={updated_req}, links_added={linked_rel}")
+    if changes is not None:
+        changes.seen_requirement_ids.update(track.seen)
+    created_req, updated_req, unchanged_req = track.count_into(changes, "requirements")
+    log(f"Requirements: total={total_req}, created={created_req}, updated={updated_req}, unchanged={unchanged_req}, "
+        f"links_added={linked_rel} ({rate(total_req)})")
 
-def load_threats(db: Session, threat_csv: Path, dialect: Dict[str, Any], encoding: str, commit_every: int):
+def load_threats(db: Session, threat_csv: Path, dialect: Dict[str, Any], encoding: str, commit_every: int,
+                 changes: Optional[ChangeSet] = None):
     """
     입력 예시:
     위협 그룹,위협
     권한/계정 관리 문제,"내부자 과도한 권한 및 오남용;권한 없는 사용자 개인정보 열람;..."
     ...
+    - 기존 그룹(name → id)과 (group_id, title) 쌍을 한 번에 읽어 메모리에서 판정
+    - 신규 그룹/위협은 commit_every 건마다 배치 INSERT ... ON CONFLICT DO NOTHING(uq_threat_group_title 준수)
     """
+    dialect_name = db.get_bind().dialect.name
+    group_table, threat_table = ThreatGroup.__table__, Threat.__table__
+    insert_group = insert_on_conflict(dialect_name, group_table, ["name"])
+    insert_threat = insert_on_conflict(dialect_name, threat_table, ["group_id", "title"])
+    set_hash = (
+        threat_table.update()
+        .where(threat_table.c.group_id == bindparam("gid"), threat_table.c.title == bindparam("t"))
+        .values(content_hash=bindparam("h"))
+    )
+
+    # 기존 그룹/위협 선조회
+    groups: Dict[str, int] = dict(db.execute(select(group_table.c.name, group_table.c.id)).all())
+    threats: Dict[Tuple[int, str], Optional[str]] = {
+        (gid, title): h for gid, title, h in db.execute(
+            select(threat_table.c.group_id, threat_table.c.title, threat_table.c.content_hash)
+        ).all()
+    }
+    log(f"Threats: preloaded {len(groups)} groups, {len(threats)} threats")
+
+    new_groups: List[str] = []
+    pending: List[Tuple[str, str, str]] = []            # (group_name, title, hash) — 그룹 id 미정일 수 있음
+    rehash: List[Tuple[int, str, str]] = []             # 해시 미기록(구 로더 적재) 위협: (group_id, title, hash)
+    created_groups, created_threats = 0, 0
+
+    def flush():
+        nonlocal created_groups, created_threats
+        if new_groups or pending:
+            note_change(db)
+        if new_groups:
+            _write_rows(db, insert_group, [{"name": n} for n in new_groups])
+            # ON CONFLICT로 건너뛴 그룹(동시 적재)도 포함해 id 확정
+            for start in range(0, len(new_groups), 500):
+                groups.update(db.execute(
+                    select(group_table.c.name, group_table.c.id).where(group_table.c.name.in_(new_groups[start:start + 500]))
+                ).all())
+            created_groups += len(new_groups)
+            new_groups.clear()
+        if pending:
+            rows = [{"group_id": groups[g], "title": t, "content_hash": h} for g, t, h in pending]
+            _write_rows(db, insert_threat, rows)
+            for row in rows:
+                threats[(row["group_id"], row["title"])] = row["content_hash"]
+            created_threats += len(pending)
+            pending.clear()
+        _write_rows(db, set_hash, [{"gid": gid, "t": title, "h": h} for gid, title, h in rehash])
+        rehash.clear()
+        commit(db)
+
     with threat_csv.open("r", encoding=encoding, newline="") as f:
         reader = csv.DictReader(f, **dialect)
         hdrmap = normalize_header_map(reader.fieldnames or [], THREAT_SPEC)
 
-        total_rows, created_groups, created_threats = 0, 0, 0
+        total_rows = 0
+        queued: Set[Tuple[str, str]] = set()            # 이번 배치에 이미 넣은 (그룹, 위협)
         for row in reader:
             total_rows += 1
-            group_name = getv(row, hdrmap, "위협 그룹")
+            group_name = getv(row, hdrmap, "위협 그룹").strip()
             threats_raw = getv(row, hdrmap, "위협")
             if not group_name or not threats_raw:
                 continue
 
-            # 그룹 업서트
-            existed_group = db.execute(select(ThreatGroup).where(ThreatGroup.name == group_name)).scalars().first()
-            tg = upsert_threat_group(db, group_name)
-            if not existed_group:
-                created_groups += 1
+            gid = groups.get(group_name)
+            if gid is None and group_name not in new_groups:
+                new_groups.append(group_name)
 
             # 세미콜론 분리
-            items = split_semicolon(threats_raw)
-            for title in items:
-                existed_threat = db.execute(
-                    select(Threat).where(Threat.group_id == tg.id, Threat.title == title)
-                ).scalars().first()
-                _ = upsert_threat(db, tg.id, title)
-                if not existed_threat:
-                    created_threats += 1
-
-            if commit_every > 0 and total_rows % commit_every == 0:
-                db.commit()
+            for title in split_semicolon(threats_raw):
+                h = threat_hash(group_name, title)
+                if changes is not None:
+                    changes.seen_threat_hashes.add(h)
+                if gid is not None and (gid, title) in threats:
+                    if threats[(gid, title)] != h:
+                        rehash.append((gid, title, h))
+                        threats[(gid, title)] = h
+                    _count(changes, "threats", "unchanged")
+                elif (group_name, title) not in queued:
+                    queued.add((group_name, title))
+                    pending.append((group_name, title, h))
+                    _count(changes, "threats", "inserted")
+
+            if commit_every > 0 and len(pending) + len(rehash) >= commit_every:
+                flush()
+                queued.clear()
                 log(f"Threats progress: {total_rows} rows committed")
+        flush()
 
+        if changes is not None and (created_groups or created_threats):
+            changes.threats_changed = True
         log(f"Threats CSV: rows={total_rows}, groups_created={created_groups}, threats_created={created_threats}")
 
+# =========================
+# 벌크 모드(--bulk): 기존 키 선조회 + 배치 INSERT ... ON CONFLICT
+# - 행마다 SELECT/flush 하지 않고, 기존 레코드를 한 번에 읽어 메모리에서 병합
+# - 병합 규칙(overwrite/fill)과 "기존 요건 찾기" 규칙은 행 단위 모드와 동일
+# - batch_size(= --commit-every) 행마다 변경분만 기록 후 커밋
+# =========================
+
+def _write_rows(db: Session, stmt, rows: List[Dict[str, Any]]) -> None:
+    if rows:
+        db.execute(stmt, rows)
+
+class _RequirementKeys:
+    """
+    (framework, item_code) / (framework, title) → 요건 레코드 목록(id 오름차순, 신규는 뒤).
+    find_existing_requirement와 같은 순서로 첫 레코드를 돌려준다.
+    """
+    def __init__(self):
+        self.by_item: Dict[Tuple[str, str], List[Any]] = {}
+        self.by_title: Dict[Tuple[str, str], List[Any]] = {}
+
+    def add(self, rec: Any) -> None:
+        if rec.item_code:
+            self.by_item.setdefault((rec.framework_code, rec.item_code), []).append(rec)
+        self.by_title.setdefault((rec.framework_code, rec.title), []).append(rec)
+
+    def remove(self, rec: Any, item_code: Optional[str], title: str) -> None:
+        if item_code:
+            self.by_item[(rec.framework_code, item_code)].remove(rec)
+        self.by_title[(rec.framework_code, title)].remove(rec)
+
+    def rekey(self, rec: Any, old_item: Optional[str], old_title: str) -> None:
+        """병합으로 item_code/title이 바뀐 레코드 재색인(기존 목록 내 순서 유지)."""
+        if (old_item, old_title) == (rec.item_code, rec.title):
+            return
+        self.remove(rec, old_item, old_title)
+        for index, key in ((self.by_item, rec.item_code), (self.by_title, rec.title)):
+            if index is self.by_item and not key:
+                continue
+            lst = index.setdefault((rec.framework_code, key), [])
+            lst.append(rec)
+            lst.sort(key=lambda x: x.seq)
+
+    def find(self, framework_code: str, item_code: Optional[str], title: str) -> Optional[Any]:
+        if item_code:
+            lst = self.by_item.get((framework_code, item_code))
+            if lst:
+                return lst[0]
+        lst = self.by_title.get((framework_code, title))
+        return lst[0] if lst else None
+
+def bulk_load_mappings(db: Session, mapping_csv: Path, dialect: Dict[str, Any], encoding: str, merge_mode: str, batch_size: int,
+                       changes: Optional[ChangeSet] = None):
+    table = Mapping.__table__
+    fields = [f for f in MAPPING_FIELDS if f in table.c] + ["content_hash"]
+    stmt = insert_on_conflict(db.get_bind().dialect.name, table, ["code"], update=fields)
+
+    # 기존 매핑 전체 선조회(code → 레코드)
+    state: Dict[str, SimpleNamespace] = {
+        r.code: SimpleNamespace(**r._asdict())
+        for r in db.execute(select(table.c.code, *[table.c[f] for f in fields])).all()
+    }
+    log(f"Mappings(bulk): preloaded {len(state)} existing")
+
+    dirty: Dict[str, SimpleNamespace] = {}
+
+    track = _ChangeTracker(MAPPING_FIELDS)
+
+    def flush():
+        _write_rows(db, stmt, [{"code": m.code, **{f: getattr(m, f) for f in fields}} for m in dirty.values()])
+        dirty.clear()
+        for m in track.settle(db):
+            if changes is not None:
+                changes.mapping_codes.add(m.code)
+        commit(db)
+
+    with mapping_csv.open("r", encoding=encoding, newline="") as f:
+        reader = csv.DictReader(f, **dialect)
+        hdrmap = normalize_header_map(reader.fieldnames or [], MAP_SPEC)
+
+        total = 0
+        for row in reader:
+            total += 1
+            code = getv(row, hdrmap, "ID")
+            if not code:
+                continue
+            values = {k: getv(row, hdrmap, k) for k in MAP_SPEC.aliases.keys()}
+            row_hash = mapping_row_hash(values, merge_mode)
+            m = state.get(code)
+            if track.can_skip(code, m, row_hash):
+                continue
+            if m is None:
+                m = state[code] = SimpleNamespace(code=code, **{f: None for f in fields})
+                before = None
+            else:
+                before = _snapshot(m, MAPPING_FIELDS)
+            apply_mapping_values(m, values, merge_mode)
+            if track.touch(code, m, before, row_hash) or before != _snapshot(m, MAPPING_FIELDS):
+                dirty[code] = m
+
+            if batch_size > 0 and len(dirty) >= batch_size:
+                flush()
+                log(f"Mappings progress: {total} rows committed")
+        flush()
+
+        if changes is not None:
+            changes.seen_mapping_codes.update(track.seen)
+        created, updated, unchanged = track.count_into(changes, "mappings")
+        log(f"Mappings: total={total}, created={created}, updated={updated}, unchanged={unchanged}")
+
+def bulk_load_requirements(db: Session, req_csv: Path, dialect: Dict[str, Any], encoding: str, merge_mode: str, batch_size: int,
+                           changes: Optional[ChangeSet] = None, workers: int = 0, chunk_rows: int = 5000):
+    dialect_name = db.get_bind().dialect.name
+    req_table = Requirement.__table__
+    link_table = RequirementMapping.__table__
+    row_fields = [*REQUIREMENT_FIELDS, "content_hash"]
+    upsert_req = insert_on_conflict(dialect_name, req_table, ["id"], update=row_fields)
+    insert_req = insert(req_table).returning(req_table.c.id, sort_by_parameter_order=True)
+    insert_fw = insert_on_conflict(dialect_name, Framework.__table__, ["code"])
+    insert_link = insert_on_conflict(dialect_name, link_table, ["requirement_id", "mapping_code"])
+
+    # 기존 프레임워크/요건/관계 선조회
+    frameworks: Set[str] = set(db.execute(select(Framework.code)).scalars().all())
+    keys = _RequirementKeys()
+    seq = 0
+    for r in db.execute(select(req_table.c.id, req_table.c.framework_code, *[req_table.c[f] for f in row_fields])
+                        .order_by(req_table.c.id)).all():
+        seq += 1
+        keys.add(SimpleNamespace(**r._asdict(), seq=seq, links=set()))
+    by_id = {rec.id: rec for lst in keys.by_title.values() for rec in lst}
+    for req_id, codes in _preload_links(db).items():
+        if req_id in by_id:
+            by_id[req_id].links = codes
+    known_mappings: Set[str] = set(db.execute(select(Mapping.code)).scalars().all())
+    log(f"Requirements(bulk): preloaded {len(by_id)} existing")
+
+    new_frameworks: Set[str] = set()
+    pending: Dict[int, SimpleNamespace] = {}           # id(rec) → 신규/변경 레코드
+    pending_links: List[Tuple[SimpleNamespace, str]] = []
+    track = _ChangeTracker(REQUIREMENT_FIELDS)          # key = id(rec)
+
+    def flush():
+        _write_rows(db, insert_fw, [{"code": c, "name": c} for c in sorted(new_frameworks)])
+        new_frameworks.clear()
+
+        news = [rec for rec in pending.values() if rec.id is None]
+        new_keys = {id(rec) for rec in news}
+        if news:
+            rows = [{"framework_code": rec.framework_code, **{f: getattr(rec, f) for f in row_fields}} for rec in news]
+            for rec, new_id in zip(news, db.execute(insert_req, rows).scalars().all()):
+                rec.id = new_id
+        _write_rows(db, upsert_req, [
+            {"id": rec.id, "framework_code": rec.framework_code, **{f: getattr(rec, f) for f in row_fields}}
+            for key, rec in pending.items() if key not in new_keys
+        ])
+        pending.clear()
+
+        _write_rows(db, insert_link, [
+            {"requirement_id": rec.id, "mapping_code": code, "relation_type": "direct"} for rec, code in pending_links
+        ])
+        pending_links.clear()
+
+        for rec in track.settle(db):
+            if changes is not None:
+                changes.requirement_ids.add(rec.id)
+                if rec.framework_code == "SAGE-Threat":
+                    changes.sage_changed = True
+        commit(db)
+
+    rate = Throughput()
+    total_req, linked_rel = 0, 0
+    for framework_code, v, mapping_ids, row_hash in iter_requirement_records(req_csv, dialect, encoding, workers, chunk_rows,
+                                                                             salt=merge_mode):
+        total_req += 1
+        if changes is not None:
+            changes.seen_frameworks.add(framework_code)
+
+        rec = keys.find(framework_code, v["item_code"], v["title"])
+        if rec is not None and links_complete(rec.links, mapping_ids, known_mappings) and track.can_skip(id(rec), rec, row_hash):
+            continue
+
+        if framework_code not in frameworks:
+            frameworks.add(framework_code)
+            new_frameworks.add(framework_code)
+
+        if rec is None:
+            seq += 1
+            rec = SimpleNamespace(
+                id=None, framework_code=framework_code, seq=seq, links=set(), content_hash=None,
+                **{**v, "recommended_fix": v["recommended_fix"] or None,
+                   "applicable_compliance": v["applicable_compliance"] or None},
+            )
+            keys.add(rec)
+            before = None
+        else:
+            before = _snapshot(rec, REQUIREMENT_FIELDS)
+            old_item, old_title = rec.item_code, rec.title
+            apply_requirement_values(rec, v, merge_mode)
+            keys.rekey(rec, old_item, old_title)
+
+        linked = 0
+        for code in mapping_ids:
+            if code not in rec.links:
+                rec.links.add(code)
+                pending_links.append((rec, code))
+                linked += 1
+        linked_rel += linked
+
+        # 해시만 달라진 경우(병합 결과 동일)도 해시는 기록 → 다음 적재부터 생략
+        if track.touch(id(rec), rec, before, row_hash, linked=bool(linked)) or before != _snapshot(rec, REQUIREMENT_FIELDS):
+            pending[id(rec)] = rec
+
+        if batch_size > 0 and total_req % batch_size == 0:
+            flush()
+            log(f"Requirements progress: {total_req} rows committed ({rate(total_req)})")
+    flush()
+
+    if changes is not None:
+        changes.seen_requirement_ids.update(rec.id for rec in track.seen.values())
+    created_req, updated_req, unchanged_req = track.count_into(changes, "requirements")
+    log(f"Requirements: total={total_req}, created={created_req}, updated={updated_req}, unchanged={unchanged_req}, "
+        f"links_added={linked_rel} ({rate(total_req)})")
+
+# =========================
+# (옵션) 입력에서 사라진 행 삭제(--delete-missing)
+# =========================
+
+def _in_chunks(values: Iterable[Any], size: int = 500) -> Iterator[List[Any]]:
+    values = list(values)
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+def delete_missing(db: Session, changes: ChangeSet, threats_loaded: bool) -> None:
+    """
+    이번 입력에 없던 행 삭제.
+    - 요건: 입력에 나온 프레임워크 범위 안에서만(다른 프레임워크 요건은 유지)
+    - 매핑: 매핑 CSV에 없는 코드(연결된 요건은 위협 링크 재계산 대상)
+    - 위협: 위협 CSV를 함께 적재한 경우에만
+    """
+    # 요건
+    gone_reqs: List[int] = []
+    if changes.seen_frameworks:
+        rows = db.execute(
+            select(Requirement.id, Requirement.framework_code)
+            .where(Requirement.framework_code.in_(sorted(changes.seen_frameworks)))
+        ).all()
+        gone_reqs = [rid for rid, fw in rows if rid not in changes.seen_requirement_ids]
+        if any(fw == "SAGE-Threat" for rid, fw in rows if rid not in changes.seen_requirement_ids):
+            changes.sage_changed = True
+    for ids in _in_chunks(gone_reqs):
+        db.execute(delete(RequirementThreat).where(RequirementThreat.requirement_id.in_(ids)))
+        db.execute(delete(RequirementMapping).where(RequirementMapping.requirement_id.in_(ids)))
+        db.execute(delete(Requirement).where(Requirement.id.in_(ids)))
+    changes.requirement_ids.difference_update(gone_reqs)
+    changes.diff["requirements"]["deleted"] += len(gone_reqs)
+
+    # 매핑
+    gone_maps = [c for c in db.execute(select(Mapping.code)).scalars().all() if c not in changes.seen_mapping_codes]
+    for codes in _in_chunks(gone_maps):
+        changes.requirement_ids.update(db.execute(
+            select(RequirementMapping.requirement_id).where(RequirementMapping.mapping_code.in_(codes))
+        ).scalars().all())
+        db.execute(delete(RequirementMapping).where(RequirementMapping.mapping_code.in_(codes)))
+        db.execute(delete(Mapping).where(Mapping.code.in_(codes)))
+    changes.diff["mappings"]["deleted"] += len(gone_maps)
+
+    # 위협(해시 미기록 = 이번 입력에 없던 구 데이터)
+    gone_threats: List[int] = []
+    if threats_loaded:
+        gone_threats = [
+            tid for tid, h in db.execute(select(Threat.id, Threat.content_hash)).all()
+            if h is None or h not in changes.seen_threat_hashes
+        ]
+        for ids in _in_chunks(gone_threats):
+            db.execute(delete(Threat).where(Threat.id.in_(ids)))
+        if gone_threats:
+            changes.threats_changed = True
+    changes.diff["threats"]["deleted"] += len(gone_threats)
+
+    if gone_reqs or gone_maps or gone_threats:
+        note_change(db)
+    log(f"Deleted missing: requirements={len(gone_reqs)}, mappings={len(gone_maps)}, threats={len(gone_threats)}")
+
+# =========================
+# 요구사항 → 위협 링크 재계산
+# =========================
+
+def refresh_threat_links(db: Session, changes: ChangeSet, was_ready: bool) -> None:
+    """
+    바뀐 요건만 재계산. SAGE-Threat/위협 카탈로그가 바뀌었거나
+    이전 계산이 완료되지 않았으면 전체 재계산.
+    """
+    if not was_ready or changes.sage_changed or changes.threats_changed:
+        n = refresh_requirement_threats(db)
+        log(f"Threat links: recomputed all ({n} requirements)")
+        return
+
+    ids = set(changes.requirement_ids)
+    if changes.mapping_codes:
+        codes = sorted(changes.mapping_codes)
+        for start in range(0, len(codes), 500):
+            ids.update(db.execute(
+                select(RequirementMapping.requirement_id)
+                .where(RequirementMapping.mapping_code.in_(codes[start:start + 500]))
+            ).scalars().all())
+    if not ids:
+        log("Threat links: unchanged")
+    else:
+        n = refresh_requirement_threats(db, ids)
+        log(f"Threat links: recomputed {n} requirements")
+    # 적재 시작 시 stale 로 표시했으므로 완료 표시 복구
+    mark_threat_links_ready(db)
+
+def record_run(db: Session, changes: ChangeSet, seconds: float) -> None:
+    """실행 요약(소요 시간/처리 행 수)을 app_meta에 기록 → API /metrics가 노출. 데이터 세대는 유지."""
+    try:
+        runs = int(json.loads(get_meta(db, LOADER_RUN_KEY) or "{}").get("runs", 0))
+    except (ValueError, AttributeError):
+        runs = 0
+    total = sum(sum(c.values()) for c in changes.diff.values())
+    set_meta(db, LOADER_RUN_KEY, json.dumps({
+        "runs": runs + 1,
+        "finished_at": round(time.time(), 3),
+        "seconds": round(seconds, 3),
+        "rows": {kind: dict(c) for kind, c in changes.diff.items()},
+        "rows_per_second": round(total / seconds, 1) if seconds > 0 else 0.0,
+    }))
+
 # =========================
 # 메인
 # =========================
 
-def main():
+def main(argv: Optional[List[str]] = None):
     parser = argparse.ArgumentParser(description="CSV → DB 로더 (재실행 안전/자동 매핑)")
     parser.add_argument("--requirements", type=Path, required=True, help="요건 CSV/TSV 경로")
     parser.add_argument("--mappings", type=Path, required=True, help="매핑 CSV/TSV 경로")
@@ -448,10 +1102,19 @@ def main():
                         help="overwrite=항상 덮어씀, fill=기존값이 빈 칸일 때만 채움")
     parser.add_argument("--commit-every", type=int, default=5000, help="N행마다 커밋 (대용량 안정성)")
     parser.add_argument("--dry-run", action="store_true", help="DB 변경 없이 파싱만 수행")
-    args = parser.parse_args()
-
-    # 스키마 준비
-    Base.metadata.create_all(bind=engine)
+    parser.add_argument("--workers", type=int, default=0, help="요건 CSV 파싱 워커 프로세스 수 (0/1=단일 프로세스)")
+    parser.add_argument("--chunk-rows", type=int, default=5000, help="파싱 워커에 넘기는 청크 크기(행)")
+    parser.add_argument("--bulk", action="store_true",
+                        help="벌크 모드: 기존 키 선조회 + --commit-every 행 단위 INSERT ... ON CONFLICT (대량 적재용)")
+    parser.add_argument("--delete-missing", action="store_true",
+                        help="입력에 없는 요건(입력에 나온 프레임워크 한정)/매핑/위협(--threats 지정 시) 삭제")
+    parser.add_argument("--snapshot", type=Path, required=False,
+                        help="적재 후 API 읽기 전용 스냅샷 파일 생성(API는 SNAPSHOT_PATH로 지정)")
+    args = parser.parse_args(argv)
+    started = time.perf_counter()
+
+    # 스키마 준비(저장된 스키마 버전이 같으면 생략, 다르면 생성 + 추가 컬럼 마이그레이션)
+    ensure_schema(engine)
 
     # 파일 포맷/인코딩
     req_dialect = auto_dialect(args.requirements, None if args.format == "auto" else args.format)
@@ -464,7 +1127,8 @@ def main():
     log(f"mappings:     {args.mappings} ({args.encoding}, {map_dialect})")
     if args.threats:
         log(f"threats:      {args.threats} ({args.encoding}, {thr_dialect})")
-    log(f"merge_mode={args.merge_mode}, dry_run={args.dry_run}, commit_every={args.commit_every}")
+    log(f"merge_mode={args.merge_mode}, dry_run={args.dry_run}, commit_every={args.commit_every}, bulk={args.bulk}, "
+        f"workers={args.workers}, chunk_rows={args.chunk_rows}, delete_missing={args.delete_missing}")
 
     if args.dry_run:
         with args.mappings.open("r", encoding=args.encoding, newline="") as f:
@@ -481,19 +1145,58 @@ def main():
         return
 
     with SessionLocal() as db:
+        # 적재 중에는 API가 미리 계산된 위협 링크를 쓰지 않도록 표시
+        was_ready = threat_links_ready(db)
+        mark_threat_links_stale(db)
+        commit(db)
+        changes = ChangeSet()
+
         # 1) 매핑 선적재 (+리소스 엔티티)
-        load_mappings(db, args.mappings, map_dialect, args.encoding, merge_mode=args.merge_mode, commit_every=args.commit_every)
-        db.commit()
+        map_loader = bulk_load_mappings if args.bulk else load_mappings
+        map_loader(db, args.mappings, map_dialect, args.encoding, args.merge_mode, args.commit_every,
+                   changes=changes)
+        commit(db)
 
         # 2) 요건+관계 (+권장해결/해당컴플)
-        load_requirements(db, args.requirements, req_dialect, args.encoding, merge_mode=args.merge_mode, commit_every=args.commit_every)
-        db.commit()
+        req_loader = bulk_load_requirements if args.bulk else load_requirements
+        req_loader(db, args.requirements, req_dialect, args.encoding, args.merge_mode, args.commit_every,
+                   changes=changes, workers=args.workers, chunk_rows=args.chunk_rows)
+        commit(db)
 
         # 3) (옵션) 위협 그룹/위협 적재
         if args.threats:
-            load_threats(db, args.threats, thr_dialect, args.encoding, commit_every=args.commit_every)
-            db.commit()
+            load_threats(db, args.threats, thr_dialect, args.encoding, commit_every=args.commit_every,
+                         changes=changes)
+            commit(db)
+
+        # 3-1) (옵션) 입력에서 사라진 행 삭제
+        if args.delete_missing:
+            delete_missing(db, changes, threats_loaded=bool(args.threats))
+            commit(db)
+
+        # 3-2) SAGE-Threat 고정 위협 조회용 FTS5 색인 동기화(SQLite + FTS5 지원 시, SAGE 요건 변경 시에만)
+        if changes.sage_changed or not fts_available(db):
+            if rebuild_sage_fts(db):
+                commit(db)
+                log("SAGE-Threat FTS index rebuilt")
+            else:
+                log("⚠️  FTS5(trigram) 미지원: 고정 위협 조회는 ILIKE 전수 검색으로 동작")
+
+        # 4) 요구사항 → 위협 링크(고정/제안) 계산 결과 저장
+        refresh_threat_links(db, changes, was_ready)
+        commit(db)
+
+        record_run(db, changes, time.perf_counter() - started)
+        commit(db)
+
+        # 5) (옵션) 읽기 전용 스냅샷(보강 완료 응답 문서 + 오프셋 색인)
+        if args.snapshot:
+            t = time.perf_counter()
+            info = write_snapshot(db, args.snapshot)
+            log(f"Snapshot: {args.snapshot} (version={info['version']}, documents={info['documents']}, "
+                f"bytes={info['bytes']}, {time.perf_counter() - t:.1f}s)")
 
+    log(f"Diff: {changes.summary()}")
     log("✅ CSV 적재 완료")
 
 if __name__ == "__main__":
@@ -0,0 +1,69 @@
+# tests/_app.py
+# 엔진/스냅샷은 import 시 DATABASE_URL/SNAPSHOT_PATH로 정해지므로 로더·앱 요청은 설정마다 별도 프로세스에서 실행
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+REQUIREMENTS = ROOT / "compliance-gorn.csv"
+MAPPINGS = ROOT / "mapping-standard.csv"
+
+# 자식 프로세스: stdin의 단계 목록을 차례로 실행
+#   {"path", "headers"} → 실제 앱(TestClient)으로 GET, {"bump": true} → 데이터 세대 증가(로더 커밋과 같은 효과)
+#   {"path", "follow": true} → X-Next-Cursor가 없을 때까지 cursor=를 붙여 반복 → 응답 목록
+_CLIENT = """
+import json, sys
+from fastapi.testclient import TestClient
+from app.main import app
+
+def get(client, path, headers):
+    r = client.get(path, headers=headers or {})
+    return {"status": r.status_code, "headers": dict(r.headers), "body": r.text}
+
+out = []
+with TestClient(app) as client:
+    for step in json.load(sys.stdin):
+        if step.get("bump"):
+            from app.core.db import SessionLocal
+            from app.core.meta import bump_data_version
+            with SessionLocal() as s:
+                bump_data_version(s)
+                s.commit()
+            out.append(None)
+            continue
+        res = get(client, step["path"], step.get("headers"))
+        if step.get("follow"):
+            pages = [res]
+            sep = "&" if "?" in step["path"] else "?"
+            while res["status"] == 200 and "x-next-cursor" in res["headers"]:
+                res = get(client, step["path"] + sep + "cursor=" + res["headers"]["x-next-cursor"], step.get("headers"))
+                pages.append(res)
+            res = pages
+        out.append(res)
+json.dump(out, sys.stdout)
+"""
+
+def env_for(db_path: Path, **extra: str) -> Dict[str, str]:
+    return {**os.environ, "DATABASE_URL": f"sqlite:///{db_path}", **extra}
+
+def load(db_path: Path, *extra: str, mappings: Path = MAPPINGS) -> str:
+    """로더 실행 → stdout(요약 출력) 반환"""
+    proc = subprocess.run(
+        [sys.executable, "-m", "scripts.load_csv", "--requirements", str(REQUIREMENTS), "--mappings", str(mappings), *extra],
+        cwd=ROOT, env=env_for(db_path), check=True, capture_output=True, text=True,
+    )
+    return proc.stdout
+
+def run_app(env: Dict[str, str], steps: List[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+    """한 앱 프로세스에서 단계들을 실행 → 요청 단계마다 {"status", "headers", "body"}"""
+    proc = subprocess.run(
+        [sys.executable, "-c", _CLIENT], input=json.dumps(steps),
+        cwd=ROOT, env=env, check=True, capture_output=True, text=True,
+    )
+    return json.loads(proc.stdout)
+
+def get_all(env: Dict[str, str], paths: List[str]) -> Dict[str, Dict[str, Any]]:
+    return dict(zip(paths, run_app(env, [{"path": p} for p in paths])))
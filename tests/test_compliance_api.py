@@ -0,0 +1,79 @@
+# tests/test_compliance_api.py
+import json
+
+import pytest
+
+from _app import env_for, load, run_app
+
+CODES = ("GDPR", "SAGE-Threat", "nist-ai-rmf")
+LISTS = [f"/compliance/{code}/requirements{suffix}" for code in CODES for suffix in ("", ":groups")]
+
+@pytest.fixture(scope="module")
+def env(tmp_path_factory):
+    db_path = tmp_path_factory.mktemp("api") / "app.db"
+    load(db_path)
+    return env_for(db_path)
+
+def test_keyset_pages_cover_every_row_once(env):
+    steps = [{"path": p} for p in LISTS] + [{"path": f"{p}?limit=7&with_total=true", "follow": True} for p in LISTS]
+    res = run_app(env, steps)
+    for path, full, pages in zip(LISTS, res[:len(LISTS)], res[len(LISTS):]):
+        rows = json.loads(full["body"])
+        assert rows, path
+        paged = [row for page in pages for row in json.loads(page["body"])]
+        assert [r["id"] for r in paged] == [r["id"] for r in rows], path
+        assert paged == rows, path
+        assert all(page["headers"]["x-total-count"] == str(len(rows)) for page in pages), path
+        assert all(len(json.loads(page["body"])) == 7 for page in pages[:-1]), path
+        assert "x-next-cursor" not in pages[-1]["headers"], path
+
+# 보강 이름 → 출력 필드
+ENRICH = {
+    "hits": {"applicable_hits"},
+    "threats": {"threats", "fixed_threats", "suggested_threats"},
+    "groups": {"threat_group", "threat_groups"},
+}
+# (목록 경로 접미사, 쿼리, 남는 필드)
+SPARSE = [
+    ("", "fields=item_code,regulation", {"id", "title", "item_code", "regulation"}),
+    ("", "fields=applicable_hits&include=hits", {"id", "title", "applicable_hits"}),
+    ("", "fields=fixed_threats,mapping_codes", {"id", "title", "fixed_threats", "mapping_codes"}),
+    ("", "include=hits", None),
+    ("", "include=", None),
+    (":groups", "fields=threat_groups,audit_method", {"id", "title", "threat_groups", "audit_method"}),
+    (":groups", "include=groups", None),
+]
+
+def _expected(row: dict, query: str, keep) -> dict:
+    if keep is None:
+        # include=만 지정: 전체 필드 중 수행하지 않은 보강 필드만 빠짐
+        included = set(query.split("=", 1)[1].split(","))
+        skipped = {f for name, fs in ENRICH.items() if name not in included for f in fs}
+        keep = set(row) - skipped
+    return {k: v for k, v in row.items() if k in keep}
+
+def test_sparse_fields_are_a_projection_of_the_full_row(env):
+    paths = []
+    for code in CODES:
+        for suffix, query, _ in SPARSE:
+            paths += [f"/compliance/{code}/requirements{suffix}", f"/compliance/{code}/requirements{suffix}?{query}"]
+    res = run_app(env, [{"path": p} for p in paths])
+    cases = [(suffix, query, keep) for _ in CODES for suffix, query, keep in SPARSE]
+    for (suffix, query, keep), full, sparse, path in zip(cases, res[::2], res[1::2], paths[1::2]):
+        assert sparse["status"] == 200, path
+        rows = json.loads(full["body"])
+        assert json.loads(sparse["body"]) == [_expected(r, query, keep) for r in rows], path
+
+def test_sparse_detail_is_a_projection_of_the_full_detail(env):
+    rows = json.loads(run_app(env, [{"path": "/compliance/GDPR/requirements?limit=3"}])[0]["body"])
+    paths = []
+    for row in rows:
+        base = f"/compliance/GDPR/requirements/{row['id']}/mappings"
+        paths += [base, f"{base}?fields=item_code,threats", f"{base}?include=hits"]
+    res = run_app(env, [{"path": p} for p in paths])
+    for full, sparse, hits in zip(res[::3], res[1::3], res[2::3]):
+        full, sparse, hits = (json.loads(r["body"]) for r in (full, sparse, hits))
+        assert sparse["framework"] == full["framework"] and sparse["mappings"] == full["mappings"]
+        assert sparse["requirement"] == _expected(full["requirement"], "", {"id", "title", "item_code", "threats"})
+        # mappings는 include에 없으면 빈 목록(스키마 필수 필드)
+        assert hits["requirement"] == _expected(full["requirement"], "include=hits", None) and hits["mappings"] == []
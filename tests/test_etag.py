@@ -0,0 +1,43 @@
+# tests/test_etag.py
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from app.utils.etag import compute_version_etag, version_precondition
+from _app import env_for, load, run_app
+
+def _request(path: str, if_none_match: str) -> Request:
+    return Request({
+        "type": "http", "method": "GET", "path": path, "query_string": b"",
+        "headers": [(b"if-none-match", if_none_match.encode("latin-1"))],
+    })
+
+def test_version_precondition_matching_tag_is_304():
+    req = _request("/compliance/GDPR/requirements", "")
+    etag = compute_version_etag(7, req)
+    with pytest.raises(HTTPException) as exc:
+        version_precondition(_request("/compliance/GDPR/requirements", etag), 7)
+    assert exc.value.status_code == 304
+
+def test_version_precondition_ignores_star():
+    # 리소스 존재 여부는 핸들러가 판단(없으면 404) → 핸들러 실행 전에는 `*`로 304 하지 않음
+    req = _request("/compliance/NOPE/requirements", "*")
+    assert version_precondition(req, 7) == compute_version_etag(7, req)
+
+def test_app_etag_round_trip_after_data_version_bump(tmp_path):
+    db_path = tmp_path / "app.db"
+    load(db_path)
+    paths = ["/compliance/stats", "/compliance/GDPR/requirements", "/compliance/GDPR/requirements:groups"]
+    first = run_app(env_for(db_path), [{"path": p} for p in paths])
+    etags = [r["headers"]["etag"] for r in first]
+    steps = [{"path": p, "headers": {"If-None-Match": e}} for p, e in zip(paths, etags)]
+    # 같은 프로세스에서: 조건부 요청 304 → 세대 증가(로더 커밋) → 이전 태그로 200 + 새 태그 → 새 태그로 304
+    res = run_app(env_for(db_path), [{"path": p} for p in paths] + steps + [{"bump": True}] + steps)
+    warm, before, after = res[:3], res[3:6], res[7:]
+    for path, etag, w, b, a in zip(paths, etags, warm, before, after):
+        assert w["headers"]["etag"] == etag, path
+        assert b["status"] == 304 and b["body"] == "", path
+        assert a["status"] == 200 and a["headers"]["etag"] != etag, path
+        assert a["body"] == w["body"], path
+    again = run_app(env_for(db_path), [{"path": p, "headers": {"If-None-Match": a["headers"]["etag"]}} for p, a in zip(paths, after)])
+    assert [r["status"] for r in again] == [304] * len(paths)
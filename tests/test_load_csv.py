@@ -0,0 +1,69 @@
+# tests/test_load_csv.py
+import csv
+import os
+import sqlite3
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from _app import load
+
+ROOT = Path(__file__).resolve().parents[1]
+REQUIREMENTS = ROOT / "compliance-gorn.csv"
+MAPPINGS = ROOT / "mapping-standard.csv"
+
+def _load(db_path: Path, mappings: Path, *extra: str) -> None:
+    # 엔진은 import 시 DATABASE_URL로 만들어지므로 실행마다 별도 프로세스
+    env = {**os.environ, "DATABASE_URL": f"sqlite:///{db_path}"}
+    subprocess.run(
+        [sys.executable, "-m", "scripts.load_csv", "--requirements", str(REQUIREMENTS), "--mappings", str(mappings), *extra],
+        cwd=ROOT, env=env, check=True, capture_output=True,
+    )
+
+def _link_count(db_path: Path) -> int:
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute("SELECT COUNT(*) FROM requirement_mapping").fetchone()[0]
+
+def _drop_mapping(src: Path, dst: Path, code: str) -> None:
+    with src.open(encoding="utf-8-sig", newline="") as f:
+        rows = list(csv.reader(f))
+    with dst.open("w", encoding="utf-8", newline="") as f:
+        csv.writer(f).writerows(r for r in rows if r and r[0] != code)
+
+@pytest.mark.parametrize("mode", [[], ["--bulk"]], ids=["orm", "bulk"])
+def test_delete_missing_then_full_reload_restores_links(tmp_path, mode):
+    db_path = tmp_path / "app.db"
+    dropped = tmp_path / "mappings-dropped.csv"
+    _drop_mapping(MAPPINGS, dropped, "3.0-01")
+
+    _load(db_path, MAPPINGS, *mode)
+    full = _link_count(db_path)
+
+    _load(db_path, dropped, "--delete-missing", *mode)
+    assert _link_count(db_path) < full
+
+    # 요건 행은 그대로(해시 동일)여도 빠진 관계는 다시 연결되어야 함
+    _load(db_path, MAPPINGS, *mode)
+    assert _link_count(db_path) == full
+
+def _data_version(db_path: Path) -> str:
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute("SELECT value FROM app_meta WHERE key = 'data_version'").fetchone()[0]
+
+@pytest.mark.parametrize("mode", [[], ["--bulk"]], ids=["orm", "bulk"])
+def test_unchanged_rerun_skips_rows_and_keeps_data_version(tmp_path, mode):
+    db_path = tmp_path / "app.db"
+    load(db_path, *mode)
+    version = _data_version(db_path)
+
+    out = load(db_path, *mode)
+    diff = next(line for line in out.splitlines() if "Diff:" in line).split("Diff:", 1)[1]
+    # 대상별 "+추가 ~수정 -삭제 =변경없음"
+    counts = {name.strip(): c.split() for name, c in (part.split(":") for part in diff.split("|"))}
+    for name, (added, updated, deleted, _) in counts.items():
+        assert (added, updated, deleted) == ("+0", "~0", "-0"), name
+    assert counts["requirements"][3] != "=0" and counts["mappings"][3] != "=0"
+    assert "Threat links: unchanged" in out
+    assert _data_version(db_path) == version
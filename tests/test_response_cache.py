@@ -0,0 +1,51 @@
+# tests/test_response_cache.py
+import asyncio
+
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Session
+
+from app.core.db import Base
+from app.core.meta import bump_data_version
+from app.utils.response_cache import cached_payload_threaded, response_cache
+
+def _build(tmp_path, *, commit_during_prefetch: bool):
+    path = tmp_path / "rc.db"
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as w:
+        generation = bump_data_version(w)
+        w.commit()
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+
+    def prefetch(s: Session):
+        if commit_during_prefetch:
+            # 조회 도중 로더 커밋(다른 연결)
+            with Session(engine) as w:
+                bump_data_version(w)
+                w.commit()
+        return lambda: ["rows"]
+
+    async def run():
+        async with AsyncSession(async_engine) as db:
+            return await cached_payload_threaded(db, ("test_response_cache",), prefetch)
+
+    response_cache.clear()
+    try:
+        payload = asyncio.run(run())
+        return payload, response_cache.get(("test_response_cache",), generation)
+    finally:
+        response_cache.clear()
+        asyncio.run(async_engine.dispose())
+        engine.dispose()
+
+def test_unchanged_generation_is_cached(tmp_path):
+    payload, cached = _build(tmp_path, commit_during_prefetch=False)
+    assert payload.versioned and cached is payload
+    assert payload.response_etag('W/"v1"') == 'W/"v1"'
+
+def test_commit_during_build_is_not_cached(tmp_path):
+    # 요청 세대로 캐시/세대 ETag를 쓰면 바뀐 본문에 304가 나감
+    payload, cached = _build(tmp_path, commit_during_prefetch=True)
+    assert not payload.versioned and cached is None
+    assert payload.response_etag('W/"v1"') == payload.etag
@@ -0,0 +1,40 @@
+# tests/test_snapshot.py
+import json
+
+from _app import env_for, get_all, load
+
+def test_snapshot_router_matches_db_router(tmp_path):
+    db_path = tmp_path / "app.db"
+    snap_path = tmp_path / "compliance.snap"
+    load(db_path, "--snapshot", str(snap_path))
+    db_env = env_for(db_path)
+    snap_env = env_for(db_path, SNAPSHOT_PATH=str(snap_path))
+
+    # 프레임워크별 목록/내보내기 + 목록 앞쪽 요건의 상세(스냅샷과 같은 DB에서 경로 구성)
+    stats = get_all(db_env, ["/compliance/stats"])["/compliance/stats"]
+    codes = [c["framework"] for c in json.loads(stats["body"])]
+    assert codes
+    paths = ["/compliance/stats"]
+    for code in codes:
+        paths += [
+            f"/compliance/{code}/requirements",
+            f"/compliance/{code}/requirements:groups",
+            f"/compliance/{code}/requirements:export?format=ndjson",
+            f"/compliance/{code}/requirements:export?format=csv",
+        ]
+    lists = get_all(db_env, [f"/compliance/{code}/requirements" for code in codes])
+    for code in codes:
+        for row in json.loads(lists[f"/compliance/{code}/requirements"]["body"])[:3]:
+            paths += [
+                f"/compliance/{code}/requirements/{row['id']}/mappings",
+                f"/compliance/{code}/requirements/{row['id']}/mappings:groups",
+            ]
+    paths.append(f"/compliance/{codes[0]}/requirements/0/mappings")
+
+    from_db, from_snap = get_all(db_env, paths), get_all(snap_env, paths)
+    for path in paths:
+        db_res, snap_res = from_db[path], from_snap[path]
+        assert snap_res["status"] == db_res["status"], path
+        assert snap_res["body"] == db_res["body"], path
+        assert snap_res["headers"].get("etag") == db_res["headers"].get("etag"), path
+        assert snap_res["headers"].get("content-type") == db_res["headers"].get("content-type"), path
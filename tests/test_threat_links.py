@@ -0,0 +1,30 @@
+# tests/test_threat_links.py
+import json
+import shutil
+import sqlite3
+
+from _app import env_for, get_all, load
+
+def test_fallback_matches_materialized_links(tmp_path):
+    links_db = tmp_path / "links.db"
+    load(links_db)
+    # 같은 데이터(세대 포함)에서 준비 플래그만 내림 → 요청 시 계산 경로
+    fallback_db = tmp_path / "fallback.db"
+    shutil.copy(links_db, fallback_db)
+    with sqlite3.connect(fallback_db) as conn:
+        assert conn.execute("UPDATE app_meta SET value = '0' WHERE key = 'requirement_threat.ready'").rowcount == 1
+
+    stats = get_all(env_for(links_db), ["/compliance/stats"])["/compliance/stats"]
+    codes = [c["framework"] for c in json.loads(stats["body"])]
+    lists = [f"/compliance/{code}/requirements" for code in codes]
+    from_links = get_all(env_for(links_db), lists)
+    paths = list(lists)
+    for path in lists:
+        paths += [f"{path}/{row['id']}/mappings" for row in json.loads(from_links[path]["body"])[:3]]
+    paths += [f"{path}?limit=5&include=threats" for path in lists]
+
+    from_links, from_fallback = get_all(env_for(links_db), paths), get_all(env_for(fallback_db), paths)
+    assert any(json.loads(from_links[p]["body"]) for p in lists)
+    for path in paths:
+        assert from_links[path]["status"] == 200, path
+        assert from_fallback[path]["body"] == from_links[path]["body"], path